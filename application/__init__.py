@@ -1,48 +1,93 @@
+import atexit
 import logging
+import os
+from typing import Callable, Optional
 
 from flask import Flask, request, redirect
 from flask_socketio import SocketIO
 
 from .games.common import common_blueprint
-from .games.common.word_manager import WordManager
+from .games.common.database import create_results_writer
+from .games.common.results_writer import ResultsWriter
+from .games.common.routes import GAME_STORES_CONFIG_KEY
+from .games.common.word_manager_registry import WordManagerRegistry
 from .games.crosswordcreator.data.game_manager import CrosswordCreatorGameManager
 from .games.hiddennames.data.game_manager import HiddenNamesGameManager
+from .games.scrambledwords.data.board_generator import BoardGenerator
 from .games.scrambledwords.data.game_manager import ScrambledWordsGameManager
 
 SCRAMBLED_WORDS_GAME_MANAGER_CONFIG_KEY = "sw_game_manager"
 HIDDEN_NAMES_GAME_MANAGER_CONFIG_KEY = "hn_game_manager"
 CROSSWORD_CREATOR_GAME_MANAGER_CONFIG_KEY = "cc_game_manager"
 
+SCRAMBLED_WORDS_WORD_FILE = "scrambledwords/words.txt"
+HIDDEN_NAMES_WORD_FILE = "hiddennames/words.txt"
+CROSSWORD_CREATOR_WORD_FILE = "crosswordcreator/words.txt"
+
+# Environment variable holding a seed for every game manager, to make the games of a run reproducible
+SEED_ENVIRONMENT_VARIABLE = "GAMESBOX_SEED"
+# Environment variable holding the SQLite database that worker processes share their games through
+GAME_STORE_ENVIRONMENT_VARIABLE = "GAMESBOX_GAME_STORE"
+# Environment variable holding the message queue (such as redis://localhost:6379) that worker processes share
+# Socket.IO messages through, so that messages to a room reach players connected to any worker
+MESSAGE_QUEUE_ENVIRONMENT_VARIABLE = "GAMESBOX_MESSAGE_QUEUE"
+
 socketio = SocketIO(cors_allowed_origins="*")
 
 LOG = logging.getLogger("__init__")
 logging.basicConfig(level=logging.INFO)
 
 
-def _setup_scrambled_words(app: Flask):
-    scrambled_words_word_manager = WordManager(word_file_path="scrambledwords/words.txt")
+def _setup_scrambled_words(
+    app: Flask,
+    word_manager_registry: WordManagerRegistry,
+    seed: Optional[int],
+    game_store_path: Optional[str],
+    results_writer: Optional[ResultsWriter],
+    async_mode: str,
+):
+    scrambled_words_word_manager = word_manager_registry.get_word_manager(SCRAMBLED_WORDS_WORD_FILE)
     LOG.info(f"Loaded {scrambled_words_word_manager.num_words()} words for Scrambled Words game")
-    app.config[SCRAMBLED_WORDS_GAME_MANAGER_CONFIG_KEY] = ScrambledWordsGameManager(scrambled_words_word_manager)
+    board_generator = BoardGenerator(scrambled_words_word_manager, run_blocking=_get_blocking_runner(async_mode))
+    board_generator.start()
 
     from application.games.scrambledwords.networking import scrambled_words_blueprint as scrambled_words_blueprint
+    from application.games.scrambledwords.networking.events import send_round_results
 
+    game_manager = ScrambledWordsGameManager(
+        scrambled_words_word_manager, board_generator, seed, game_store_path, results_writer, send_round_results
+    )
+    app.config[SCRAMBLED_WORDS_GAME_MANAGER_CONFIG_KEY] = game_manager
+    app.config[GAME_STORES_CONFIG_KEY]["scrambled_words"] = game_manager.games
     app.register_blueprint(scrambled_words_blueprint, url_prefix="/scrambled_words/")
 
 
-def _setup_hidden_names(app: Flask):
-    hidden_names_word_manager = WordManager(word_file_path="hiddennames/words.txt")
+def _setup_hidden_names(
+    app: Flask, word_manager_registry: WordManagerRegistry, seed: Optional[int], game_store_path: Optional[str]
+):
+    hidden_names_word_manager = word_manager_registry.get_word_manager(HIDDEN_NAMES_WORD_FILE)
     LOG.info(f"Loaded {hidden_names_word_manager.num_words()} words for Hidden Names game")
-    app.config[HIDDEN_NAMES_GAME_MANAGER_CONFIG_KEY] = HiddenNamesGameManager(hidden_names_word_manager)
+    game_manager = HiddenNamesGameManager(hidden_names_word_manager, seed, game_store_path)
+    app.config[HIDDEN_NAMES_GAME_MANAGER_CONFIG_KEY] = game_manager
+    app.config[GAME_STORES_CONFIG_KEY]["hidden_names"] = game_manager.games
 
     from application.games.hiddennames.networking import hidden_names_blueprint as hidden_names_blueprint
 
     app.register_blueprint(hidden_names_blueprint, url_prefix="/hidden_names/")
 
 
-def _setup_crossword_creator(app: Flask):
-    crossword_creator_word_manager = WordManager(word_file_path="crosswordcreator/words.txt")
+def _setup_crossword_creator(
+    app: Flask,
+    word_manager_registry: WordManagerRegistry,
+    seed: Optional[int],
+    game_store_path: Optional[str],
+    results_writer: Optional[ResultsWriter],
+):
+    crossword_creator_word_manager = word_manager_registry.get_word_manager(CROSSWORD_CREATOR_WORD_FILE)
     LOG.info(f"Loaded {crossword_creator_word_manager.num_words()} words for Crossword Creator game")
-    app.config[CROSSWORD_CREATOR_GAME_MANAGER_CONFIG_KEY] = CrosswordCreatorGameManager(crossword_creator_word_manager)
+    game_manager = CrosswordCreatorGameManager(crossword_creator_word_manager, seed, game_store_path, results_writer)
+    app.config[CROSSWORD_CREATOR_GAME_MANAGER_CONFIG_KEY] = game_manager
+    app.config[GAME_STORES_CONFIG_KEY]["crossword_creator"] = game_manager.games
 
     from application.games.crosswordcreator.networking import crossword_creator_blueprint as crossword_creator_blueprint
 
@@ -58,12 +103,19 @@ def _setup_scorekeeper(app: Flask):
 def _setup_app(app: Flask):
     app.register_blueprint(common_blueprint, url_prefix="/")
     app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 60
+    # Filled in as each game is set up, so that health checks can report the live and evicted games of each game
+    app.config[GAME_STORES_CONFIG_KEY] = {}
 
     @app.before_request
     def before_request():
         # Ensure players create an ID cookie
         if ("player_id" not in request.cookies) or ("player_name" not in request.cookies):
-            if ("vendor" not in request.url) and (not request.url.endswith("/new_player")):
+            # Health checks come from load balancers rather than players
+            if (
+                ("vendor" not in request.url)
+                and (not request.url.endswith("/new_player"))
+                and (request.path != "/health")
+            ):
                 return redirect("/new_player")
 
     @app.context_processor
@@ -79,17 +131,65 @@ def _setup_app(app: Flask):
         return global_data
 
 
-def create_flask_app() -> Flask:
+def _get_blocking_runner(async_mode: str) -> Optional[Callable[[Callable], object]]:
+    """
+    Returns how to run CPU-bound work on an operating system thread for the given async mode, or None if threads are
+    already operating system threads.
+    Green threads only switch when they yield, so CPU-bound work on one would stall every connection of the process.
+    """
+    if async_mode == "eventlet":
+        from eventlet import tpool
+
+        return tpool.execute
+    if async_mode == "gevent":
+        import gevent
+
+        return lambda function: gevent.get_hub().threadpool.apply(function)
+    return None
+
+
+def _get_seed() -> Optional[int]:
+    seed = os.environ.get(SEED_ENVIRONMENT_VARIABLE)
+    if seed is None:
+        return None
+
+    LOG.info(f"Seeding games with {seed}")
+    return int(seed)
+
+
+def create_flask_app(async_mode: str = "threading") -> Flask:
+    """
+    Creates the application.
+
+    Args:
+        async_mode: The Flask-SocketIO async mode, which must match the server the application is run with.
+                    Use threading for waitress, and eventlet or gevent for the async server.
+
+    Returns:
+        The application
+    """
     # Create the flask app
     app = Flask(__name__)
 
     _setup_app(app)
 
-    _setup_scrambled_words(app)
-    _setup_hidden_names(app)
-    _setup_crossword_creator(app)
+    # Load every word file up front so that games with overlapping dictionaries can share them
+    word_manager_registry = WordManagerRegistry()
+    word_manager_registry.load_word_files(
+        [SCRAMBLED_WORDS_WORD_FILE, HIDDEN_NAMES_WORD_FILE, CROSSWORD_CREATOR_WORD_FILE]
+    )
+
+    seed = _get_seed()
+    game_store_path = os.environ.get(GAME_STORE_ENVIRONMENT_VARIABLE)
+    results_writer = create_results_writer()
+    if results_writer:
+        # Write the results still waiting in the queue when the server stops
+        atexit.register(results_writer.close)
+    _setup_scrambled_words(app, word_manager_registry, seed, game_store_path, results_writer, async_mode)
+    _setup_hidden_names(app, word_manager_registry, seed, game_store_path)
+    _setup_crossword_creator(app, word_manager_registry, seed, game_store_path, results_writer)
     _setup_scorekeeper(app)
 
-    socketio.init_app(app)
+    socketio.init_app(app, async_mode=async_mode, message_queue=os.environ.get(MESSAGE_QUEUE_ENVIRONMENT_VARIABLE))
 
     return app
@@ -1,16 +1,78 @@
+import logging
 import os
 
-import waitress
+# Names of the servers the application can be run with
+WAITRESS_SERVER = "waitress"
+ASYNC_SERVER = "async"
 
-from application import create_flask_app
+SERVER_ENVIRONMENT_VARIABLE = "GAMESBOX_SERVER"
+
+LOG = logging.getLogger("__main__")
 
 
 def main():
     host = os.environ.get("WAITRESS_HOST", "127.0.0.1")
     port = os.environ.get("PORT", 10000)
+    server = os.environ.get(SERVER_ENVIRONMENT_VARIABLE, WAITRESS_SERVER)
+
+    if server == WAITRESS_SERVER:
+        _run_waitress_server(host, port)
+    elif server == ASYNC_SERVER:
+        _run_async_server(host, int(port))
+    else:
+        raise ValueError(f"Unknown server {server}. Expected {WAITRESS_SERVER} or {ASYNC_SERVER}.")
+
+
+def _run_waitress_server(host: str, port: int):
+    """
+    Runs the application on waitress.
+    Waitress cannot upgrade connections to WebSockets, so every client long-polls and each poll holds a worker thread.
+    """
+    import waitress
+
+    from application import create_flask_app
 
     waitress.serve(create_flask_app(), listen=f"{host}:{port}")
 
 
+def _run_async_server(host: str, port: int):
+    """
+    Runs the application on the server built into eventlet or gevent, whichever is installed.
+    Clients connect over WebSockets and every connection is a green thread rather than an operating system thread.
+    """
+    async_mode = _get_async_mode()
+
+    # Blocking calls must be patched before the application starts any threads or opens any sockets
+    if async_mode == "eventlet":
+        import eventlet
+
+        eventlet.monkey_patch()
+    else:
+        from gevent import monkey
+
+        monkey.patch_all()
+
+    from application import create_flask_app, socketio
+
+    LOG.info(f"Running async server with {async_mode}")
+    socketio.run(create_flask_app(async_mode), host=host, port=port)
+
+
+def _get_async_mode() -> str:
+    try:
+        import eventlet  # noqa: F401
+
+        return "eventlet"
+    except ImportError:
+        pass
+
+    try:
+        import gevent  # noqa: F401
+
+        return "gevent"
+    except ImportError:
+        raise RuntimeError(f"The {ASYNC_SERVER} server needs eventlet or gevent to be installed")
+
+
 if __name__ == "__main__":
     main()
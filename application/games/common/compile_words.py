@@ -0,0 +1,28 @@
+"""
+Compiles every words.txt under the static directory to the memory-mapped format read by WordManager.
+
+Usage:
+    python -m application.games.common.compile_words [word file paths...]
+"""
+
+import glob
+import os
+import sys
+from typing import List
+
+from .compiled_words import compile_word_file, get_compiled_path
+
+STATIC_DIRECTORY = os.path.realpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "static"))
+
+
+def main(word_file_paths: List[str]):
+    if not word_file_paths:
+        word_file_paths = sorted(glob.glob(os.path.join(STATIC_DIRECTORY, "*", "words.txt")))
+
+    for word_file_path in word_file_paths:
+        word_count = compile_word_file(word_file_path)
+        print(f"Compiled {word_count} words to {get_compiled_path(word_file_path)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,179 @@
+"""
+Compiled word list format that can be memory-mapped instead of parsed.
+
+Compile every word file with:
+    python -m application.games.common.compile_words
+
+Each words.txt is compiled to a words.bin next to it. The file holds the upper-cased words in sorted order plus a
+hash table over them, so membership checks, prefix queries and random sampling all read straight from the mapped
+pages. The pages are mapped read-only, so worker processes on the same machine share one copy of the dictionary.
+
+Layout, with every integer an unsigned 32-bit little-endian value:
+    header: magic, word count, hash table slot count, SHA-256 of the source words.txt
+    offsets: word count + 1 offsets into the word data, one per word in sorted order plus the end offset
+    hash table: slot count entries, each a word index plus one, or zero for an empty slot
+    word data: the ASCII bytes of every word in sorted order with no separators
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, Optional
+
+LOG = logging.getLogger("common.compiled_words")
+
+MAGIC = b"GBWORDS1"
+HEADER_FORMAT = "<8sII32s"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+COMPILED_SUFFIX = ".bin"
+
+
+def get_source_hash(source_bytes: bytes) -> bytes:
+    return hashlib.sha256(source_bytes).digest()
+
+
+def get_compiled_path(word_file_path: str) -> str:
+    return os.path.splitext(word_file_path)[0] + COMPILED_SUFFIX
+
+
+def compile_words(words: Iterable[str], source_hash: bytes, compiled_path: str) -> int:
+    """
+    Writes the given words to a compiled word file.
+
+    Args:
+        words: The words
+        source_hash: The hash of the word file the words came from, used to detect stale compiled files
+        compiled_path: The path to write the compiled file to
+
+    Returns:
+        The number of words written
+    """
+    sorted_words = sorted(set(word.upper() for word in words))
+    encoded_words = [word.encode("ascii") for word in sorted_words]
+
+    offsets = array("I", [0])
+    for encoded_word in encoded_words:
+        offsets.append(offsets[-1] + len(encoded_word))
+
+    # Keep the table at most half full so probe sequences stay short
+    slot_count = 1
+    while slot_count < 2 * len(encoded_words):
+        slot_count *= 2
+    hash_table = array("I", [0]) * slot_count
+    for word_index, encoded_word in enumerate(encoded_words):
+        slot = zlib.crc32(encoded_word) & (slot_count - 1)
+        while hash_table[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        hash_table[slot] = word_index + 1
+
+    if sys.byteorder != "little":
+        offsets.byteswap()
+        hash_table.byteswap()
+
+    temp_path = compiled_path + ".tmp"
+    with open(temp_path, mode="wb") as compiled_file:
+        compiled_file.write(struct.pack(HEADER_FORMAT, MAGIC, len(encoded_words), slot_count, source_hash))
+        compiled_file.write(offsets.tobytes())
+        compiled_file.write(hash_table.tobytes())
+        compiled_file.write(b"".join(encoded_words))
+    # Replace the file in one step so processes that already mapped the old file keep a consistent view
+    os.replace(temp_path, compiled_path)
+
+    return len(encoded_words)
+
+
+def compile_word_file(word_file_path: str) -> int:
+    with open(word_file_path, mode="rb") as word_file:
+        source_bytes = word_file.read()
+    words = [line.strip() for line in source_bytes.decode("ascii").splitlines() if line.strip()]
+    return compile_words(words, get_source_hash(source_bytes), get_compiled_path(word_file_path))
+
+
+class CompiledWordList(Sequence):
+    """
+    Read-only, memory-mapped view of a compiled word file.
+
+    Behaves as a sorted sequence of upper-case words with constant time membership checks.
+    """
+
+    def __init__(self, compiled_path: str):
+        with open(compiled_path, mode="rb") as compiled_file:
+            self.mapped_file = mmap.mmap(compiled_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.word_count, self.slot_count, self.source_hash = struct.unpack_from(HEADER_FORMAT, self.mapped_file)
+        if magic != MAGIC:
+            raise ValueError(f"{compiled_path} is not a compiled word file")
+        if sys.byteorder != "little":
+            raise ValueError("Compiled word files can only be mapped on little-endian machines")
+
+        offsets_start = HEADER_SIZE
+        hash_table_start = offsets_start + 4 * (self.word_count + 1)
+        words_start = hash_table_start + 4 * self.slot_count
+        self.words_start = words_start
+
+        view = memoryview(self.mapped_file)
+        self.offsets = view[offsets_start:hash_table_start].cast("I")
+        self.hash_table = view[hash_table_start:words_start].cast("I")
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.word_count))]
+        if index < 0:
+            index += self.word_count
+        if not 0 <= index < self.word_count:
+            raise IndexError("word index out of range")
+        return self._get_bytes(index).decode("ascii")
+
+    def __iter__(self):
+        for index in range(self.word_count):
+            yield self._get_bytes(index).decode("ascii")
+
+    def __contains__(self, word) -> bool:
+        try:
+            encoded_word = word.encode("ascii")
+        except (AttributeError, UnicodeEncodeError):
+            return False
+
+        slot = zlib.crc32(encoded_word) & (self.slot_count - 1)
+        while True:
+            entry = self.hash_table[slot]
+            if entry == 0:
+                return False
+            if self._get_bytes(entry - 1) == encoded_word:
+                return True
+            slot = (slot + 1) & (self.slot_count - 1)
+
+    def _get_bytes(self, index: int) -> bytes:
+        start = self.words_start + self.offsets[index]
+        end = self.words_start + self.offsets[index + 1]
+        return self.mapped_file[start:end]
+
+
+def load_compiled_words(word_file_path: str, source_hash: bytes) -> Optional[CompiledWordList]:
+    """
+    Maps the compiled form of the given word file if one exists and was compiled from the file's current contents.
+    """
+    compiled_path = get_compiled_path(word_file_path)
+    if not os.path.exists(compiled_path):
+        return None
+
+    try:
+        compiled_words = CompiledWordList(compiled_path)
+    except ValueError:
+        LOG.exception(f"Could not map {compiled_path}")
+        return None
+
+    if compiled_words.source_hash != source_hash:
+        LOG.warning(f"{compiled_path} is out of date, recompile the word files to use it")
+        return None
+
+    return compiled_words
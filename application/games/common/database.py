@@ -1,13 +1,200 @@
+import json
+import logging
 import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
 
-from pymongo import MongoClient
+from pymongo import MongoClient, ReplaceOne, timeout
 from pymongo.database import Database
 
+from .results_writer import ResultsSink, ResultsWriter
+
+DATABASE_NAME = "games"
+
+# MongoClient option to the environment variable that sets it and its default
+CLIENT_OPTIONS = {
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", 50),
+    "connectTimeoutMS": ("MONGO_CONNECT_TIMEOUT_MS", 5000),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+    "socketTimeoutMS": ("MONGO_SOCKET_TIMEOUT_MS", 10000),
+}
+# Environment variable and default for how long reading a result back may take, including finding a server.
+# Results are read back while a player waits, so reads give up well before the client's timeouts.
+FIND_TIMEOUT_MS = ("MONGO_FIND_TIMEOUT_MS", 500)
+
+# Environment variable holding a SQLite database to record results in when there is no MongoDB host
+RESULTS_DATABASE_ENVIRONMENT_VARIABLE = "GAMESBOX_RESULTS_DATABASE"
+
+LOG = logging.getLogger("common.database")
+
+_client: Optional[MongoClient] = None
+_client_factory: Callable[..., MongoClient] = MongoClient
+_client_lock = threading.Lock()
+
+
+def get_client() -> MongoClient:
+    """
+    Returns the MongoDB client shared by the whole process, creating it on first use.
+
+    A client holds a pool of connections and creating one means a DNS lookup and TLS handshake, so there is only
+    ever one per process. Clients cannot be used across a fork, so a forked worker creates its own on first use.
+    Pool size and timeouts are read from the environment variables in CLIENT_OPTIONS.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            username = os.environ.get("MONGO_USER")
+            password = os.environ.get("MONGO_PASSWORD")
+            host = os.environ.get("MONGO_HOST")
+            _client = _client_factory(
+                f"mongodb+srv://{username}:{password}@{host}/test?retryWrites=true&w=majority",
+                **_get_client_options(),
+            )
+        return _client
+
 
 def get_database() -> Database:
-    username = os.environ.get("MONGO_USER")
-    password = os.environ.get("MONGO_PASSWORD")
-    host = os.environ.get("MONGO_HOST")
-    client = MongoClient(f"mongodb+srv://{username}:{password}@{host}/test?retryWrites=true&w=majority")
+    return get_client()[DATABASE_NAME]
+
+
+def check_database_health() -> Dict[str, object]:
+    """
+    Pings MongoDB.
+
+    Returns:
+        Whether MongoDB answered, and how long it took in milliseconds or the error if it did not
+    """
+    start = time.monotonic()
+    try:
+        get_client().admin.command("ping")
+    except Exception as e:
+        LOG.warning(f"MongoDB health check failed: {e}")
+        return {"healthy": False, "error": str(e)}
+    return {"healthy": True, "latency_ms": round((time.monotonic() - start) * 1000, 1)}
+
+
+def set_client_factory(client_factory: Callable[..., MongoClient]):
+    """
+    Replaces how the shared client is created, closing any existing client.
+
+    Args:
+        client_factory: Called with the connection string and client options to create the client
+    """
+    global _client_factory
+    close_client()
+    _client_factory = client_factory
+
+
+def close_client():
+    """
+    Closes the shared client. The next call to get_client creates a new one.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _get_client_options() -> Dict[str, int]:
+    return {option: int(os.environ.get(variable, default)) for option, (variable, default) in CLIENT_OPTIONS.items()}
+
+
+def _reset_client_after_fork():
+    global _client, _client_lock
+    # The lock may have been held by another thread at the time of the fork.
+    # The client's connections belong to the parent, so it is dropped without being closed.
+    _client_lock = threading.Lock()
+    _client = None
+
+
+os.register_at_fork(after_in_child=_reset_client_after_fork)
+
+
+class MongoResultsSink(ResultsSink):
+    """
+    Writes results to MongoDB, using the key of each result as its _id.
+    """
+
+    def write(self, collection: str, documents: Dict[str, Dict[str, object]]):
+        requests = [
+            ReplaceOne({"_id": key}, {**document, "_id": key}, upsert=True) for key, document in documents.items()
+        ]
+        get_database()[collection].bulk_write(requests, ordered=False)
+
+    def find_one(self, collection: str, key: str) -> Optional[Dict[str, object]]:
+        variable, default = FIND_TIMEOUT_MS
+        with timeout(int(os.environ.get(variable, default)) / 1000):
+            document = get_database()[collection].find_one({"_id": key})
+        if document is None:
+            return None
+        del document["_id"]
+        return document
+
+
+class SqliteResultsSink(ResultsSink):
+    """
+    Writes results to a SQLite database as JSON, for running without MongoDB.
+    """
+
+    def __init__(self, database_path: str):
+        """
+        Args:
+            database_path: The path of the database file
+        """
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(database_path, timeout=30, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(collection TEXT NOT NULL, key TEXT NOT NULL, document TEXT NOT NULL, PRIMARY KEY (collection, key))"
+            )
+
+    def write(self, collection: str, documents: Dict[str, Dict[str, object]]):
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results (collection, key, document) VALUES (?, ?, ?)",
+                [(collection, key, json.dumps(document)) for key, document in documents.items()],
+            )
+
+    def find_one(self, collection: str, key: str) -> Optional[Dict[str, object]]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT document FROM results WHERE collection = ? AND key = ?", (collection, key)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def find(self, collection: str) -> List[Dict[str, object]]:
+        """
+        Returns every result written to a collection.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT document FROM results WHERE collection = ? ORDER BY key", (collection,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+def create_results_writer() -> Optional[ResultsWriter]:
+    """
+    Creates the writer that records the results of games, and starts it.
+    Results go to MongoDB if a MongoDB host is configured, otherwise to a SQLite database if one is configured.
+
+    Returns:
+        The results writer, or None if results are not recorded
+    """
+    if os.environ.get("MONGO_HOST"):
+        LOG.info("Recording results in MongoDB")
+        sink = MongoResultsSink()
+    elif os.environ.get(RESULTS_DATABASE_ENVIRONMENT_VARIABLE):
+        database_path = os.environ[RESULTS_DATABASE_ENVIRONMENT_VARIABLE]
+        LOG.info(f"Recording results in {database_path}")
+        sink = SqliteResultsSink(database_path)
+    else:
+        return None
 
-    return client.games
+    results_writer = ResultsWriter(sink)
+    results_writer.start()
+    return results_writer
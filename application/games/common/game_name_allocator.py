@@ -0,0 +1,136 @@
+import logging
+import random
+import string
+import threading
+from math import gcd
+from typing import List, Optional, Set
+
+from .locking import synchronized
+
+CODE_LENGTH = 3
+MAX_OCCUPANCY = 0.5
+CODE_ALPHABET = string.ascii_uppercase
+
+LOG = logging.getLogger("common.game_name_allocator")
+
+
+class GameNameAllocator:
+    """
+    Hands out unique game names made of a prefix followed by a code of capital letters.
+
+    New codes come from a counter. The nth code of a length is (n * step + offset) mod (26 ^ length) written in base
+    26. The step shares no factors with 26 ^ length, so every code of the length is visited exactly once before the
+    counter runs out, in an order that looks random, without holding a list of codes in memory.
+    Codes of games that have ended are released onto a free list and handed out again before any new code.
+
+    Once more than the maximum occupancy of the codes of the current length are in use, new codes get one letter longer
+    so that names stay hard to guess and the counter never runs out.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        code_length: int = CODE_LENGTH,
+        max_occupancy: float = MAX_OCCUPANCY,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            prefix: The start of every game name
+            code_length: The number of letters in the first codes handed out
+            max_occupancy: The fraction of the codes of the current length that can be in use before codes get longer
+            rng: The random number generator that picks the order codes are handed out in
+        """
+        self.prefix = prefix
+        self.max_occupancy = max_occupancy
+        self.rng = rng if rng is not None else random.Random()
+        self.lock = threading.RLock()
+
+        self.names_in_use: Set[str] = set()
+        self.free_names: List[str] = []
+
+        self.code_length = 0
+        self.num_codes = 0
+        self.step = 0
+        self.offset = 0
+        self.counter = 0
+        self._start_code_length(code_length)
+
+    @synchronized
+    def allocate(self) -> str:
+        """
+        Returns a game name that is not in use and marks it as in use.
+        """
+        name = self._get_free_name()
+        if name is None:
+            name = self._get_new_name()
+
+        self.names_in_use.add(name)
+        return name
+
+    @synchronized
+    def reserve(self, name: str):
+        """
+        Marks a name that was chosen by something other than this allocator as in use.
+        """
+        self.names_in_use.add(name)
+
+    @synchronized
+    def discard(self, name: str):
+        """
+        Forgets a name that was handed out but turned out to be taken, such as by another worker sharing the games.
+        The name is not handed out again, since whoever took it still has it.
+        """
+        self.names_in_use.discard(name)
+
+    @synchronized
+    def release(self, name: str):
+        """
+        Marks a name as no longer in use so that it can be handed out again.
+        """
+        if name not in self.names_in_use:
+            return
+
+        self.names_in_use.remove(name)
+        if name.startswith(self.prefix):
+            self.free_names.append(name)
+
+    def _get_free_name(self) -> Optional[str]:
+        while self.free_names:
+            name = self.free_names.pop()
+            # The name may have been reserved since it was released
+            if name not in self.names_in_use:
+                return name
+        return None
+
+    def _get_new_name(self) -> str:
+        while True:
+            if (self.counter >= self.num_codes) or (len(self.names_in_use) >= self.max_occupancy * self.num_codes):
+                self._start_code_length(self.code_length + 1)
+
+            code_index = (self.counter * self.step + self.offset) % self.num_codes
+            self.counter += 1
+
+            name = self.prefix + self._encode(code_index)
+            # Reserved names can collide with new codes
+            if name not in self.names_in_use:
+                return name
+
+    def _start_code_length(self, code_length: int):
+        if self.code_length:
+            LOG.info(f"{self.prefix} game names are now {code_length} letters long")
+
+        self.code_length = code_length
+        self.num_codes = len(CODE_ALPHABET) ** code_length
+        self.step = self.rng.randrange(1, self.num_codes)
+        while gcd(self.step, self.num_codes) != 1:
+            self.step = self.rng.randrange(1, self.num_codes)
+        self.offset = self.rng.randrange(self.num_codes)
+        self.counter = 0
+
+    def _encode(self, code_index: int) -> str:
+        letters = []
+        for _ in range(self.code_length):
+            code_index, letter_index = divmod(code_index, len(CODE_ALPHABET))
+            letters.append(CODE_ALPHABET[letter_index])
+        return "".join(letters)
@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from .locking import synchronized
+
+MAX_GAMES = 1000
+IDLE_TIMEOUT_SECONDS = 6 * 60 * 60
+
+LOG = logging.getLogger("common.game_registry")
+
+
+class GameRegistry:
+    """
+    Holds the games of a game manager and evicts games that are no longer being played.
+
+    A game is evicted once nothing has touched it for the idle timeout.
+    If the registry is full when a game is added, the least recently used game is evicted to make room.
+    Games are kept in least recently used order so both checks only ever look at the oldest games.
+
+    Every method holds the registry's lock, including while evicted games are handed to the eviction callback.
+    The callback may lock the evicted game, so games must never look up other games while holding their own lock.
+    """
+
+    def __init__(
+        self,
+        max_games: int = MAX_GAMES,
+        idle_timeout_seconds: float = IDLE_TIMEOUT_SECONDS,
+        on_evict: Optional[Callable[[str, object], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_games: The maximum number of games to hold at once
+            idle_timeout_seconds: How long a game can go without activity before it is evicted
+            on_evict: Called with the game name and game whenever a game is evicted
+            clock: Returns the current time in seconds
+        """
+        self.max_games = max_games
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.on_evict = on_evict
+        self.clock = clock
+        self.lock = threading.RLock()
+
+        # Game name to (game, last activity time) with the least recently used game first
+        self.games: "OrderedDict[str, Tuple[object, float]]" = OrderedDict()
+
+        self.idle_evictions = 0
+        self.capacity_evictions = 0
+
+    @synchronized
+    def add(self, game_name: str, game: object):
+        """
+        Adds a game to the registry, replacing any existing game with the same name.
+        """
+        self.evict_idle_games()
+
+        if game_name in self.games:
+            del self.games[game_name]
+        elif len(self.games) >= self.max_games:
+            oldest_game_name = next(iter(self.games))
+            LOG.info(f"Registry is full, evicting least recently used game {oldest_game_name}")
+            self.capacity_evictions += 1
+            self._evict(oldest_game_name)
+
+        self.games[game_name] = (game, self.clock())
+
+    @synchronized
+    def get(self, game_name: str) -> Optional[object]:
+        """
+        Returns the game with the given name if one exists and records activity on it.
+        """
+        self.evict_idle_games()
+
+        entry = self.games.get(game_name, None)
+        if entry is None:
+            return None
+
+        self.games[game_name] = (entry[0], self.clock())
+        self.games.move_to_end(game_name)
+        return entry[0]
+
+    @synchronized
+    def remove(self, game_name: str) -> Optional[object]:
+        entry = self.games.pop(game_name, None)
+        return None if entry is None else entry[0]
+
+    @synchronized
+    def evict_idle_games(self) -> int:
+        """
+        Evicts every game that has been idle for longer than the idle timeout.
+
+        Returns:
+            The number of games evicted
+        """
+        cutoff = self.clock() - self.idle_timeout_seconds
+        evicted = 0
+        while self.games:
+            oldest_game_name, (_, last_activity) = next(iter(self.games.items()))
+            if last_activity > cutoff:
+                break
+
+            LOG.info(f"Evicting idle game {oldest_game_name}")
+            self._evict(oldest_game_name)
+            evicted += 1
+
+        self.idle_evictions += evicted
+        return evicted
+
+    @synchronized
+    def get_metrics(self) -> Dict[str, int]:
+        return {
+            "live_games": len(self.games),
+            "idle_evictions": self.idle_evictions,
+            "capacity_evictions": self.capacity_evictions,
+        }
+
+    def _evict(self, game_name: str):
+        game = self.remove(game_name)
+        if self.on_evict:
+            self.on_evict(game_name, game)
+
+    @synchronized
+    def __contains__(self, game_name: str) -> bool:
+        return game_name in self.games
+
+    @synchronized
+    def __len__(self) -> int:
+        return len(self.games)
@@ -0,0 +1,23 @@
+import random
+from typing import Optional
+
+
+def get_game_seed(seed: Optional[int], manager_seed: Optional[int], rng: random.Random) -> Optional[int]:
+    """
+    Picks the seed of a new game.
+
+    Args:
+        seed: The seed asked for the game, if any
+        manager_seed: The seed of the game manager, if any
+        rng: The game manager's random number generator
+
+    Returns:
+        The seed for the game, or None if the game should pick its own seed
+    """
+    if seed is not None:
+        return seed
+    if manager_seed is not None:
+        # Seeded managers seed every game so that the games can be replayed
+        return rng.getrandbits(64)
+    # Otherwise the game picks its own seed
+    return None
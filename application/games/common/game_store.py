@@ -0,0 +1,291 @@
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Dict, Iterator, Optional
+
+from .game_registry import GameRegistry, IDLE_TIMEOUT_SECONDS
+from .locking import synchronized
+
+LOG = logging.getLogger("common.game_store")
+
+
+class GameStore(ABC):
+    """
+    Where a game manager keeps its games.
+
+    Games read with get are snapshots that may be shared with other requests, so they must only be changed inside
+    update, which hands out the current game and makes the changes visible to every process using the store.
+    """
+
+    @abstractmethod
+    def get(self, game_name: str) -> Optional[object]:
+        pass
+
+    @abstractmethod
+    def add(self, game_name: str, game: object) -> bool:
+        """
+        Adds a game unless there is already a game with the same name, which may have been added by another process.
+
+        Returns:
+            True if the game was added
+        """
+
+    @abstractmethod
+    def replace(self, game_name: str, game: object):
+        """
+        Adds a game, replacing any game with the same name.
+        """
+
+    @abstractmethod
+    def remove(self, game_name: str) -> Optional[object]:
+        pass
+
+    @abstractmethod
+    def update(self, game_name: str) -> ContextManager[Optional[object]]:
+        """
+        Hands out the game with the given name for changing. No other request can change the game until the block
+        ends, at which point the changes are saved. Blocks should only change the game, and leave anything slow such
+        as sending messages to players until after the block.
+
+        Args:
+            game_name: The name of the game
+
+        Returns:
+            The game, or None if there is no game with the name
+        """
+
+    @abstractmethod
+    def get_metrics(self) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def __contains__(self, game_name: str) -> bool:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class InMemoryGameStore(GameRegistry, GameStore):
+    """
+    Game store holding the games in this process.
+    Games are never copied, so updates take the lock of the game and there is nothing to save afterwards.
+    """
+
+    @synchronized
+    def add(self, game_name: str, game: object) -> bool:
+        self.evict_idle_games()
+        if game_name in self.games:
+            return False
+
+        GameRegistry.add(self, game_name, game)
+        return True
+
+    def replace(self, game_name: str, game: object):
+        GameRegistry.add(self, game_name, game)
+
+    @contextmanager
+    def update(self, game_name: str) -> Iterator[Optional[object]]:
+        game = self.get(game_name)
+        if game is None:
+            yield None
+            return
+
+        with game.lock:
+            yield game
+
+
+class SqliteGameStore(GameStore):
+    """
+    Game store holding pickled games in a SQLite database, so that several worker processes can serve the same games.
+
+    Updates run in an immediate transaction, which SQLite only lets one connection hold at a time across every process
+    using the database, so a game is loaded, changed and saved without any other worker changing it in between.
+    That lock covers the whole database rather than one game, so updates of every game in every worker run one at a
+    time. To keep the wait short, updates should only change the game and players should be sent messages once the
+    update has been saved. The database is kept in write-ahead logging mode, so reads never wait on an update.
+
+    Games that have been idle for longer than the idle timeout are removed when games are added.
+    Only adding and updating a game counts as activity, so that reads never need the write lock.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        table_name: str,
+        idle_timeout_seconds: float = IDLE_TIMEOUT_SECONDS,
+        on_evict: Optional[Callable[[str, object], None]] = None,
+        on_load: Optional[Callable[[object], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            database_path: The path of the database file
+            table_name: The table to keep the games in, so that games of different types can share a database
+            idle_timeout_seconds: How long a game can go without activity before it is evicted
+            on_evict: Called with the game name and game whenever a game is evicted
+            on_load: Called with every game loaded from the database, to restore anything that was not pickled
+            clock: Returns the current time in seconds. Must agree between processes.
+        """
+        self.database_path = database_path
+        self.table_name = table_name
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.on_evict = on_evict
+        self.on_load = on_load
+        self.clock = clock
+
+        # SQLite connections cannot be shared between threads
+        self.connections = threading.local()
+        self.idle_evictions = 0
+
+        connection = self._get_connection()
+        # Readers see the last saved version of each game while an update is running instead of waiting for it
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table_name} "
+            "(game_name TEXT PRIMARY KEY, game BLOB NOT NULL, last_activity REAL NOT NULL)"
+        )
+
+    def get(self, game_name: str) -> Optional[object]:
+        row = (
+            self._get_connection()
+            .execute(f"SELECT game FROM {self.table_name} WHERE game_name = ?", (game_name,))
+            .fetchone()
+        )
+        return None if row is None else self._load(row[0])
+
+    def add(self, game_name: str, game: object) -> bool:
+        self.evict_idle_games()
+        pickled_game = pickle.dumps(game)
+        with self._transaction() as connection:
+            try:
+                connection.execute(
+                    f"INSERT INTO {self.table_name} (game_name, game, last_activity) VALUES (?, ?, ?)",
+                    (game_name, pickled_game, self.clock()),
+                )
+            except sqlite3.IntegrityError:
+                LOG.info(f"Game {game_name} already exists")
+                return False
+        return True
+
+    def replace(self, game_name: str, game: object):
+        self.evict_idle_games()
+        self._get_connection().execute(
+            f"INSERT OR REPLACE INTO {self.table_name} (game_name, game, last_activity) VALUES (?, ?, ?)",
+            (game_name, pickle.dumps(game), self.clock()),
+        )
+
+    def remove(self, game_name: str) -> Optional[object]:
+        with self._transaction() as connection:
+            row = connection.execute(f"SELECT game FROM {self.table_name} WHERE game_name = ?", (game_name,)).fetchone()
+            connection.execute(f"DELETE FROM {self.table_name} WHERE game_name = ?", (game_name,))
+        return None if row is None else self._load(row[0])
+
+    @contextmanager
+    def update(self, game_name: str) -> Iterator[Optional[object]]:
+        with self._transaction() as connection:
+            row = connection.execute(f"SELECT game FROM {self.table_name} WHERE game_name = ?", (game_name,)).fetchone()
+            if row is None:
+                yield None
+                return
+
+            game = self._load(row[0])
+            yield game
+
+            connection.execute(
+                f"UPDATE {self.table_name} SET game = ?, last_activity = ? WHERE game_name = ?",
+                (pickle.dumps(game), self.clock(), game_name),
+            )
+
+    def evict_idle_games(self) -> int:
+        """
+        Evicts every game that has been idle for longer than the idle timeout.
+
+        Returns:
+            The number of games evicted
+        """
+        cutoff = self.clock() - self.idle_timeout_seconds
+        with self._transaction() as connection:
+            rows = connection.execute(
+                f"SELECT game_name, game FROM {self.table_name} WHERE last_activity <= ?", (cutoff,)
+            ).fetchall()
+            connection.execute(f"DELETE FROM {self.table_name} WHERE last_activity <= ?", (cutoff,))
+
+        for game_name, game in rows:
+            LOG.info(f"Evicting idle game {game_name}")
+            if self.on_evict:
+                self.on_evict(game_name, self._load(game))
+
+        self.idle_evictions += len(rows)
+        return len(rows)
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {"live_games": len(self), "idle_evictions": self.idle_evictions, "capacity_evictions": 0}
+
+    def _load(self, pickled_game: bytes) -> object:
+        game = pickle.loads(pickled_game)
+        if self.on_load:
+            self.on_load(game)
+        return game
+
+    def _get_connection(self) -> sqlite3.Connection:
+        connection = getattr(self.connections, "connection", None)
+        if connection is None:
+            # Transactions are started explicitly so that they can take the write lock up front
+            connection = sqlite3.connect(self.database_path, timeout=30, isolation_level=None)
+            # Write-ahead logging only needs to sync to disk at checkpoints, which makes each update cheaper
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.connections.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def __contains__(self, game_name: str) -> bool:
+        row = (
+            self._get_connection()
+            .execute(f"SELECT 1 FROM {self.table_name} WHERE game_name = ?", (game_name,))
+            .fetchone()
+        )
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._get_connection().execute(f"SELECT COUNT(*) FROM {self.table_name}").fetchone()[0]
+
+
+def create_game_store(
+    table_name: str,
+    database_path: Optional[str] = None,
+    on_evict: Optional[Callable[[str, object], None]] = None,
+    on_load: Optional[Callable[[object], None]] = None,
+) -> GameStore:
+    """
+    Creates the game store for a game manager.
+
+    Args:
+        table_name: The name of the game type, used to keep its games apart from those of other game types
+        database_path: The SQLite database to share games through. Games are kept in memory if not given.
+        on_evict: Called with the game name and game whenever a game is evicted
+        on_load: Called with every game loaded from a shared store
+
+    Returns:
+        The game store
+    """
+    if database_path is None:
+        return InMemoryGameStore(on_evict=on_evict)
+
+    LOG.info(f"Sharing {table_name} games through {database_path}")
+    return SqliteGameStore(database_path, table_name, on_evict=on_evict, on_load=on_load)
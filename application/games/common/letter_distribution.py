@@ -0,0 +1,55 @@
+import random
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+class LetterDistribution:
+    """
+    Weighted distribution of letters that tiles are drawn from.
+
+    Weights are whole numbers, so the distribution is precomputed as a table holding each letter as many times as its
+    weight. Drawing any number of letters is then a single call to random.choices, which picks uniformly from the
+    table in constant time per letter rather than searching cumulative weights.
+    """
+
+    def __init__(self, weights: Dict[str, int]):
+        """
+        Args:
+            weights: The relative weight of each letter
+        """
+        self.weights = dict(weights)
+        self.letters = list(self.weights.keys())
+        self.total_weight = sum(self.weights.values())
+        self.table = [letter for letter, weight in self.weights.items() for _ in range(weight)]
+
+    def sample(self, num_letters: int, rng: Optional[random.Random] = None) -> List[str]:
+        """
+        Draws letters with replacement.
+
+        Args:
+            num_letters: The number of letters
+            rng: The random number generator to draw with. The shared one in the random module if not given.
+
+        Returns:
+            The letters
+        """
+        choices = rng.choices if rng is not None else random.choices
+        return choices(self.table, k=num_letters)
+
+    def get_counts(self, num_letters: int) -> Counter:
+        """
+        Splits a number of letters between the letters of the distribution in proportion to their weights.
+
+        Args:
+            num_letters: The number of letters
+
+        Returns:
+            The number of each letter
+        """
+        counts = Counter({letter: num_letters * weight // self.total_weight for letter, weight in self.weights.items()})
+
+        # Give the letters left over from rounding down to the letters that lost the most from rounding
+        remainders = sorted(self.letters, key=lambda letter: -(num_letters * self.weights[letter] % self.total_weight))
+        for letter in remainders[: num_letters - sum(counts.values())]:
+            counts[letter] += 1
+        return counts
@@ -0,0 +1,16 @@
+import functools
+from typing import Callable
+
+
+def synchronized(method: Callable) -> Callable:
+    """
+    Decorator for methods that must hold the lock of their object while they run.
+    The object must have a lock attribute holding a reentrant lock so that synchronized methods can call each other.
+    """
+
+    @functools.wraps(method)
+    def synchronized_method(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+
+    return synchronized_method
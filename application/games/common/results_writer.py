@@ -0,0 +1,193 @@
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+MAX_QUEUED_RESULTS = 10000
+BATCH_SIZE = 500
+FLUSH_INTERVAL_SECONDS = 1.0
+BLOCK_SECONDS = 0.05
+
+LOG = logging.getLogger("common.results_writer")
+
+
+class ResultsSink(ABC):
+    """
+    Where a ResultsWriter writes results to.
+    """
+
+    @abstractmethod
+    def write(self, collection: str, documents: Dict[str, Dict[str, object]]):
+        """
+        Writes documents to a collection, replacing any documents already written with the same keys.
+
+        Args:
+            collection: The name of the collection
+            documents: Dictionary from the key of each document to the document
+        """
+
+    @abstractmethod
+    def find_one(self, collection: str, key: str) -> Optional[Dict[str, object]]:
+        """
+        Reads back a document written to a collection.
+
+        Args:
+            collection: The name of the collection
+            key: The key of the document
+
+        Returns:
+            The document, or None if no document has been written with the key
+        """
+
+
+class ResultsWriter:
+    """
+    Records the results of games without making the games wait on the database.
+
+    Results are put on a bounded queue and a background worker writes them to the sink in batches, either once a
+    batch is full or once the flush interval has passed. Every result has a key and sinks replace results with the
+    same key, so recording a result again (for example when a round is ended by two workers) only overwrites it.
+
+    If the sink falls behind and the queue fills up, recording a result waits briefly for room and then drops the
+    result rather than stall the game that recorded it.
+    """
+
+    def __init__(
+        self,
+        sink: ResultsSink,
+        max_queued_results: int = MAX_QUEUED_RESULTS,
+        batch_size: int = BATCH_SIZE,
+        flush_interval_seconds: float = FLUSH_INTERVAL_SECONDS,
+        block_seconds: float = BLOCK_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            sink: Where to write results to
+            max_queued_results: How many results can wait to be written before new results are dropped
+            batch_size: The most results written at once
+            flush_interval_seconds: The longest a result waits for its batch to fill before it is written
+            block_seconds: How long recording a result waits for room in a full queue before dropping the result
+            clock: Returns the current time in seconds
+        """
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.block_seconds = block_seconds
+        self.clock = clock
+
+        # Entries are (collection, key, document), or None once the writer is closed
+        self.results: queue.Queue = queue.Queue(maxsize=max_queued_results)
+        self.worker: Optional[threading.Thread] = None
+        self.stopped = False
+
+        self.written_results = 0
+        self.dropped_results = 0
+        self.failed_results = 0
+
+    def start(self):
+        """
+        Starts the background worker that writes results to the sink.
+        """
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._write_batches, name="results-writer", daemon=True)
+            self.worker.start()
+
+    def record(self, collection: str, key: str, document: Dict[str, object]) -> bool:
+        """
+        Queues a result to be written.
+
+        Args:
+            collection: The name of the collection to write the result to
+            key: The key of the result, unique within the collection
+            document: The result
+
+        Returns:
+            True if the result was queued, False if it was dropped because the queue is full
+        """
+        try:
+            self.results.put((collection, key, document), timeout=self.block_seconds)
+            return True
+        except queue.Full:
+            self.dropped_results += 1
+            LOG.warning(f"Results queue is full, dropped result {key} for {collection}")
+            return False
+
+    def close(self, timeout_seconds: float = 10):
+        """
+        Writes every queued result and stops the background worker.
+
+        Args:
+            timeout_seconds: How long to wait for the queued results to be written
+        """
+        self.start()
+        self.results.put(None)
+        self.worker.join(timeout_seconds)
+
+    def find(self, collection: str, key: str) -> Optional[Dict[str, object]]:
+        """
+        Reads a result back from the sink. Results still waiting in the queue are not seen.
+
+        Args:
+            collection: The name of the collection
+            key: The key of the result
+
+        Returns:
+            The result, or None if there is no result with the key or it could not be read
+        """
+        try:
+            return self.sink.find_one(collection, key)
+        except Exception:
+            LOG.exception(f"Failed to read result {key} from {collection}")
+            return None
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {
+            "queued_results": self.results.qsize(),
+            "written_results": self.written_results,
+            "dropped_results": self.dropped_results,
+            "failed_results": self.failed_results,
+        }
+
+    def _write_batches(self):
+        while not self.stopped:
+            self._write_batch(self._take_batch())
+
+    def _take_batch(self) -> List[Tuple[str, str, Dict[str, object]]]:
+        batch: List[Tuple[str, str, Dict[str, object]]] = []
+        deadline: Optional[float] = None
+        while len(batch) < self.batch_size:
+            try:
+                if deadline is None:
+                    # Wait as long as it takes for the first result of the batch
+                    entry = self.results.get()
+                else:
+                    entry = self.results.get(timeout=max(deadline - self.clock(), 0))
+            except queue.Empty:
+                break
+
+            if entry is None:
+                # Every result recorded before the writer was closed has been taken
+                self.stopped = True
+                break
+            batch.append(entry)
+            if deadline is None:
+                deadline = self.clock() + self.flush_interval_seconds
+        return batch
+
+    def _write_batch(self, batch: List[Tuple[str, str, Dict[str, object]]]):
+        # Results are grouped so that each collection is written in one call
+        collections: Dict[str, Dict[str, Dict[str, object]]] = defaultdict(dict)
+        for collection, key, document in batch:
+            collections[collection][key] = document
+
+        for collection, documents in collections.items():
+            try:
+                self.sink.write(collection, documents)
+                self.written_results += len(documents)
+            except Exception:
+                self.failed_results += len(documents)
+                LOG.exception(f"Failed to write {len(documents)} results to {collection}")
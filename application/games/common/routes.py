@@ -1,12 +1,17 @@
+import os
 import uuid
 
-from flask import request, redirect, make_response, Response, render_template
+from flask import current_app, request, redirect, make_response, Response, render_template, jsonify
 
 from . import common_blueprint
+from .database import check_database_health
 
 PLAYER_ID_KEY = "player_id"
 PLAYER_NAME_KEY = "player_name"
 
+# App config key of a dictionary from the name of each game to the store holding its games
+GAME_STORES_CONFIG_KEY = "game_stores"
+
 
 @common_blueprint.route("/")
 def index():
@@ -41,3 +46,18 @@ def new_player_register():
     response.set_cookie(PLAYER_NAME_KEY, player_name, max_age=315360000)
 
     return response
+
+
+@common_blueprint.route("/health", methods=["GET"])
+def health():
+    # Live games and the games evicted by this worker, for each game
+    game_stores = current_app.config.get(GAME_STORES_CONFIG_KEY, {})
+    games = {game: game_store.get_metrics() for game, game_store in game_stores.items()}
+
+    # Only check the database if one is configured
+    if not os.environ.get("MONGO_HOST"):
+        return jsonify({"healthy": True, "games": games})
+
+    database_health = check_database_health()
+    status = 200 if database_health["healthy"] else 503
+    return jsonify({"healthy": database_health["healthy"], "database": database_health, "games": games}), status
@@ -0,0 +1,142 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+LOG = logging.getLogger("common.scheduler")
+
+
+class ScheduledTask:
+    """
+    A callback waiting to be run by a Scheduler.
+    """
+
+    def __init__(self, scheduler: "Scheduler", run_time: float, callback: Callable[[], None]):
+        self.scheduler = scheduler
+        self.run_time = run_time
+        self.callback = callback
+        self.pending = True
+
+    def cancel(self):
+        """
+        Stops the callback from running. Has no effect if the callback has already run.
+        """
+        self.scheduler._cancel(self)
+
+
+class Scheduler:
+    """
+    Runs callbacks after a delay.
+
+    Every pending callback sits in one heap ordered by run time and a single background thread sleeps until the
+    earliest one is due, so any number of games can have timers without each holding a sleeping thread.
+    Callbacks are run on the scheduler thread and should return quickly.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+
+        # Entries are (run time, sequence number, task) so tasks due at the same time run in the order scheduled
+        self.tasks: List[Tuple[float, int, ScheduledTask]] = []
+        self.cancelled_tasks = 0
+        self.sequence = itertools.count()
+
+        self.condition = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        with self.condition:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+                self.thread.start()
+
+    def schedule(self, delay_seconds: float, callback: Callable[[], None]) -> ScheduledTask:
+        """
+        Schedules the callback to run after the given delay.
+
+        Args:
+            delay_seconds: How long to wait before running the callback
+            callback: The callback
+
+        Returns:
+            The scheduled task, which can be used to cancel the callback
+        """
+        with self.condition:
+            task = ScheduledTask(self, self.clock() + delay_seconds, callback)
+            heapq.heappush(self.tasks, (task.run_time, next(self.sequence), task))
+            # Wake the scheduler thread in case the new task is due before the one it is waiting on
+            self.condition.notify()
+        return task
+
+    def run_pending(self) -> int:
+        """
+        Runs every callback that is due.
+
+        Returns:
+            The number of callbacks run
+        """
+        due_tasks = self._pop_due_tasks()
+        for task in due_tasks:
+            try:
+                task.callback()
+            except Exception:
+                LOG.exception("Scheduled callback failed")
+        return len(due_tasks)
+
+    def pending_tasks(self) -> int:
+        with self.condition:
+            return len(self.tasks) - self.cancelled_tasks
+
+    def _pop_due_tasks(self) -> List[ScheduledTask]:
+        due_tasks = []
+        with self.condition:
+            now = self.clock()
+            while self.tasks and (self.tasks[0][0] <= now):
+                task = heapq.heappop(self.tasks)[2]
+                if task.pending:
+                    task.pending = False
+                    due_tasks.append(task)
+                else:
+                    self.cancelled_tasks -= 1
+        return due_tasks
+
+    def _cancel(self, task: ScheduledTask):
+        with self.condition:
+            if not task.pending:
+                return
+            task.pending = False
+            self.cancelled_tasks += 1
+
+            # Cancelled tasks are left in the heap until they are due.
+            # Rebuild the heap once they make up most of it so restarted timers do not pile up.
+            if self.cancelled_tasks > len(self.tasks) // 2:
+                self.tasks = [entry for entry in self.tasks if entry[2].pending]
+                heapq.heapify(self.tasks)
+                self.cancelled_tasks = 0
+
+    def _run(self):
+        while True:
+            with self.condition:
+                if self.tasks:
+                    self.condition.wait(max(self.tasks[0][0] - self.clock(), 0))
+                else:
+                    self.condition.wait()
+            self.run_pending()
+
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """
+    Returns the scheduler shared by all games, starting it on first use.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+            _scheduler.start()
+        return _scheduler
@@ -1,36 +1,293 @@
+import collections.abc
+import io
 import logging
 import os
 import random
-from typing import List, Set
+from bisect import bisect_left, bisect_right
+from typing import Collection, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .compiled_words import CompiledWordList, get_source_hash, load_compiled_words
 
 LOG = logging.getLogger("common.word_manager")
 
+# Sorts after every letter so that prefix + PREFIX_END sorts after every word starting with prefix
+PREFIX_END = "\x7f"
+
 FILE_LOCATION = os.path.dirname(os.path.realpath(__file__))
 
 
+def get_word_file_location(word_file_path: str) -> str:
+    """
+    Returns the location of a word file given its path relative to the static directory.
+    """
+    return f"{FILE_LOCATION}/../../static/{word_file_path}"
+
+
+def iter_file_words(source_bytes: bytes) -> Iterator[str]:
+    """
+    Yields the upper-cased words of a word file one at a time, without holding every word in memory at once.
+    """
+    for line in io.BytesIO(source_bytes):
+        word = line.strip()
+        if word:
+            yield word.decode().upper()
+
+
+class PrefixIndex:
+    """
+    Compact prefix structure over a set of words.
+
+    The words are kept in a single sorted sequence so that every word sharing a prefix sits in one contiguous range.
+    Prefix queries are answered with a binary search, which keeps memory to one list of references rather than a
+    node object per letter as a dictionary based trie would need.
+    """
+
+    def __init__(self, sorted_words: Sequence[str]):
+        self.sorted_words = sorted_words
+
+    def has_word(self, word: str) -> bool:
+        index = bisect_left(self.sorted_words, word)
+        return (index < len(self.sorted_words)) and (self.sorted_words[index] == word)
+
+    def is_prefix(self, prefix: str) -> bool:
+        """
+        Returns whether any word starts with the given prefix. A complete word is a prefix of itself.
+        """
+        index = bisect_left(self.sorted_words, prefix)
+        return (index < len(self.sorted_words)) and self.sorted_words[index].startswith(prefix)
+
+    def get_prefix_range(self, prefix: str, lo: int = 0, hi: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Returns the range of indexes into sorted_words holding the words that start with the given prefix.
+        The range is empty if no word starts with the prefix.
+
+        Searching for a longer prefix within the range of a shorter one only has to look at that range,
+        which is how board searches extend a prefix one letter at a time cheaply.
+
+        Args:
+            prefix: The prefix
+            lo: The start of the range to search
+            hi: The end of the range to search, the end of the words if not given
+
+        Returns:
+            The start (inclusive) and end (exclusive) indexes of the range
+        """
+        if hi is None:
+            hi = len(self.sorted_words)
+        start = bisect_left(self.sorted_words, prefix, lo, hi)
+        end = bisect_left(self.sorted_words, prefix + PREFIX_END, start, hi)
+        return start, end
+
+    def iter_words_with_prefix(self, prefix: str) -> Iterator[str]:
+        """
+        Yields every word starting with the given prefix in alphabetical order.
+        """
+        index = bisect_left(self.sorted_words, prefix)
+        while (index < len(self.sorted_words)) and self.sorted_words[index].startswith(prefix):
+            yield self.sorted_words[index]
+            index += 1
+
+
 class WordManager:
     def __init__(self, words: Set[str] = None, word_file_path: str = ""):
-        if words is not None:
-            # If we are given a set of words, use those
-            words = list(set([word.upper() for word in words]))
+        # Hash of the word file the words were loaded from, if they were loaded from a file
+        self.source_hash: Optional[bytes] = None
+
+        compiled_words: Optional[CompiledWordList] = None
+        if words is None:
+            # If we are not given a set of words, load the given file of words
+            word_file_path = get_word_file_location(word_file_path)
+            with open(word_file_path, mode="rb") as word_file:
+                source_bytes = word_file.read()
+
+            # Prefer the compiled form of the file, which is mapped rather than parsed
+            self.source_hash = get_source_hash(source_bytes)
+            compiled_words = load_compiled_words(word_file_path, self.source_hash)
+            if compiled_words is None:
+                words = list(iter_file_words(source_bytes))
+
+        if compiled_words is not None:
+            # The compiled words are already hashed and sorted
+            self.word_set: Collection[str] = compiled_words
+            self.words: Sequence[str] = compiled_words
         else:
-            # Otherwise, load the given file of words
-            words = set()
-            with open(f"{FILE_LOCATION}/../../static/{word_file_path}", mode="r") as word_file:
-                for line in word_file:
-                    line = line.strip().upper()
-                    words.add(line)
+            # Hashed index used for membership checks
+            self.word_set = frozenset([word.upper() for word in words])
+
+            # Sampling from a set is deprecated so also keep the words as a list.
+            # The list is sorted so that seeded samples do not depend on the order the set was hashed in.
+            self.words = sorted(self.word_set)
 
-        # Sampling from a set is deprecated so turn the set into a list
-        self.words = list(words)
+        # The prefix index is only built once something asks for it as not every game needs prefix queries
+        self._prefix_index: Optional[PrefixIndex] = None
 
         LOG.debug(f"Loaded {len(self.words)} words.")
 
     def is_word(self, word: str) -> bool:
-        return word.upper() in self.words
+        return word.upper() in self.word_set
+
+    def are_words(self, words: Iterable[str]) -> List[bool]:
+        """
+        Checks multiple words at once.
+
+        Args:
+            words: The words to check
+
+        Returns:
+            Whether each word is recognized, in the same order as the given words
+        """
+        return [self.is_word(word) for word in words]
+
+    def get_prefix_index(self) -> PrefixIndex:
+        if self._prefix_index is None:
+            # The words are already sorted
+            self._prefix_index = PrefixIndex(self.words)
+        return self._prefix_index
+
+    def has_word(self, word: str) -> bool:
+        return self.get_prefix_index().has_word(word.upper())
+
+    def is_prefix(self, prefix: str) -> bool:
+        return self.get_prefix_index().is_prefix(prefix.upper())
+
+    def get_prefix_range(self, prefix: str, lo: int = 0, hi: Optional[int] = None) -> Tuple[int, int]:
+        return self.get_prefix_index().get_prefix_range(prefix.upper(), lo, hi)
+
+    def iter_words_with_prefix(self, prefix: str) -> Iterator[str]:
+        return self.get_prefix_index().iter_words_with_prefix(prefix.upper())
+
+    def get_random_words(self, number_of_words: int, rng: Optional[random.Random] = None) -> List[str]:
+        """
+        Returns distinct random words.
 
-    def get_random_words(self, number_of_words: int) -> List[str]:
-        return random.sample(self.words, number_of_words)
+        Args:
+            number_of_words: The number of words
+            rng: The random number generator to sample with. The shared one in the random module if not given.
+
+        Returns:
+            The words
+        """
+        sample = rng.sample if rng is not None else random.sample
+        return sample(self.words, number_of_words)
 
     def num_words(self) -> int:
         return len(self.words)
+
+
+class FilteredPrefixIndex(PrefixIndex):
+    """
+    Prefix index over the words of another prefix index with some words removed.
+
+    The sorted words and prefix ranges are those of the underlying index, so a range may include removed words.
+    Callers working with ranges directly must check candidate words with has_word.
+    """
+
+    def __init__(self, sorted_words: Sequence[str], removed_words: FrozenSet[str]):
+        super(FilteredPrefixIndex, self).__init__(sorted_words)
+        self.removed_words = removed_words
+
+    def has_word(self, word: str) -> bool:
+        return (word not in self.removed_words) and super(FilteredPrefixIndex, self).has_word(word)
+
+    def is_prefix(self, prefix: str) -> bool:
+        start, end = self.get_prefix_range(prefix)
+        # At most every removed word sits in the range, so one more word than that is enough to find a kept word
+        for index in range(start, min(end, start + len(self.removed_words) + 1)):
+            if self.sorted_words[index] not in self.removed_words:
+                return True
+        return False
+
+    def iter_words_with_prefix(self, prefix: str) -> Iterator[str]:
+        for word in super(FilteredPrefixIndex, self).iter_words_with_prefix(prefix):
+            if word not in self.removed_words:
+                yield word
+
+
+class FilteredWordSet(collections.abc.Set):
+    """
+    Set of the words of another set with some words removed, without copying the words that are kept.
+    """
+
+    def __init__(self, word_set: Collection[str], removed_words: FrozenSet[str]):
+        self.word_set = word_set
+        self.removed_words = removed_words
+
+    def __contains__(self, word) -> bool:
+        return (word not in self.removed_words) and (word in self.word_set)
+
+    def __iter__(self) -> Iterator[str]:
+        return (word for word in self.word_set if word not in self.removed_words)
+
+    def __len__(self) -> int:
+        return len(self.word_set) - len(self.removed_words)
+
+
+class FilteredWordList(collections.abc.Sequence):
+    """
+    Sorted sequence of the words of another sorted sequence with some words removed, without copying the words that
+    are kept.
+
+    Only the positions of the removed words are held. The kept word at an index is found by binary search over how
+    many words are kept before each removed word.
+    """
+
+    def __init__(self, sorted_words: Sequence[str], removed_words: FrozenSet[str]):
+        self.sorted_words = sorted_words
+        removed_indexes = sorted(bisect_left(sorted_words, word) for word in removed_words)
+        # Number of kept words before each removed word, which never decreases
+        self.kept_before_removed = [index - position for position, index in enumerate(removed_indexes)]
+
+    def __len__(self) -> int:
+        return len(self.sorted_words) - len(self.kept_before_removed)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("word index out of range")
+        # Every removed word with no more than index kept words before it comes before the kept word
+        return self.sorted_words[index + bisect_right(self.kept_before_removed, index)]
+
+
+class FilteredWordManager(WordManager):
+    """
+    Word manager for a dictionary that is another word manager's dictionary with some words removed.
+
+    All lookups go through the other word manager's indexes, so the words they share are only held in memory once.
+    words and word_set are views over the other word manager's words that skip the removed words.
+    """
+
+    def __init__(self, base_word_manager: WordManager, removed_words: Iterable[str]):
+        # The words are held by the base word manager so there is nothing to load
+        self.base_word_manager = base_word_manager
+        # Words the base word manager does not have are already missing
+        self.removed_words: FrozenSet[str] = frozenset(
+            [word.upper() for word in removed_words if base_word_manager.is_word(word)]
+        )
+        self.source_hash = None
+        self.word_set = FilteredWordSet(base_word_manager.word_set, self.removed_words)
+        self.words = FilteredWordList(base_word_manager.words, self.removed_words)
+        self._prefix_index = None
+
+    def is_word(self, word: str) -> bool:
+        return word.upper() in self.word_set
+
+    def get_prefix_index(self) -> PrefixIndex:
+        if self._prefix_index is None:
+            # Searching the base word manager's words directly is faster than going through the filtered view
+            base_prefix_index = self.base_word_manager.get_prefix_index()
+            self._prefix_index = FilteredPrefixIndex(base_prefix_index.sorted_words, self.removed_words)
+        return self._prefix_index
+
+    def get_random_words(self, number_of_words: int, rng: Optional[random.Random] = None) -> List[str]:
+        base_words = self.base_word_manager.words
+        if number_of_words > self.num_words():
+            raise ValueError("Sample larger than population")
+
+        # Even if every removed word is sampled, enough kept words remain
+        sample_size = min(number_of_words + len(self.removed_words), len(base_words))
+        sample = rng.sample if rng is not None else random.sample
+        random_words = [word for word in sample(base_words, sample_size) if word not in self.removed_words]
+        return random_words[:number_of_words]
@@ -0,0 +1,114 @@
+import logging
+import os
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .compiled_words import get_source_hash
+from .word_manager import FilteredWordManager, WordManager, get_word_file_location, iter_file_words
+
+# A dictionary is only shared with a larger one if it holds at least this fraction of the larger one's words
+MIN_SHARED_FRACTION = 0.95
+# How many base words to step through before searching for the next word of a sorted word file
+NEARBY_WORDS = 8
+
+LOG = logging.getLogger("common.word_manager_registry")
+
+
+class WordManagerRegistry:
+    """
+    Loads word files so that games with the same or overlapping dictionaries share one in-memory index.
+
+    Word files with identical contents, found by hashing the file, share a single word manager.
+    A word file whose words are almost all contained in a larger loaded dictionary gets a filtered view of that
+    dictionary instead of its own index. Its words are checked against the larger dictionary one at a time as the
+    file is read, so only the words it does not have are ever held in memory.
+    """
+
+    def __init__(self, min_shared_fraction: float = MIN_SHARED_FRACTION):
+        self.min_shared_fraction = min_shared_fraction
+
+        self.word_managers_by_path: Dict[str, WordManager] = {}
+        self.word_managers_by_hash: Dict[bytes, WordManager] = {}
+        # Word managers that hold their own index, largest first
+        self.base_word_managers: List[WordManager] = []
+
+    def load_word_files(self, word_file_paths: Iterable[str]):
+        """
+        Loads the given word files.
+        Loading every word file at once lets the largest dictionaries become the ones others share.
+
+        Args:
+            word_file_paths: The paths of the word files, relative to the static directory
+        """
+        new_word_file_paths = {path for path in word_file_paths if path not in self.word_managers_by_path}
+        # Load the largest files first so that smaller ones can be filtered views of them
+        for word_file_path in sorted(
+            new_word_file_paths, key=lambda path: os.path.getsize(get_word_file_location(path)), reverse=True
+        ):
+            with open(get_word_file_location(word_file_path), mode="rb") as word_file:
+                source_bytes = word_file.read()
+            self.word_managers_by_path[word_file_path] = self._share(word_file_path, source_bytes)
+
+    def get_word_manager(self, word_file_path: str) -> WordManager:
+        """
+        Returns the word manager for the given word file, loading the file if it has not been loaded yet.
+        """
+        if word_file_path not in self.word_managers_by_path:
+            self.load_word_files([word_file_path])
+        return self.word_managers_by_path[word_file_path]
+
+    def _share(self, word_file_path: str, source_bytes: bytes) -> WordManager:
+        source_hash = get_source_hash(source_bytes)
+        shared_word_manager = self.word_managers_by_hash.get(source_hash, None)
+        if shared_word_manager is not None:
+            LOG.info(f"{word_file_path} is identical to an already loaded word file, sharing its words")
+            return shared_word_manager
+
+        # Every word is on its own line, so this is at least the number of words in the file
+        max_words = source_bytes.count(b"\n") + 1
+        for base_word_manager in self.base_word_managers:
+            if max_words < self.min_shared_fraction * base_word_manager.num_words():
+                continue
+            removed_words = self._find_removed_words(base_word_manager, iter_file_words(source_bytes))
+            if removed_words is not None:
+                LOG.info(f"{word_file_path} is a subset of an already loaded word file, sharing its words")
+                shared_word_manager = FilteredWordManager(base_word_manager, removed_words)
+                break
+        else:
+            shared_word_manager = WordManager(word_file_path=word_file_path)
+            self.base_word_managers.append(shared_word_manager)
+
+        self.word_managers_by_hash[source_hash] = shared_word_manager
+        return shared_word_manager
+
+    def _find_removed_words(self, base_word_manager: WordManager, words: Iterator[str]) -> Optional[List[str]]:
+        # Returns the words of the base word manager missing from the given words,
+        # or None if the given words are not almost all of the base word manager's words
+        base_words = base_word_manager.words
+        # Marks the index in the base words of every word found
+        found = bytearray(len(base_words))
+        found_words = 0
+        index = 0
+        previous_word = ""
+        for word in words:
+            if not base_word_manager.is_word(word):
+                return None
+
+            if word < previous_word:
+                # Word files are usually sorted, but search from the start if this one is not
+                index = bisect_left(base_words, word)
+            else:
+                # The next word of a sorted subset is almost always one of the next few base words
+                end = min(index + NEARBY_WORDS, len(base_words))
+                while (index < end) and (base_words[index] < word):
+                    index += 1
+                if (index == end) or (base_words[index] != word):
+                    index = bisect_left(base_words, word, index)
+            if not found[index]:
+                found[index] = 1
+                found_words += 1
+            previous_word = word
+
+        if found_words < self.min_shared_fraction * len(base_words):
+            return None
+        return [base_words[index] for index in range(len(base_words)) if not found[index]]
@@ -1,3 +1,4 @@
+from collections import Counter
 from typing import List, Optional, Tuple, Set, Dict
 
 from ...common.word_manager import WordManager
@@ -8,22 +9,75 @@ class Board:
     Represents a board for a single player.
     Boards are assumed to be square (equal number of rows and columns).
 
-    The board is represented as a two dimensional matrix.
+    Only the occupied points of the board are stored, in a dictionary from point to tile, along with the bounding box
+    of those points. The work done on a board scales with the number of tiles on it rather than the size of the board.
+    The board as a two dimensional matrix is available from the board property.
     Points on the board are represented as tuples of integers: (row, column).
     The upper-left corner of the board is point (0,0).
     The lower-right corner of the board is point (board_size-1, board_size-1).
+
+    Tiles are stored at logical points which are offset from the points on the board by an origin.
+    Shifting the board only moves the origin, and points are translated whenever they enter or leave this class.
+
+    The invalid points of each row and column are cached between validations.
+    Changing a tile only clears the caches of its row and column, so validation only rechecks the changed lines.
     """
 
     def __init__(self, player_id: str, board_size: int, word_manager: WordManager):
         self.player_id = player_id
         self.board_size = board_size
-        self.board: List[List[Optional[str]]] = [[None for _ in range(board_size)] for _ in range(board_size)]
         self.word_manager = word_manager
 
+        # The point on the board of logical point (0, 0)
+        self.origin_row = 0
+        self.origin_col = 0
+
+        # Everything below is in logical points
+        self.tiles: Dict[Tuple[int, int], str] = {}
+        # Number of tiles in each row and column that has tiles
+        self.row_counts: Counter = Counter()
+        self.col_counts: Counter = Counter()
+        # (min row, min column, max row, max column) of the tiles. None if it needs to be recalculated.
+        self.bounding_box: Optional[Tuple[int, int, int, int]] = None
+
+        # For each row with tiles, the invalid columns of that row along with the end of the board the row reached
+        # when it was checked (see _get_line_end). Missing if the row has changed since it was checked.
+        self.row_invalid_cols: Dict[int, Tuple[Optional[int], Set[int]]] = {}
+        # The same for each column with tiles
+        self.col_invalid_rows: Dict[int, Tuple[Optional[int], Set[int]]] = {}
+
+    def __getstate__(self) -> Dict[str, object]:
+        # The word manager is shared between boards, so the game restores it when the board is loaded
+        state = self.__dict__.copy()
+        state["word_manager"] = None
+        return state
+
+    @property
+    def board(self) -> List[List[Optional[str]]]:
+        """
+        Returns the board as a two dimensional matrix with None for empty points.
+        """
+        board: List[List[Optional[str]]] = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
+        for (row, col), tile in self.tiles.items():
+            board[row + self.origin_row][col + self.origin_col] = tile
+        return board
+
     def _set_board(self, board: List[List[Optional[str]]]):
         # Helper method for tests to set the board how they like.
         self.board_size = len(board)
-        self.board = board
+        self.origin_row = 0
+        self.origin_col = 0
+        self.tiles = {}
+        self.row_counts = Counter()
+        self.col_counts = Counter()
+        self.bounding_box = None
+        self.row_invalid_cols = {}
+        self.col_invalid_rows = {}
+
+        for row in range(self.board_size):
+            for col in range(self.board_size):
+                if board[row][col] is not None:
+                    self.add_tile(board[row][col], row, col)
 
     def add_tile(self, tile: str, row: int, col: int) -> Optional[str]:
         """
@@ -37,10 +91,27 @@ class Board:
         Returns:
             The tile that was previously at that location. Could be None.
         """
-        previous_tile = self.board[row][col]
-        self.board[row][col] = tile
+        row, col = self._to_logical(row, col)
+
+        previous_tile = self.tiles.get((row, col), None)
+        self.tiles[(row, col)] = tile
+
+        if previous_tile is None:
+            self.row_counts[row] += 1
+            self.col_counts[col] += 1
+            if self.bounding_box is not None:
+                min_row, min_col, max_row, max_col = self.bounding_box
+                self.bounding_box = (min(min_row, row), min(min_col, col), max(max_row, row), max(max_col, col))
+
+        self._mark_changed(row, col)
         return previous_tile
 
+    def get_tile(self, row: int, col: int) -> Optional[str]:
+        """
+        Returns the tile at the given position on the board. Could be None.
+        """
+        return self.tiles.get(self._to_logical(row, col), None)
+
     def remove_tile(self, row: int, col: int) -> Optional[str]:
         """
         Removes the tile from the given position on the board.
@@ -52,121 +123,222 @@ class Board:
         Returns:
             The tile that was removed. Could be None.
         """
-        removed_tile = self.board[row][col]
-        self.board[row][col] = None
+        row, col = self._to_logical(row, col)
+
+        removed_tile = self.tiles.pop((row, col), None)
+        if removed_tile is None:
+            return None
+
+        self.row_counts[row] -= 1
+        if self.row_counts[row] == 0:
+            del self.row_counts[row]
+            # The bounding box shrinks if this was the last tile on one of its edges
+            self.bounding_box = None
+        self.col_counts[col] -= 1
+        if self.col_counts[col] == 0:
+            del self.col_counts[col]
+            self.bounding_box = None
+
+        self._mark_changed(row, col)
         return removed_tile
 
-    def _find_connected_tiles(self, row, col, non_empty_tiles_not_visited: set) -> None:
+    def get_bounding_box(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Returns the smallest box containing every tile on the board.
+
+        Returns:
+            The (min row, min column, max row, max column) of the tiles. None if the board is empty.
         """
-        Recursive function used to find all connected tiles from a given point.
+        logical_bounding_box = self._get_logical_bounding_box()
+        if logical_bounding_box is None:
+            return None
+
+        min_row, min_col, max_row, max_col = logical_bounding_box
+        return (
+            min_row + self.origin_row,
+            min_col + self.origin_col,
+            max_row + self.origin_row,
+            max_col + self.origin_col,
+        )
+
+    def _get_logical_bounding_box(self) -> Optional[Tuple[int, int, int, int]]:
+        if not self.tiles:
+            return None
+        if self.bounding_box is None:
+            self.bounding_box = (min(self.row_counts), min(self.col_counts), max(self.row_counts), max(self.col_counts))
+        return self.bounding_box
+
+    def _to_logical(self, row: int, col: int) -> Tuple[int, int]:
+        if not ((0 <= row < self.board_size) and (0 <= col < self.board_size)):
+            raise IndexError(f"Point ({row}, {col}) is not on the board")
+        return row - self.origin_row, col - self.origin_col
+
+    def _mark_changed(self, row: int, col: int):
+        self.row_invalid_cols.pop(row, None)
+        self.col_invalid_rows.pop(col, None)
+
+    def _find_connected_tiles(self, row, col, non_empty_tiles_not_visited: set) -> Set[Tuple[int, int]]:
+        """
+        Function used to find all connected tiles from a given point.
+        The search is iterative so that long chains of tiles cannot exceed the recursion limit.
         NOTE: non_empty_tiles_not_visited will be modified by this function.
 
         Args:
             row: The starting row
             col: The starting column
             non_empty_tiles_not_visited: The complete set of non-empty tiles for this function to work with
-        """
 
+        Returns:
+            The points of all tiles connected to the starting point, including the starting point
+        """
         non_empty_tiles_not_visited.remove((row, col))
+        connected_tiles = {(row, col)}
+        tiles_to_visit = [(row, col)]
 
-        if (row > 0) and (self.board[row - 1][col] is not None) and ((row - 1, col) in non_empty_tiles_not_visited):
-            self._find_connected_tiles(row - 1, col, non_empty_tiles_not_visited)
-        if (
-            (row < self.board_size - 1)
-            and (self.board[row + 1][col] is not None)
-            and ((row + 1, col) in non_empty_tiles_not_visited)
-        ):
-            self._find_connected_tiles(row + 1, col, non_empty_tiles_not_visited)
-        if (col > 0) and (self.board[row][col - 1] is not None) and ((row, col - 1) in non_empty_tiles_not_visited):
-            self._find_connected_tiles(row, col - 1, non_empty_tiles_not_visited)
-        if (
-            (col < self.board_size - 1)
-            and (self.board[row][col + 1] is not None)
-            and ((row, col + 1) in non_empty_tiles_not_visited)
-        ):
-            self._find_connected_tiles(row, col + 1, non_empty_tiles_not_visited)
+        while tiles_to_visit:
+            row, col = tiles_to_visit.pop()
+            # Points off the board are never in the set of non-empty tiles so no bounds checks are needed
+            for neighbor in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                if neighbor in non_empty_tiles_not_visited:
+                    non_empty_tiles_not_visited.remove(neighbor)
+                    connected_tiles.add(neighbor)
+                    tiles_to_visit.append(neighbor)
 
-    def _check_connected(self) -> Set[Tuple[int, int]]:
+        return connected_tiles
+
+    def get_connected_components(self) -> List[Set[Tuple[int, int]]]:
         """
-        Function used to check if all tiles on the board are connected.
+        Finds the groups of tiles on the board that are connected to each other.
 
         Returns:
-            A set of points on the board that are not connected. May be empty which indicates all tiles are connected.
+            The groups of connected tiles, ordered by the row-major position of their first tile.
+            Empty for an empty board.
+        """
+        non_empty_tiles_not_visited = set(self.tiles)
+        components = []
+        for row, col in sorted(self.tiles):
+            if (row, col) in non_empty_tiles_not_visited:
+                component = self._find_connected_tiles(row, col, non_empty_tiles_not_visited)
+                components.append({(r + self.origin_row, c + self.origin_col) for r, c in component})
+        return components
+
+    def get_component_sizes(self) -> List[int]:
         """
-        first_tile = None
-        non_empty_tiles = set()
+        Returns the number of tiles in each group of connected tiles, in the same order as get_connected_components.
+        """
+        return [len(component) for component in self.get_connected_components()]
 
-        # Find the first tile and all tiles that are non-empty
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                tile = self.board[row][col]
-                if tile is not None:
-                    non_empty_tiles.add((row, col))
-                    if first_tile is None:
-                        first_tile = (row, col)
+    def _check_connected(self) -> Set[Tuple[int, int]]:
+        """
+        Function used to check if all tiles on the board are connected.
 
-        # Traverse through all tiles reachable from the first tile.
-        # Whatever tiles are left in non_empty_tiles are not connected.
-        self._find_connected_tiles(first_tile[0], first_tile[1], non_empty_tiles)
-        return non_empty_tiles
+        Returns:
+            A set of points on the board that are not connected to the first tile on the board.
+            May be empty which indicates all tiles are connected, or that the board is empty.
+        """
+        unconnected_tiles = set()
+        for component in self.get_connected_components()[1:]:
+            unconnected_tiles.update(component)
+        return unconnected_tiles
 
     def _check_valid_words(self) -> Set[Tuple[int, int]]:
         """
         Helper method to check that all words in the crossword of the board are valid.
+        Only rows and columns that have changed since the last check are checked again.
 
         Returns:
             A set of points that are part of invalid words.
             This may be empty, indicating the board is a valid crossword.
         """
         invalid_points = set()
+        if not self.tiles:
+            return invalid_points
+        min_row, min_col, max_row, max_col = self._get_logical_bounding_box()
+
         # Check across each row
-        for row in range(self.board_size):
-            current_word = ""
-            for col in range(self.board_size):
-                tile = self.board[row][col]
-                # If the position is blank, it's time to check
-                if tile is None:
-                    # If we have a current word of length more than 1, check its validity
-                    if len(current_word) > 1:
-                        # If the word is not valid, add the points to the list of invalid points
-                        if not self.word_manager.is_word(current_word):
-                            for i in range(len(current_word)):
-                                invalid_points.add((row, col - 1 - i))
-                    # Now that we are done with our checks, we clear the current word to continue our search
-                    current_word = ""
-                else:
-                    current_word += tile
-
-            # The current word could go to the end of the board so we need to do an additional check
-            if not self.word_manager.is_word(current_word):
-                for i in range(len(current_word)):
-                    invalid_points.add((row, self.board_size - 1 - i))
+        for row in self.row_counts:
+            line_end = self._get_line_end(row, None)
+            cached_result = self.row_invalid_cols.get(row, None)
+            if (cached_result is None) or (cached_result[0] != line_end):
+                line = [self.tiles.get((row, col), None) for col in range(min_col, max_col + 1)]
+                cached_result = (line_end, self._find_invalid_indexes(line, min_col, line_end is not None))
+                self.row_invalid_cols[row] = cached_result
+            for col in cached_result[1]:
+                invalid_points.add((row + self.origin_row, col + self.origin_col))
 
         # Check down each column
-        for col in range(self.board_size):
-            current_word = ""
-            for row in range(self.board_size):
-                tile = self.board[row][col]
-                # If the position is blank, it's time to check
-                if tile is None:
-                    # If we have a current word of length more than 1, check its validity
-                    if len(current_word) > 1:
-                        # If the word is not valid, add the points to the list of invalid points
-                        if not self.word_manager.is_word(current_word):
-                            for i in range(len(current_word)):
-                                invalid_points.add((row - 1 - i, col))
-                    # Now that we are done with our checks, we clear the current word to continue our search
-                    current_word = ""
-                else:
-                    current_word += tile
-
-            # The current word could go to the end of the board so we need to do an additional check
-            if not self.word_manager.is_word(current_word):
-                for i in range(len(current_word)):
-                    invalid_points.add((self.board_size - 1 - i, col))
+        for col in self.col_counts:
+            line_end = self._get_line_end(None, col)
+            cached_result = self.col_invalid_rows.get(col, None)
+            if (cached_result is None) or (cached_result[0] != line_end):
+                line = [self.tiles.get((row, col), None) for row in range(min_row, max_row + 1)]
+                cached_result = (line_end, self._find_invalid_indexes(line, min_row, line_end is not None))
+                self.col_invalid_rows[col] = cached_result
+            for row in cached_result[1]:
+                invalid_points.add((row + self.origin_row, col + self.origin_col))
 
         return invalid_points
 
+    def _get_line_end(self, row: Optional[int], col: Optional[int]) -> Optional[int]:
+        """
+        Words running into the edge of the board are checked differently to words followed by a blank.
+        The result of checking a line only depends on its tiles and whether it has a tile on the edge of the board,
+        so cached results can be kept across shifts as long as this does not change.
+
+        Args:
+            row: The logical row, or None if checking a column
+            col: The logical column, or None if checking a row
+
+        Returns:
+            The logical index of the edge of the board if the line has a tile there, None otherwise
+        """
+        if col is None:
+            edge_col = self.board_size - 1 - self.origin_col
+            return edge_col if (row, edge_col) in self.tiles else None
+        else:
+            edge_row = self.board_size - 1 - self.origin_row
+            return edge_row if (edge_row, col) in self.tiles else None
+
+    def _find_invalid_indexes(self, line: List[Optional[str]], start: int, reaches_edge: bool) -> Set[int]:
+        """
+        Helper method to check that all words in a single row or column are valid.
+
+        Args:
+            line: The tiles of part of the row or column. Every tile in the row or column must be included.
+            start: The index of the first tile of the line in the row or column
+            reaches_edge: Whether the last tile of the line is on the edge of the board
+
+        Returns:
+            A set of indexes into the row or column that are part of invalid words.
+        """
+        # A line stopping short of the edge of the board is followed by a blank
+        if not reaches_edge:
+            line = line + [None]
+
+        invalid_indexes = set()
+        current_word = ""
+        for index in range(len(line)):
+            tile = line[index]
+            # If the position is blank, it's time to check
+            if tile is None:
+                # If we have a current word of length more than 1, check its validity
+                if len(current_word) > 1:
+                    # If the word is not valid, add the indexes to the set of invalid indexes
+                    if not self.word_manager.is_word(current_word):
+                        for i in range(len(current_word)):
+                            invalid_indexes.add(start + index - 1 - i)
+                # Now that we are done with our checks, we clear the current word to continue our search
+                current_word = ""
+            else:
+                current_word += tile
+
+        # The current word could go to the end of the board so we need to do an additional check
+        if not self.word_manager.is_word(current_word):
+            for i in range(len(current_word)):
+                invalid_indexes.add(start + len(line) - 1 - i)
+
+        return invalid_indexes
+
     def board_is_valid_crossword(self) -> Set[Tuple[int, int]]:
         """
         Returns whether the board represents a valid crossword.
@@ -189,17 +361,11 @@ class Board:
         Returns:
             True if the shift occurred, False otherwise
         """
-        for c in range(self.board_size):
-            if self.board[self.board_size - 1][c] is not None:
-                return False
-
-        for r in range(self.board_size - 1, 0, -1):
-            for c in range(self.board_size):
-                self.board[r][c] = self.board[r - 1][c]
-
-        for c in range(self.board_size):
-            self.board[0][c] = None
+        bounding_box = self.get_bounding_box()
+        if (bounding_box is not None) and (bounding_box[2] == self.board_size - 1):
+            return False
 
+        self.origin_row += 1
         return True
 
     def shift_board_up(self) -> bool:
@@ -209,17 +375,11 @@ class Board:
         Returns:
             True if the shift occurred, False otherwise
         """
-        for c in range(self.board_size):
-            if self.board[0][c] is not None:
-                return False
-
-        for r in range(0, self.board_size - 1):
-            for c in range(self.board_size):
-                self.board[r][c] = self.board[r + 1][c]
-
-        for c in range(self.board_size):
-            self.board[self.board_size - 1][c] = None
+        bounding_box = self.get_bounding_box()
+        if (bounding_box is not None) and (bounding_box[0] == 0):
+            return False
 
+        self.origin_row -= 1
         return True
 
     def shift_board_right(self) -> bool:
@@ -229,17 +389,11 @@ class Board:
         Returns:
             True if the shift occurred, False otherwise
         """
-        for r in range(self.board_size):
-            if self.board[r][self.board_size - 1] is not None:
-                return False
-
-        for c in range(self.board_size - 1, 0, -1):
-            for r in range(self.board_size):
-                self.board[r][c] = self.board[r][c - 1]
-
-        for r in range(self.board_size):
-            self.board[r][0] = None
+        bounding_box = self.get_bounding_box()
+        if (bounding_box is not None) and (bounding_box[3] == self.board_size - 1):
+            return False
 
+        self.origin_col += 1
         return True
 
     def shift_board_left(self) -> bool:
@@ -249,18 +403,18 @@ class Board:
         Returns:
             True if the shift occurred, False otherwise
         """
-        for r in range(self.board_size):
-            if self.board[r][0] is not None:
-                return False
-
-        for c in range(0, self.board_size - 1):
-            for r in range(self.board_size):
-                self.board[r][c] = self.board[r][c + 1]
-
-        for r in range(self.board_size):
-            self.board[r][self.board_size - 1] = None
+        bounding_box = self.get_bounding_box()
+        if (bounding_box is not None) and (bounding_box[1] == 0):
+            return False
 
+        self.origin_col -= 1
         return True
 
     def get_json(self) -> Dict[str, object]:
-        return {"board": self.board}
+        """
+        Returns the board to send to clients. Only the occupied points are sent.
+        """
+        return {
+            "board_size": self.board_size,
+            "tiles": [[row + self.origin_row, col + self.origin_col, tile] for (row, col), tile in self.tiles.items()],
+        }
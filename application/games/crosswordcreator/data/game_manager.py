@@ -1,43 +1,90 @@
+import logging
 import random
-import string
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
 from .game_state import GameState
+from ...common.game_name_allocator import GameNameAllocator
+from ...common.game_seed import get_game_seed
+from ...common.game_store import create_game_store
+from ...common.locking import synchronized
+from ...common.results_writer import ResultsWriter
 from ...common.word_manager import WordManager
 
+LOG = logging.getLogger("crosswordcreator.GameManager")
+
 
 class CrosswordCreatorGameManager:
     """
     Manages all the games.
     """
 
-    def __init__(self, word_manager: WordManager):
-        self.games = {}
+    def __init__(
+        self,
+        word_manager: WordManager,
+        seed: Optional[int] = None,
+        game_store_path: Optional[str] = None,
+        results_writer: Optional[ResultsWriter] = None,
+    ):
+        """
+        Args:
+            word_manager: The word manager for the games
+            seed: The seed for the manager's random number generator, which picks game names and the seed of every game.
+                  Games are only reproducible across runs if this is given.
+            game_store_path: The SQLite database to share games with other worker processes through.
+                             Games are kept in this process if not given.
+            results_writer: Where games record their results. Results are not recorded if not given.
+        """
+        self.games = create_game_store(
+            "crossword_creator", game_store_path, on_evict=self._expire_game, on_load=self._load_game
+        )
+        # Held while creating games so that creating a game for a name is atomic
+        self.lock = threading.RLock()
         self.word_manager = word_manager
+        self.results_writer = results_writer
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.name_allocator = GameNameAllocator("CC", rng=self.rng)
 
-    def create_game(self) -> GameState:
+    @synchronized
+    def create_game(self, seed: Optional[int] = None) -> GameState:
         """
         Creates a new game.
 
+        Args:
+            seed: The seed for the game, to replay an earlier game
+
         Returns:
             the game state
         """
-        game_name = self._create_game_name()
-        while game_name in self.games:
-            game_name = self._create_game_name()
-
-        return self.create_game_for_name(game_name)
+        game_state = None
+        while game_state is None:
+            # Other workers sharing the game store allocate names of their own, so the name may already be taken
+            game_name = self.name_allocator.allocate()
+            game_state = self.create_game_for_name(game_name, seed)
+            if game_state is None:
+                self.name_allocator.discard(game_name)
+        return game_state
 
-    def create_game_for_name(self, game_name: str) -> GameState:
+    @synchronized
+    def create_game_for_name(self, game_name: str, seed: Optional[int] = None) -> Optional[GameState]:
         """
-        Creates a new game with the given game name.
+        Creates a new game with the given game name, unless there is already a game with the name.
+
+        Args:
+            game_name: The name of the game
+            seed: The seed for the game, to replay an earlier game
 
         Returns:
-            the game state
+            the game state, or None if there is already a game with the name
         """
-        game_state = GameState(game_name, self.word_manager)
-        self.games[game_name] = game_state
+        game_seed = get_game_seed(seed, self.seed, self.rng)
+        game_state = GameState(game_name, self.word_manager, game_seed, self.results_writer)
+        if not self.games.add(game_name, game_state):
+            return None
 
+        self.name_allocator.reserve(game_name)
         return game_state
 
     def get_game_state(self, game_name: str) -> Optional[GameState]:
@@ -50,15 +97,26 @@ class CrosswordCreatorGameManager:
             the game state if one exists
         """
         game_name = game_name.upper()
-        return self.games.get(game_name, None)
-
-    @staticmethod
-    def _create_game_name() -> str:
-        game_name = ""
-        for i in range(0, 3):
-            game_name += random.choice(string.ascii_uppercase)
-        return "CC" + game_name
-
-    def _expire_game(self):
-        # TODO we should expire games so that they don't live in memory forever.
-        pass
+        return self.games.get(game_name)
+
+    @contextmanager
+    def update_game_state(self, game_name: str) -> Iterator[Optional[GameState]]:
+        """
+        Hands out the game state for the given game name to be changed.
+        No other request can change the game until the block ends, and changes are then visible to every worker.
+
+        Args:
+            game_name: the game name
+
+        Returns:
+            the game state if one exists
+        """
+        with self.games.update(game_name.upper()) as game_state:
+            yield game_state
+
+    def _expire_game(self, game_name: str, game_state: GameState):
+        LOG.info(f"Game {game_name} has expired")
+        self.name_allocator.release(game_name)
+
+    def _load_game(self, game_state: GameState):
+        game_state.restore(self.word_manager, self.results_writer)
@@ -1,8 +1,12 @@
 import logging
-from typing import Dict, List, Tuple, Set
+import random
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple, Set
 
 from .board import Board
-from .tiles import Tiles
+from .tiles import TileBag
+from ...common.locking import synchronized
+from ...common.results_writer import ResultsWriter
 from ...common.word_manager import WordManager
 
 STARTING_TILES_PER_PLAYER = 20
@@ -10,28 +14,95 @@ TILES_PER_PLAYER = STARTING_TILES_PER_PLAYER * 2
 BOARD_SIZE = 25
 EXCHANGE_TILES = 3
 
+WINNERS_COLLECTION = "crossword_creator_winners"
+
+# Row and column offsets for each direction a board can be shifted
+SHIFT_DIRECTIONS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
 LOG = logging.getLogger("crosswordcreator.GameState")
 
 
 class GameState:
     """
     Class representing the state of a game.
+
+    Each player's view of the game (their board and hand) has a version number that goes up every time it changes.
+    Changes made by the player themselves are returned as patches holding only what changed, along with the new
+    version. Clients apply a patch if it is the version after the one they have, and request the full game state
+    otherwise.
+
+    Players in the same game are served by different threads, so every public method holds the game's lock while it
+    runs.
     """
 
-    def __init__(self, game_name: str, word_manager: WordManager):
+    def __init__(
+        self,
+        game_name: str,
+        word_manager: WordManager,
+        seed: Optional[int] = None,
+        results_writer: Optional[ResultsWriter] = None,
+    ):
         """
         Generates a new game state.
+
+        Args:
+            game_name: The name of the game
+            word_manager: The word manager to check words with
+            seed: The seed for the game's random number generator. Games with the same seed and the same moves deal
+                  the same tiles. A random seed is used if not given.
+            results_writer: Where to record the winner of the game. Results are not recorded if not given.
         """
+        self.lock = threading.RLock()
         self.game_name = game_name
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
         self.word_manager = word_manager
+        self.results_writer = results_writer
 
+        self.player_ids_to_names: Dict[str, str] = {}
         self.player_ids_to_tiles: Dict[str, List[str]] = {}
         self.player_ids_to_boards: Dict[str, Board] = {}
+        self.player_ids_to_versions: Dict[str, int] = {}
 
-        self.tiles_left = -1
+        self.tile_bag: Optional[TileBag] = None
         self.winning_player_id = None
         self.game_running = False
 
+    def __getstate__(self) -> Dict[str, object]:
+        # Locks cannot be pickled and the word manager and results writer are shared, so they are left out
+        state = self.__dict__.copy()
+        del state["lock"]
+        state["word_manager"] = None
+        state["results_writer"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, object]):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+
+    def restore(self, word_manager: WordManager, results_writer: Optional[ResultsWriter] = None):
+        """
+        Restores what is left out when the game is pickled, after the game has been loaded from a game store.
+
+        Args:
+            word_manager: The word manager to check words with
+            results_writer: Where to record the winner of the game
+        """
+        self.word_manager = word_manager
+        self.results_writer = results_writer
+        for board in self.player_ids_to_boards.values():
+            board.word_manager = word_manager
+
+    @property
+    def tiles_left(self) -> int:
+        """
+        The number of tiles left in the bag, or -1 if the game has not been started.
+        """
+        if self.tile_bag is None:
+            return -1
+        return len(self.tile_bag)
+
+    @synchronized
     def new_player(self, player_id: str, player_name: str) -> bool:
         """
         Method to call when a new player joins the game.
@@ -50,22 +121,27 @@ class GameState:
             return False
         else:
             self._log_info(f"Player {player_id}/{player_name} has joined game.")
+            self.player_ids_to_names[player_id] = player_name
             self.player_ids_to_boards[player_id] = Board(player_id, BOARD_SIZE, self.word_manager)
             self.player_ids_to_tiles[player_id] = []
+            self.player_ids_to_versions[player_id] = 0
             return True
 
+    @synchronized
     def start_game(self):
         # Reset the boards
         for player_id in self.player_ids_to_boards:
             self.player_ids_to_boards[player_id] = Board(player_id, BOARD_SIZE, self.word_manager)
 
         # Reset the tiles
-        self.tiles_left = TILES_PER_PLAYER * len(self.player_ids_to_boards.keys())
+        self.tile_bag = TileBag(TILES_PER_PLAYER * len(self.player_ids_to_boards.keys()), self.rng)
         self._generate_player_tiles()
+        self._increment_all_versions()
 
         self.game_running = True
-        self._log_info("Game started")
+        self._log_info(f"Game started with seed {self.seed}")
 
+    @synchronized
     def end_game(self, winning_player: str):
         """
         Method to call when a game is over.
@@ -77,6 +153,21 @@ class GameState:
         self.winning_player_id = winning_player
         self._log_info(f"Game ended. Winning player: ${winning_player}")
 
+        if self.results_writer:
+            self.results_writer.record(
+                WINNERS_COLLECTION,
+                self.game_name,
+                {
+                    "game_name": self.game_name,
+                    # Seeds can be too large for the integer types of databases
+                    "seed": str(self.seed),
+                    "winning_player_id": winning_player,
+                    "winning_player_name": self.player_ids_to_names.get(winning_player),
+                    "player_ids": sorted(self.player_ids_to_tiles.keys()),
+                },
+            )
+
+    @synchronized
     def get_game_state(self, player_id: str) -> Dict[str, object]:
         """
         Returns the state of the game when a player joins or reloads the game.
@@ -92,6 +183,7 @@ class GameState:
             "tiles_left": self.tiles_left,
             "players": {},
             "game_running": self.game_running,
+            "version": self.player_ids_to_versions[player_id],
         }
         player_dict = {"hand_tiles": self.player_ids_to_tiles[player_id]}
         player_dict = {**player_dict, **self.player_ids_to_boards[player_id].get_json()}
@@ -99,7 +191,45 @@ class GameState:
 
         return game_state
 
-    def add_tile(self, player_id: str, hand_tile_index: int, board_position: Tuple[int, int]) -> None:
+    @synchronized
+    def get_patch(
+        self,
+        player_id: str,
+        changed_positions: Sequence[Tuple[int, int]] = (),
+        shift: Optional[Tuple[int, int]] = None,
+        hand_removed_index: Optional[int] = None,
+        hand_added_tiles: Sequence[str] = (),
+    ) -> Dict[str, object]:
+        """
+        Moves the player on to the next version and returns the patch from the previous version to it.
+
+        Clients apply a patch by shifting their board, then setting each changed position, then removing the tile at
+        the removed index of their hand, then adding the added tiles to the end of their hand.
+
+        Args:
+            player_id: The ID of the player
+            changed_positions: The positions on the player's board that changed
+            shift: The row and column offset the player's board was shifted by, if it was shifted
+            hand_removed_index: The index of the tile removed from the player's hand, if one was removed
+            hand_added_tiles: The tiles added to the end of the player's hand
+
+        Returns:
+            The patch
+        """
+        self.player_ids_to_versions[player_id] += 1
+
+        board = self.player_ids_to_boards[player_id]
+        return {
+            "version": self.player_ids_to_versions[player_id],
+            "tiles_left": self.tiles_left,
+            "shift": list(shift) if shift else None,
+            "tiles": [[row, col, board.get_tile(row, col)] for row, col in changed_positions],
+            "hand_removed_index": hand_removed_index,
+            "hand_added_tiles": list(hand_added_tiles),
+        }
+
+    @synchronized
+    def add_tile(self, player_id: str, hand_tile_index: int, board_position: Tuple[int, int]) -> Dict[str, object]:
         """
         Adds the tile with the given index in the player's hand to their board at the given position.
 
@@ -107,16 +237,29 @@ class GameState:
             player_id: The ID of the player
             hand_tile_index: The index of the tile in the player's hand
             board_position: The position on the board
+
+        Returns:
+            The patch for the change to the player's board and hand
         """
         # Remove the tile from the player's hand
         tile = self.player_ids_to_tiles[player_id].pop(hand_tile_index)
 
         # Add the tile we are replacing if the position on the board already has a tile
         replaced_tile = self.player_ids_to_boards[player_id].add_tile(tile, board_position[0], board_position[1])
+        hand_added_tiles = []
         if replaced_tile:
             self.player_ids_to_tiles[player_id].append(replaced_tile)
+            hand_added_tiles.append(replaced_tile)
+
+        return self.get_patch(
+            player_id,
+            changed_positions=[(board_position[0], board_position[1])],
+            hand_removed_index=hand_tile_index,
+            hand_added_tiles=hand_added_tiles,
+        )
 
-    def remove_tile(self, player_id: str, board_position: Tuple[int, int]) -> None:
+    @synchronized
+    def remove_tile(self, player_id: str, board_position: Tuple[int, int]) -> Optional[Dict[str, object]]:
         """
         Method to call when a player removes a tile from their board.
         This method will also update the player's hand.
@@ -124,14 +267,51 @@ class GameState:
         Args:
             player_id: The ID of the player
             board_position: The position on the board that the player wants to remove
+
+        Returns:
+            The patch for the change to the player's board and hand. None if there was no tile to remove.
         """
         removed_tile = self.player_ids_to_boards[player_id].remove_tile(board_position[0], board_position[1])
-        if removed_tile:
-            self.player_ids_to_tiles[player_id].append(removed_tile)
+        if not removed_tile:
+            return None
+
+        self.player_ids_to_tiles[player_id].append(removed_tile)
+        return self.get_patch(
+            player_id, changed_positions=[(board_position[0], board_position[1])], hand_added_tiles=[removed_tile]
+        )
 
-    def exchange_tile(self, player_id: str, hand_tile_index: int) -> List[str]:
+    @synchronized
+    def shift_board(self, player_id: str, direction: str) -> Optional[Dict[str, object]]:
+        """
+        Shifts the player's board one space in the given direction.
+
+        Args:
+            player_id: The ID of the player
+            direction: One of up, down, left or right
+
+        Returns:
+            The patch for the change to the player's board. None if the board could not be shifted.
+        """
+        if direction not in SHIFT_DIRECTIONS:
+            raise ValueError(f"Invalid direction specified for board shift: {direction}")
+
+        board = self.player_ids_to_boards[player_id]
+        shift_functions = {
+            "up": board.shift_board_up,
+            "down": board.shift_board_down,
+            "left": board.shift_board_left,
+            "right": board.shift_board_right,
+        }
+        if not shift_functions[direction]():
+            return None
+
+        return self.get_patch(player_id, shift=SHIFT_DIRECTIONS[direction])
+
+    @synchronized
+    def exchange_tile(self, player_id: str, hand_tile_index: int) -> Dict[str, object]:
         """
         Method to call when a player exchanges a tile in their hand with three from the pile.
+        The exchanged tile goes back in the pile after the new tiles are drawn.
         This method will update the player's hand.
 
         Args:
@@ -139,21 +319,23 @@ class GameState:
             hand_tile_index: The index of the tile in the player's hand
 
         Returns:
-            The tiles that were added to the player's hand.
+            The patch for the change to the player's hand, which includes the tiles added to the player's hand.
         """
         if self.tiles_left < EXCHANGE_TILES:
             raise ValueError("Cannot exchange. Not enough tiles.")
 
-        self.player_ids_to_tiles[player_id].pop(hand_tile_index)
-        new_tiles = Tiles.generate_tiles(EXCHANGE_TILES)
+        exchanged_tile = self.player_ids_to_tiles[player_id].pop(hand_tile_index)
+        new_tiles = self.tile_bag.draw_tiles(EXCHANGE_TILES)
+        self.tile_bag.return_tile(exchanged_tile)
         self.player_ids_to_tiles[player_id].extend(new_tiles)
-        self.tiles_left -= EXCHANGE_TILES
-        return new_tiles
+        return self.get_patch(player_id, hand_removed_index=hand_tile_index, hand_added_tiles=new_tiles)
 
+    @synchronized
     def peel(self, player_id: str) -> Set[Tuple[int, int]]:
         """
         Method to call when a player attempts to peel.
         If the peel is successful, this method will add a tile to every player's hand.
+        If there are not enough tiles left for every player, the player who peeled wins the game instead.
 
         Args:
             player_id: The ID of the player
@@ -167,20 +349,26 @@ class GameState:
         invalid_positions = self.player_ids_to_boards[player_id].board_is_valid_crossword()
 
         if len(invalid_positions) == 0:
-            for player_id in self.player_ids_to_tiles.keys():
-                self.player_ids_to_tiles[player_id].append(Tiles.generate_tile())
-                self.tiles_left -= 1
-
-        # If there are no more tiles to give out, end the game
-        if self.tiles_left < 0:
-            self.end_game(player_id)
+            if len(self.tile_bag) < len(self.player_ids_to_tiles):
+                # If there are not enough tiles to give out, end the game
+                self.end_game(player_id)
+            else:
+                new_tiles = self.tile_bag.draw_tiles(len(self.player_ids_to_tiles))
+                for hand, new_tile in zip(self.player_ids_to_tiles.values(), new_tiles):
+                    hand.append(new_tile)
+                # Every player is sent the full game state after a peel
+                self._increment_all_versions()
 
         return invalid_positions
 
     def _generate_player_tiles(self):
-        for player_id in self.player_ids_to_tiles.keys():
-            self.player_ids_to_tiles[player_id] = Tiles.generate_tiles(STARTING_TILES_PER_PLAYER)
-            self.tiles_left -= STARTING_TILES_PER_PLAYER
+        hands = self.tile_bag.deal(len(self.player_ids_to_tiles), STARTING_TILES_PER_PLAYER)
+        for player_id, hand in zip(list(self.player_ids_to_tiles.keys()), hands):
+            self.player_ids_to_tiles[player_id] = hand
+
+    def _increment_all_versions(self):
+        for player_id in self.player_ids_to_versions.keys():
+            self.player_ids_to_versions[player_id] += 1
 
     def _log_info(self, log_message: str):
         LOG.info("[%s] %s", self.game_name, log_message)
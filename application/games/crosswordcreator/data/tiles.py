@@ -1,5 +1,39 @@
 import random
-from typing import List
+from collections import Counter
+from typing import List, Optional
+
+from ...common.letter_distribution import LetterDistribution
+
+# Relative number of each letter among the tiles, weighted on English letter frequency
+TILE_DISTRIBUTION = LetterDistribution(
+    {
+        "a": 4,
+        "b": 2,
+        "c": 1,
+        "d": 2,
+        "e": 6,
+        "f": 1,
+        "g": 1,
+        "h": 3,
+        "i": 4,
+        "j": 1,
+        "k": 1,
+        "l": 2,
+        "m": 1,
+        "n": 1,
+        "o": 4,
+        "q": 1,
+        "r": 2,
+        "s": 4,
+        "t": 3,
+        "u": 3,
+        "v": 1,
+        "w": 1,
+        "x": 1,
+        "y": 1,
+        "z": 1,
+    }
+)
 
 
 class Tiles:
@@ -19,63 +53,100 @@ class Tiles:
         Returns:
             The tiles.
         """
-        return [Tiles.generate_tile() for _ in range(num_tiles)]
+        return TILE_DISTRIBUTION.sample(num_tiles)
 
     @staticmethod
     def generate_tile() -> str:
-        return random.choice(
-            [
-                "a",
-                "a",
-                "a",
-                "a",
-                "b",
-                "b",
-                "c",
-                "d",
-                "d",
-                "e",
-                "e",
-                "e",
-                "e",
-                "e",
-                "e",
-                "f",
-                "g",
-                "h",
-                "h",
-                "h",
-                "i",
-                "i",
-                "i",
-                "i",
-                "j",
-                "k",
-                "l",
-                "l",
-                "m",
-                "n",
-                "o",
-                "o",
-                "o",
-                "o",
-                "q",
-                "r",
-                "r",
-                "s",
-                "s",
-                "s",
-                "s",
-                "t",
-                "t",
-                "t",
-                "u",
-                "u",
-                "u",
-                "v",
-                "w",
-                "x",
-                "y",
-                "z",
-            ]
-        )
+        return Tiles.generate_tiles(1)[0]
+
+
+class TileBag:
+    """
+    The finite bag of tiles for a single game.
+
+    The letters in the bag follow the letter distribution as closely as the size of the bag allows.
+    The tiles are kept in a list in no particular order. Drawing swaps a random tile to the end of the list and pops it,
+    and returning a tile appends it, so both take constant time.
+    """
+
+    def __init__(
+        self,
+        num_tiles: int,
+        rng: Optional[random.Random] = None,
+        letter_distribution: LetterDistribution = TILE_DISTRIBUTION,
+    ):
+        """
+        Fills a new bag.
+
+        Args:
+            num_tiles: The number of tiles in the bag
+            rng: The random number generator to draw with. A new unseeded one is used if not given.
+            letter_distribution: The distribution of letters in the bag
+        """
+        self.rng = rng if rng is not None else random.Random()
+
+        self.counts: Counter = letter_distribution.get_counts(num_tiles)
+        self.tiles: List[str] = list(self.counts.elements())
+
+    def __len__(self) -> int:
+        return len(self.tiles)
+
+    def draw_tile(self) -> str:
+        """
+        Removes a random tile from the bag.
+
+        Returns:
+            The tile
+        """
+        if not self.tiles:
+            raise ValueError("Cannot draw from an empty tile bag")
+
+        index = self.rng.randrange(len(self.tiles))
+        self.tiles[index], self.tiles[-1] = self.tiles[-1], self.tiles[index]
+        tile = self.tiles.pop()
+        self.counts[tile] -= 1
+        return tile
+
+    def draw_tiles(self, num_tiles: int) -> List[str]:
+        """
+        Removes a number of random tiles from the bag.
+
+        Args:
+            num_tiles: The number of tiles
+
+        Returns:
+            The tiles
+        """
+        if num_tiles > len(self.tiles):
+            raise ValueError(f"Cannot draw {num_tiles} tiles from a tile bag with {len(self.tiles)} tiles")
+
+        return [self.draw_tile() for _ in range(num_tiles)]
+
+    def deal(self, num_hands: int, tiles_per_hand: int) -> List[List[str]]:
+        """
+        Draws a number of hands of tiles at once.
+
+        Args:
+            num_hands: The number of hands
+            tiles_per_hand: The number of tiles in each hand
+
+        Returns:
+            The hands
+        """
+        tiles = self.draw_tiles(num_hands * tiles_per_hand)
+        hands = []
+        for hand_index in range(num_hands):
+            start = hand_index * tiles_per_hand
+            end = start + tiles_per_hand
+            hands.append(tiles[start:end])
+        return hands
+
+    def return_tile(self, tile: str):
+        """
+        Puts a tile back in the bag.
+
+        Args:
+            tile: The tile
+        """
+        self.tiles.append(tile)
+        self.counts[tile] += 1
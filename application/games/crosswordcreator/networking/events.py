@@ -48,10 +48,13 @@ def add_tile_event(message):
     hand_tile_index = message["hand_tile_index"]
     board_position = message["board_position"]
 
-    game_state = _get_game_manager().get_game_state(room)
-    game_state.add_tile(player_id, hand_tile_index, (board_position[0], board_position[1]))
+    with _get_game_manager().update_game_state(room) as game_state:
+        if not game_state:
+            LOG.warning(f"Received add_tile from Player {player_id} for invalid game {room}")
+            return
+        patch = game_state.add_tile(player_id, hand_tile_index, (board_position[0], board_position[1]))
 
-    emit("cc-board_update", game_state.get_game_state(player_id), to=session_id)
+    emit("cc-board_patch", patch, to=session_id)
 
 
 @socketio.on("cc-remove_tile")
@@ -67,10 +70,14 @@ def remove_tile_event(message):
     room = message["room"]
     board_position = message["board_position"]
 
-    game_state = _get_game_manager().get_game_state(room)
-    game_state.remove_tile(player_id, board_position)
+    with _get_game_manager().update_game_state(room) as game_state:
+        if not game_state:
+            LOG.warning(f"Received remove_tile from Player {player_id} for invalid game {room}")
+            return
+        patch = game_state.remove_tile(player_id, board_position)
 
-    emit("cc-board_update", game_state.get_game_state(player_id), to=session_id)
+    if patch:
+        emit("cc-board_patch", patch, to=session_id)
 
 
 @socketio.on("cc-start_game")
@@ -79,10 +86,12 @@ def new_game_event(message):
     room = message["room"]
     LOG.info(f"Received start_game from {player_id} for room {room}: {message}")
 
-    game_state = _get_game_manager().get_game_state(room)
-    if game_state:
+    with _get_game_manager().update_game_state(room) as game_state:
+        if not game_state:
+            return
         game_state.start_game()
-        emit("cc-request_update", {"request_update": True}, room=room)
+
+    emit("cc-request_update", {"request_update": True}, room=room)
 
 
 @socketio.on("cc-update_request")
@@ -106,20 +115,23 @@ def peel_event(message):
 
     room = message["room"]
 
-    game_state = _get_game_manager().get_game_state(room)
-    if game_state:
+    with _get_game_manager().update_game_state(room) as game_state:
+        if not game_state:
+            return
         invalid_positions = game_state.peel(player_id)
-        if len(invalid_positions) == 0:
-            # If the peel was successful, notify all players.
-            if game_state.game_running:
-                # Game is still running. Update players.
-                emit("cc-peel", {"peeling_player": player_name}, room=room)
-            else:
-                # The game is over. Notify players of who one.
-                emit("cc-game_over", {"winning_player": player_name}, room=room)
+        game_running = game_state.game_running
+
+    if len(invalid_positions) == 0:
+        # If the peel was successful, notify all players.
+        if game_running:
+            # Game is still running. Update players.
+            emit("cc-peel", {"peeling_player": player_name}, room=room)
         else:
-            # If the peel is not valid, only the player who tried to peel should get a message
-            emit("cc-unsuccessful_peel", {"invalid_positions": list(invalid_positions)}, to=session_id)
+            # The game is over. Notify players of who one.
+            emit("cc-game_over", {"winning_player": player_name}, room=room)
+    else:
+        # If the peel is not valid, only the player who tried to peel should get a message
+        emit("cc-unsuccessful_peel", {"invalid_positions": list(invalid_positions)}, to=session_id)
 
 
 @socketio.on("cc-exchange")
@@ -131,10 +143,12 @@ def exchange_event(message):
 
     room = message["room"]
 
-    game_state = _get_game_manager().get_game_state(room)
-    if game_state:
-        game_state.exchange_tile(player_id, hand_tile_index)
-        emit("cc-board_update", game_state.get_game_state(player_id), to=session_id)
+    with _get_game_manager().update_game_state(room) as game_state:
+        if not game_state:
+            return
+        patch = game_state.exchange_tile(player_id, hand_tile_index)
+
+    emit("cc-board_patch", patch, to=session_id)
 
 
 @socketio.on("cc-shift_board")
@@ -145,24 +159,14 @@ def shift_board_event(message):
 
     room = message["room"]
 
-    game_state = _get_game_manager().get_game_state(room)
-    if game_state:
-        if not game_state.game_running:
+    with _get_game_manager().update_game_state(room) as game_state:
+        if (not game_state) or (not game_state.game_running):
             return
 
-        direction = message.get("direction", None)
-        if "up" == direction:
-            game_state.player_ids_to_boards[player_id].shift_board_up()
-        elif "down" == direction:
-            game_state.player_ids_to_boards[player_id].shift_board_down()
-        elif "left" == direction:
-            game_state.player_ids_to_boards[player_id].shift_board_left()
-        elif "right" == direction:
-            game_state.player_ids_to_boards[player_id].shift_board_right()
-        else:
-            raise ValueError(f"Invalid direction specified for board shift: {direction}")
+        patch = game_state.shift_board(player_id, message.get("direction", None))
 
-        emit("cc-board_update", game_state.get_game_state(player_id), to=session_id)
+    if patch:
+        emit("cc-board_patch", patch, to=session_id)
 
 
 def _get_game_manager() -> CrosswordCreatorGameManager:
@@ -42,9 +42,10 @@ def create_game():
     if request.form:
         player_name = request.form.get("player_name", player_id)
 
-    game_state = _get_game_manager().create_game()
-    game_state.new_player(player_id, player_name)
-    return redirect(url_for(".game_page", game_name=game_state.game_name), code=302)
+    game_name = _get_game_manager().create_game().game_name
+    with _get_game_manager().update_game_state(game_name) as game_state:
+        game_state.new_player(player_id, player_name)
+    return redirect(url_for(".game_page", game_name=game_name), code=302)
 
 
 @crossword_creator_blueprint.route("/join_game", methods=["POST"])
@@ -59,9 +60,9 @@ def join_game():
 
     LOG.info(f"Player {player_id} joining game {game_name}")
 
-    game_state = _get_game_manager().get_game_state(game_name)
+    with _get_game_manager().update_game_state(game_name) as game_state:
+        successful_join = game_state.new_player(player_id, player_name) if game_state else False
     if game_name:
-        successful_join = game_state.new_player(player_id, player_name)
         if successful_join:
             return redirect(url_for(".game_page", game_name=game_name), code=302)
         else:
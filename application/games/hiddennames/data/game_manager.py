@@ -1,42 +1,75 @@
+import logging
 import random
-import string
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
+from application.games.common.game_name_allocator import GameNameAllocator
+from application.games.common.game_seed import get_game_seed
+from application.games.common.game_store import create_game_store
+from application.games.common.locking import synchronized
 from application.games.common.word_manager import WordManager
 from .game_state import GameState
 
+LOG = logging.getLogger("hiddennames.GameManager")
+
 
 class HiddenNamesGameManager:
     """
     Manages all the games.
     """
 
-    def __init__(self, word_manager: WordManager):
-        self.games = {}
+    def __init__(self, word_manager: WordManager, seed: Optional[int] = None, game_store_path: Optional[str] = None):
+        """
+        Args:
+            word_manager: The word manager for the games
+            seed: The seed for the manager's random number generator, which picks game names and the seed of every game.
+                  Games are only reproducible across runs if this is given.
+            game_store_path: The SQLite database to share games with other worker processes through.
+                             Games are kept in this process if not given.
+        """
+        self.games = create_game_store("hidden_names", game_store_path, on_evict=self._expire_game)
+        # Held while creating games so that creating a game for a name is atomic
+        self.lock = threading.RLock()
         self.word_manager = word_manager
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.name_allocator = GameNameAllocator("HN", rng=self.rng)
 
-    def create_game(self) -> GameState:
+    @synchronized
+    def create_game(self, seed: Optional[int] = None) -> GameState:
         """
         Creates a new game.
 
+        Args:
+            seed: The seed for the game, to replay an earlier game
+
         Returns:
             the game state
         """
-        game_name = self._create_game_name()
-        while game_name in self.games:
-            game_name = self._create_game_name()
-
-        return self.create_game_for_name(game_name)
+        while True:
+            game_name = self.name_allocator.allocate()
+            game_state = GameState(game_name, self.word_manager, get_game_seed(seed, self.seed, self.rng))
+            # Other workers sharing the game store allocate names of their own, so the name may already be taken
+            if self.games.add(game_name, game_state):
+                return game_state
+            self.name_allocator.discard(game_name)
 
-    def create_game_for_name(self, game_name: str) -> GameState:
+    @synchronized
+    def create_game_for_name(self, game_name: str, seed: Optional[int] = None) -> GameState:
         """
-        Creates a new game with the given game name.
+        Creates a new game with the given game name, replacing any game with the name.
+
+        Args:
+            game_name: The name of the game
+            seed: The seed for the game, to replay an earlier game
 
         Returns:
             the game state
         """
-        game_state = GameState(game_name, self.word_manager)
-        self.games[game_name] = game_state
+        game_state = GameState(game_name, self.word_manager, get_game_seed(seed, self.seed, self.rng))
+        self.name_allocator.reserve(game_name)
+        self.games.replace(game_name, game_state)
 
         return game_state
 
@@ -49,15 +82,23 @@ class HiddenNamesGameManager:
         Returns:
             the game state if one exists
         """
-        return self.games.get(game_name, None)
+        return self.games.get(game_name)
 
-    @staticmethod
-    def _create_game_name() -> str:
-        game_name = ""
-        for i in range(0, 3):
-            game_name += random.choice(string.ascii_uppercase)
-        return "HN" + game_name
+    @contextmanager
+    def update_game_state(self, game_name: str) -> Iterator[Optional[GameState]]:
+        """
+        Hands out the game state for the given game name to be changed.
+        No other request can change the game until the block ends, and changes are then visible to every worker.
+
+        Args:
+            game_name: the game name
+
+        Returns:
+            the game state if one exists
+        """
+        with self.games.update(game_name) as game_state:
+            yield game_state
 
-    def _expire_game(self):
-        # TODO we should expire games so that they don't live in memory forever.
-        pass
+    def _expire_game(self, game_name: str, game_state: GameState):
+        LOG.info(f"Game {game_name} has expired")
+        self.name_allocator.release(game_name)
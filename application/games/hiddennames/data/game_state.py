@@ -1,9 +1,11 @@
 import logging
 import random
-from typing import List, Dict
+import threading
+from typing import List, Dict, Optional
 
 from .game_tile import GameTile
 from .game_update import GameUpdate
+from application.games.common.locking import synchronized
 from application.games.common.word_manager import WordManager
 
 WORD_COUNT = 25
@@ -16,13 +18,25 @@ LOG = logging.getLogger("hiddennames.GameState")
 class GameState:
     """
     Class representing the state of a game.
+
+    Players in the same game are served by different threads, so every public method holds the game's lock while it
+    runs.
     """
 
-    def __init__(self, game_name: str, word_manager: WordManager):
+    def __init__(self, game_name: str, word_manager: WordManager, seed: Optional[int] = None):
         """
         Generates a new, random game state.
+
+        Args:
+            game_name: The name of the game
+            word_manager: The word manager to pick the words from
+            seed: The seed for the game's random number generator. Games with the same seed are identical.
+                  A random seed is used if not given.
         """
+        self.lock = threading.RLock()
         self.game_name = game_name
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
         self.game_tiles: Dict[str, GameTile] = dict()
 
         self.blue_team_tiles_remaining = BLUE_TEAM_TILES
@@ -30,15 +44,26 @@ class GameState:
         self.current_team = 1
         self.winning_team = None
 
-        words = self._generate_words(word_manager)
-        hidden_values = self._generate_hidden_values()
+        words = self._generate_words(word_manager, self.rng)
+        hidden_values = self._generate_hidden_values(self.rng)
         for i in range(0, WORD_COUNT):
             word = words[i]
             hidden_value = hidden_values[i]
             self.game_tiles[word] = GameTile(word, hidden_value)
 
-        self._log_info("Created new game")
+        self._log_info(f"Created new game with seed {self.seed}")
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Locks cannot be pickled
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, object]):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
 
+    @synchronized
     def end_turn(self) -> GameUpdate:
         """
         Ends the current team's turn and creates the GameUpdate to send to clients.
@@ -55,6 +80,7 @@ class GameState:
 
         return GameUpdate(self, [])
 
+    @synchronized
     def guess_word(self, guessed_word: str) -> GameUpdate:
         """
         Updates the game state to reflect the guessed word.
@@ -104,6 +130,7 @@ class GameState:
         # Return a GameUpdate object so clients can update the page
         return GameUpdate(self, [game_tile.to_json()])
 
+    @synchronized
     def get_tiles_json(self) -> List[Dict[str, str]]:
         """
         Returns the current tiles in a list of JSON compatible dictionaries.
@@ -116,6 +143,7 @@ class GameState:
             tiles.append(tile.to_json())
         return tiles
 
+    @synchronized
     def get_game_update(self) -> GameUpdate:
         """
         Returns the entire board state to send to clients as a GameUpdate.
@@ -129,30 +157,30 @@ class GameState:
         LOG.info("[%s] %s", self.game_name, log_message)
 
     @staticmethod
-    def _generate_words(word_manager: WordManager) -> List[str]:
-        return word_manager.get_random_words(WORD_COUNT)
+    def _generate_words(word_manager: WordManager, rng: random.Random) -> List[str]:
+        return word_manager.get_random_words(WORD_COUNT, rng)
 
     @staticmethod
-    def _generate_hidden_values() -> List[int]:
+    def _generate_hidden_values(rng: random.Random) -> List[int]:
         possible_values = list(range(0, WORD_COUNT))
         hidden_values = [0] * WORD_COUNT
 
         # Assassin
-        index = random.randint(0, len(possible_values) - 1)
+        index = rng.randint(0, len(possible_values) - 1)
         assassin_location = possible_values[index]
         possible_values.pop(index)
         hidden_values[assassin_location] = 3
 
         # Blue team
         for i in range(0, BLUE_TEAM_TILES):
-            index = random.randint(0, len(possible_values) - 1)
+            index = rng.randint(0, len(possible_values) - 1)
             location = possible_values[index]
             possible_values.pop(index)
             hidden_values[location] = 1
 
         # Red team
         for i in range(0, RED_TEAM_TILES):
-            index = random.randint(0, len(possible_values) - 1)
+            index = rng.randint(0, len(possible_values) - 1)
             location = possible_values[index]
             possible_values.pop(index)
             hidden_values[location] = 2
@@ -47,9 +47,14 @@ def guessed_word(message):
 
     room = message["room"]
     guessed_word = message["guess"]
+    session_id = flask.request.sid
 
-    game_state = _get_game_manager().get_game_state(room)
-    game_update = game_state.guess_word(guessed_word)
+    with _get_game_manager().update_game_state(room) as game_state:
+        if not game_state:
+            LOG.warning(f"User {session_id} guessed in invalid room {room}.")
+            emit("hn-error", {"message": "Guessed in invalid room."}, to=session_id)
+            return
+        game_update = game_state.guess_word(guessed_word)
 
     emit("hn-game_update", {"game_state": game_update.to_json()}, room=room)
 
@@ -59,9 +64,14 @@ def end_turn(message):
     LOG.debug(f"Received end_turn: {message}")
 
     room = message["room"]
+    session_id = flask.request.sid
 
-    game_state = _get_game_manager().get_game_state(room)
-    game_update = game_state.end_turn()
+    with _get_game_manager().update_game_state(room) as game_state:
+        if not game_state:
+            LOG.warning(f"User {session_id} ended the turn in invalid room {room}.")
+            emit("hn-error", {"message": "Ended the turn in invalid room."}, to=session_id)
+            return
+        game_update = game_state.end_turn()
 
     emit("hn-game_update", {"game_state": game_update.to_json()}, room=room)
 
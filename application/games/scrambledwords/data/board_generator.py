@@ -0,0 +1,130 @@
+import logging
+import queue
+import random
+import time
+from threading import Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+from application.games.common.word_manager import WordManager
+from .board_solver import BoardSolver
+from .scoring import Scoring
+from .tiles import generate_tiles
+
+MIN_WORDS = 75
+MIN_POINTS = 100
+TIME_BUDGET_SECONDS = 0.25
+POOL_SIZE = 20
+
+Board = Tuple[List[str], Dict[str, List[int]]]
+
+LOG = logging.getLogger("scrambledwords.BoardGenerator")
+
+
+class BoardGenerator:
+    """
+    Generates boards that have enough words on them to be fun to play.
+
+    Random boards are solved and discarded until one meets the minimum number of words and points.
+    A pool of boards that have already been vetted is kept topped up by a background worker so that
+    handing out a new board does not need to wait for the solver.
+
+    Solving boards is CPU-bound and never yields. Under eventlet or gevent, threads are green threads that only switch
+    when they yield, so boards must then be generated on an operating system thread through a runner such as
+    eventlet.tpool.execute, or every connection served by the process stalls while the pool is refilled.
+    """
+
+    def __init__(
+        self,
+        word_manager: WordManager,
+        min_words: int = MIN_WORDS,
+        min_points: int = MIN_POINTS,
+        time_budget_seconds: float = TIME_BUDGET_SECONDS,
+        pool_size: int = POOL_SIZE,
+        run_blocking: Optional[Callable[[Callable[[], Board]], Board]] = None,
+    ):
+        """
+        Args:
+            word_manager: The word manager to solve boards with
+            min_words: The fewest words a vetted board has
+            min_points: The fewest points a vetted board has
+            time_budget_seconds: How long to spend looking for a vetted board before settling for the best one seen
+            pool_size: The number of vetted boards kept ready
+            run_blocking: Runs board generation on an operating system thread and returns its result, for servers
+                          whose threads are green threads. Boards are generated on the calling thread if not given.
+        """
+        self.word_manager = word_manager
+        self.min_words = min_words
+        self.min_points = min_points
+        self.time_budget_seconds = time_budget_seconds
+        self.run_blocking = run_blocking
+        # Boards are generated from their own random number generator rather than the shared one in the random module
+        self.rng = random.Random()
+
+        self.board_pool: queue.Queue = queue.Queue(maxsize=pool_size)
+        self.worker: Optional[Thread] = None
+
+    def start(self):
+        """
+        Starts the background worker that keeps the pool of vetted boards full.
+        """
+        if self.worker is None:
+            self.worker = Thread(target=self._fill_pool, name="scrambledwords-board-generator", daemon=True)
+            self.worker.start()
+
+    def get_board(self) -> Board:
+        """
+        Returns a vetted board, taken from the pool when one is available.
+
+        Returns:
+            The tiles of the board and the solved words of the board
+        """
+        try:
+            return self.board_pool.get_nowait()
+        except queue.Empty:
+            LOG.info("Board pool is empty, generating a board on demand")
+            return self._generate_board_off_thread()
+
+    def generate_board(self) -> Board:
+        """
+        Generates boards until one meets the minimum words and points.
+        If the time budget runs out, the best board seen so far is returned instead.
+
+        Returns:
+            The tiles of the board and the solved words of the board
+        """
+        deadline = time.monotonic() + self.time_budget_seconds
+        best_board = None
+        best_points = -1
+
+        while True:
+            tiles = generate_tiles(self.rng)
+            solved_words = BoardSolver.solve(tiles, self.word_manager)
+            points = BoardGenerator.get_board_points(solved_words)
+
+            if (len(solved_words) >= self.min_words) and (points >= self.min_points):
+                return tiles, solved_words
+
+            if points > best_points:
+                best_board = (tiles, solved_words)
+                best_points = points
+
+            if time.monotonic() >= deadline:
+                LOG.warning(f"Time budget exhausted, using board with {len(best_board[1])} words")
+                return best_board
+
+    @staticmethod
+    def get_board_points(solved_words: Dict[str, List[int]]) -> int:
+        return sum(Scoring.get_classic_word_value(word) for word in solved_words)
+
+    def _fill_pool(self):
+        while True:
+            try:
+                # Blocks while the pool is full
+                self.board_pool.put(self._generate_board_off_thread())
+            except Exception:
+                LOG.exception("Failed to generate board for the pool")
+
+    def _generate_board_off_thread(self) -> Board:
+        if self.run_blocking is None:
+            return self.generate_board()
+        return self.run_blocking(self.generate_board)
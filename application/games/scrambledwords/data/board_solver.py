@@ -0,0 +1,69 @@
+from typing import Dict, List, Tuple
+
+from application.games.common.word_manager import WordManager
+
+BOARD_WIDTH = 5
+TOTAL_TILES = BOARD_WIDTH * BOARD_WIDTH
+
+
+def _generate_tile_neighbors() -> List[Tuple[int, ...]]:
+    tile_neighbors = []
+    for tile_index in range(TOTAL_TILES):
+        row, col = divmod(tile_index, BOARD_WIDTH)
+        neighbors = []
+        for neighbor_row in range(max(row - 1, 0), min(row + 2, BOARD_WIDTH)):
+            for neighbor_col in range(max(col - 1, 0), min(col + 2, BOARD_WIDTH)):
+                if (neighbor_row, neighbor_col) != (row, col):
+                    neighbors.append(neighbor_row * BOARD_WIDTH + neighbor_col)
+        tile_neighbors.append(tuple(neighbors))
+    return tile_neighbors
+
+
+# For each tile index, the indexes of every tile touching it (including diagonals) in ascending order
+TILE_NEIGHBORS: List[Tuple[int, ...]] = _generate_tile_neighbors()
+# For each tile index, a bitmask of every tile touching it
+TILE_NEIGHBOR_MASKS: List[int] = [sum(1 << neighbor for neighbor in neighbors) for neighbors in TILE_NEIGHBORS]
+
+
+class BoardSolver:
+    """
+    Finds every dictionary word that can be traced on a board.
+    """
+
+    @staticmethod
+    def solve(tiles: List[str], word_manager: WordManager) -> Dict[str, List[int]]:
+        """
+        Solves the given board.
+
+        Args:
+            tiles: The tiles of the board
+            word_manager: The word manager holding the dictionary
+
+        Returns:
+            A dictionary from each lower-case word on the board to the first path of tile indexes that spells it
+        """
+        solved_words: Dict[str, List[int]] = {}
+        upper_tiles = [tile.upper() for tile in tiles]
+        prefix_index = word_manager.get_prefix_index()
+        sorted_words = prefix_index.sorted_words
+
+        def search(tile_index: int, prefix: str, path: List[int], visited: int, lo: int, hi: int):
+            # Abandon this path as soon as no word starts with the letters collected so far
+            lo, hi = prefix_index.get_prefix_range(prefix, lo, hi)
+            if lo == hi:
+                return
+
+            # The prefix itself sorts before every longer word starting with it
+            if (sorted_words[lo] == prefix) and word_manager.is_word(prefix):
+                solved_words.setdefault(prefix.lower(), path.copy())
+
+            for neighbor in TILE_NEIGHBORS[tile_index]:
+                if not (visited >> neighbor) & 1:
+                    path.append(neighbor)
+                    search(neighbor, prefix + upper_tiles[neighbor], path, visited | (1 << neighbor), lo, hi)
+                    path.pop()
+
+        for start_index in range(len(upper_tiles)):
+            search(start_index, upper_tiles[start_index], [start_index], 1 << start_index, 0, len(sorted_words))
+
+        return solved_words
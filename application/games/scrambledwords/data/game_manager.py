@@ -1,44 +1,125 @@
+import logging
 import random
-import string
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
 
+from application.games.common.game_name_allocator import GameNameAllocator
+from application.games.common.game_seed import get_game_seed
+from application.games.common.game_store import create_game_store
+from application.games.common.locking import synchronized
+from application.games.common.results_writer import ResultsWriter
 from application.games.common.word_manager import WordManager
+from .board_generator import BoardGenerator
 from .game_state import GameState
+from .leaderboard import Leaderboard
 from .scoring_type import ScoringType
 
+GLOBAL_LEADERBOARD_ENTRIES = 1000
+
+LOG = logging.getLogger("scrambledwords.GameManager")
+
 
 class ScrambledWordsGameManager:
     """
     Manages all the games.
     """
 
-    def __init__(self, word_manager: WordManager):
-        self.games = {}
+    def __init__(
+        self,
+        word_manager: WordManager,
+        board_generator: Optional[BoardGenerator] = None,
+        seed: Optional[int] = None,
+        game_store_path: Optional[str] = None,
+        results_writer: Optional[ResultsWriter] = None,
+        on_round_end: Optional[Callable[[GameState], None]] = None,
+    ):
+        """
+        Args:
+            word_manager: The word manager for the games
+            board_generator: Where games take vetted boards from
+            seed: The seed for the manager's random number generator, which picks game names and the seed of every game.
+                  Seeded games do not use the board generator so that their boards can be replayed.
+            game_store_path: The SQLite database to share games with other worker processes through.
+                             Games are kept in this process if not given. There is no global leaderboard when games are
+                             shared, since each worker would only rank the rounds it happened to finish.
+            results_writer: Where games record their results. Results are not recorded if not given.
+            on_round_end: Called with a game once its timer has ended a round, to send players their results
+        """
+        self.games = create_game_store(
+            "scrambled_words", game_store_path, on_evict=self._expire_game, on_load=self._load_game
+        )
+        # Held while drawing names and seeds for new games from the manager's random number generator
+        self.lock = threading.RLock()
         self.word_manager = word_manager
+        self.results_writer = results_writer
+        self.on_round_end = on_round_end
+        # Players of every game ranked by their best round score
+        self.leaderboard = Leaderboard(GLOBAL_LEADERBOARD_ENTRIES) if game_store_path is None else None
+        self.board_generator = board_generator
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.name_allocator = GameNameAllocator("SW", rng=self.rng)
 
-    def create_game(self, scoring_type: ScoringType = ScoringType.CLASSIC) -> GameState:
+    @synchronized
+    def create_game(self, scoring_type: ScoringType = ScoringType.CLASSIC, seed: Optional[int] = None) -> GameState:
         """
         Creates a new game.
 
+        Args:
+            scoring_type: How guesses are scored
+            seed: The seed for the game, to replay an earlier game
+
         Returns:
             the game state
         """
-        game_name = self._create_game_name()
-        while game_name in self.games:
-            game_name = self._create_game_name()
-
-        return self.create_game_for_name(game_name, scoring_type)
+        game_state = None
+        while game_state is None:
+            # Other workers sharing the game store allocate names of their own, so the name may already be taken.
+            # Names are handed out again once their games expire, so new games do not carry on earlier scores.
+            game_name = self.name_allocator.allocate()
+            game_state = self.create_game_for_name(game_name, scoring_type, seed, load_scores=False)
+            if game_state is None:
+                self.name_allocator.discard(game_name)
+        return game_state
 
-    def create_game_for_name(self, game_name: str, scoring_type: ScoringType) -> GameState:
+    def create_game_for_name(
+        self, game_name: str, scoring_type: ScoringType, seed: Optional[int] = None, load_scores: bool = True
+    ) -> Optional[GameState]:
         """
-        Creates a new game with the given game name.
+        Creates a new game with the given game name, unless there is already a game with the name.
+
+        Args:
+            game_name: The name of the game
+            scoring_type: How guesses are scored
+            seed: The seed for the game, to replay an earlier game
+            load_scores: Whether to carry on the total scores recorded by an earlier game with the same name, such as
+                         one played before the server restarted. Otherwise the earlier game's scores are cleared, since
+                         the name is being handed to an unrelated game.
 
         Returns:
-            the game state
+            the game state, or None if there is already a game with the name
         """
-        game_state = GameState(game_name, self.word_manager, scoring_type=scoring_type)
-        self.games[game_name] = game_state
+        with self.lock:
+            game_state = GameState(
+                game_name,
+                self.word_manager,
+                scoring_type=scoring_type,
+                board_generator=self.board_generator,
+                seed=get_game_seed(seed, self.seed, self.rng),
+                results_writer=self.results_writer,
+                leaderboard=self.leaderboard,
+                on_round_end=self.on_round_end,
+            )
+        if load_scores:
+            # Reading the scores waits on the database, so it is done without holding the lock every new game needs
+            game_state.load_scores()
+        if not self.games.add(game_name, game_state):
+            return None
 
+        self.name_allocator.reserve(game_name)
+        if not load_scores:
+            game_state.record_totals()
         return game_state
 
     def get_game_state(self, game_name: str) -> Optional[GameState]:
@@ -51,15 +132,27 @@ class ScrambledWordsGameManager:
             the game state if one exists
         """
         game_name = game_name.upper()
-        return self.games.get(game_name, None)
-
-    @staticmethod
-    def _create_game_name() -> str:
-        game_name = ""
-        for i in range(0, 3):
-            game_name += random.choice(string.ascii_uppercase)
-        return "SW" + game_name
-
-    def _expire_game(self):
-        # TODO we should expire games so that they don't live in memory forever.
-        pass
+        return self.games.get(game_name)
+
+    @contextmanager
+    def update_game_state(self, game_name: str) -> Iterator[Optional[GameState]]:
+        """
+        Hands out the game state for the given game name to be changed.
+        No other request can change the game until the block ends, and changes are then visible to every worker.
+
+        Args:
+            game_name: the game name
+
+        Returns:
+            the game state if one exists
+        """
+        with self.games.update(game_name.upper()) as game_state:
+            yield game_state
+
+    def _expire_game(self, game_name: str, game_state: GameState):
+        LOG.info(f"Game {game_name} has expired")
+        self.name_allocator.release(game_name)
+        game_state.end_game()
+
+    def _load_game(self, game_state: GameState):
+        game_state.restore(self.word_manager, self.board_generator, self.results_writer, self.leaderboard)
@@ -1,23 +1,36 @@
 import logging
 import random
+import threading
 from collections import Counter
-from threading import Timer
-from typing import List, Set, Dict, Optional
+from typing import Callable, List, Set, Dict, Optional
 
+from application.games.common.locking import synchronized
+from application.games.common.results_writer import ResultsWriter
+from application.games.common.scheduler import ScheduledTask, get_scheduler
 from application.games.common.word_manager import WordManager
+from .board_generator import BoardGenerator
+from .board_solver import BoardSolver, TILE_NEIGHBOR_MASKS, TILE_NEIGHBORS, TOTAL_TILES
+from .leaderboard import Leaderboard
 from .scoring import Scoring
 from .scoring_type import ScoringType
+from .tiles import generate_tiles
 from ..util.time_util import get_time_millis
 
-TOTAL_TILES = 25
 TOTAL_TIME_SECONDS = 3 * 60
 
+ROUNDS_COLLECTION = "scrambled_words_rounds"
+SCORES_COLLECTION = "scrambled_words_scores"
+TOTALS_COLLECTION = "scrambled_words_totals"
+
 LOG = logging.getLogger("scrambledwords.GameState")
 
 
 class GameState:
     """
     Class representing the state of a game.
+
+    Players in the same game are served by different threads, and the game timer ends the game from the scheduler
+    thread, so every public method holds the game's lock while it runs.
     """
 
     def __init__(
@@ -26,30 +39,115 @@ class GameState:
         word_manager: WordManager,
         scoring_type: ScoringType = ScoringType.CLASSIC,
         game_timer: bool = True,
+        board_generator: Optional[BoardGenerator] = None,
+        seed: Optional[int] = None,
+        results_writer: Optional[ResultsWriter] = None,
+        leaderboard: Optional[Leaderboard] = None,
+        on_round_end: Optional[Callable[["GameState"], None]] = None,
     ):
         """
         Generates a new game state.
+
+        Args:
+            game_name: The name of the game
+            word_manager: The word manager to check guesses with
+            scoring_type: How guesses are scored
+            game_timer: Whether rounds end on a timer
+            board_generator: Where to take vetted boards from. Boards are generated by the game if not given.
+            seed: The seed for the game's random number generator. Games with the same seed play the same boards
+                  in the same order. Boards from the board generator cannot be replayed, so it is not used for
+                  seeded games. A random seed is used if not given.
+            results_writer: Where to record finished rounds and scores. Results are not recorded if not given.
+            leaderboard: The leaderboard of best round scores across every game, if there is one
+            on_round_end: Called with the game once the game timer has ended a round, to send players their results
         """
+        self.lock = threading.RLock()
         self.game_timer = game_timer
         self.game_name = game_name
         self.word_manager = word_manager
         self.scoring_type = scoring_type
+        self.board_generator = board_generator if seed is None else None
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.results_writer = results_writer
+        self.on_round_end = on_round_end
+        # Whether this game was loaded from a game store shared with other workers
+        self.shared = False
 
         self.game_tiles: List[str] = []
+        self.tile_counts: Counter = Counter()
+        # Dictionary from every word on the board to the path of tiles that spells it
+        self.solved_words: Dict[str, List[int]] = {}
         self.expire_time: Optional[int] = None
         self.valid_guesses: Dict[str, Set[str]] = {}
         self.word_counter: Counter = Counter()
         self.game_running = False
-        self.end_game_timer: Optional[Timer] = None
+        self.end_game_timer: Optional[ScheduledTask] = None
 
         self.scores: Dict[str, int] = {}
         self.player_ids_to_names: Dict[str, str] = {}
+        # Dictionary from player ID to the results of the player for the last round, worked out when the round ends
+        self.round_results: Dict[str, Dict[str, object]] = {}
+        # The board the round results are for, or None if the current round has not ended
+        self.round_results_board_id: Optional[str] = None
+        self.round_results_sent = False
+        # Players of this game ranked by total score
+        self.room_leaderboard = Leaderboard()
+        self.leaderboard = leaderboard
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Locks and timers cannot be pickled and the word manager, results writer, leaderboard and round end callback
+        # belong to the worker, so they are left out.
+        # Only whether the game takes boards from the board generator is kept.
+        state = self.__dict__.copy()
+        del state["lock"]
+        state["word_manager"] = None
+        state["board_generator"] = self.board_generator is not None
+        state["results_writer"] = None
+        state["leaderboard"] = None
+        state["on_round_end"] = None
+        state["end_game_timer"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, object]):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+        self.shared = True
+
+    def restore(
+        self,
+        word_manager: WordManager,
+        board_generator: Optional[BoardGenerator] = None,
+        results_writer: Optional[ResultsWriter] = None,
+        leaderboard: Optional[Leaderboard] = None,
+    ):
+        """
+        Restores what is left out when the game is pickled, after the game has been loaded from a game store.
+
+        Args:
+            word_manager: The word manager to check guesses with
+            board_generator: Where to take vetted boards from, if the game took boards from a board generator
+            results_writer: Where to record finished rounds and scores
+            leaderboard: The leaderboard of best round scores across every game
+        """
+        self.word_manager = word_manager
+        self.board_generator = board_generator if self.board_generator else None
+        self.results_writer = results_writer
+        self.leaderboard = leaderboard
 
+    @synchronized
     def new_board(self, tiles: List[str] = None):
         if tiles:
             self.game_tiles = tiles
+            # Solve the board up front so that guesses do not need to search the board
+            self.solved_words = BoardSolver.solve(self.game_tiles, self.word_manager)
+        elif self.board_generator:
+            # Generated boards are already solved
+            self.game_tiles, self.solved_words = self.board_generator.get_board()
         else:
-            self.game_tiles = GameState._generate_tiles()
+            self.game_tiles = generate_tiles(self.rng)
+            self.solved_words = BoardSolver.solve(self.game_tiles, self.word_manager)
+        self.tile_counts = Counter(self.game_tiles)
 
         self.word_counter = Counter()
         self.game_running = True
@@ -59,16 +157,21 @@ class GameState:
             self.end_game_timer.cancel()
 
         if self.game_timer:
-            # Set up the new timer
             self.expire_time = get_time_millis() + (TOTAL_TIME_SECONDS * 1000)
-            self.end_game_timer = Timer(TOTAL_TIME_SECONDS, self.end_game)
-            self.end_game_timer.start()
+            # A timer could only end this copy of a shared game, so shared games are ended once they are next changed
+            # after the expire time
+            if not self.shared:
+                self.end_game_timer = get_scheduler().schedule(TOTAL_TIME_SECONDS, self._end_game_on_timer)
 
         # Dictionary from player ID to Set of valid guesses
         self.valid_guesses = {}
+        self.round_results = {}
+        self.round_results_board_id = None
+        self.round_results_sent = False
 
-        self._log_info("Created new board")
+        self._log_info(f"Created new board with {len(self.solved_words)} words")
 
+    @synchronized
     def get_board_id(self) -> str:
         board_id = ""
         for tile in self.game_tiles:
@@ -76,10 +179,87 @@ class GameState:
 
         return board_id
 
+    @synchronized
     def end_game(self):
+        if self.game_running:
+            self._finalize_round()
+            self._record_round()
+            self.record_totals()
         self.game_running = False
+
+        # The game may be ended before the timer fires, in which case the timer is no longer needed
+        if self.end_game_timer:
+            self.end_game_timer.cancel()
         self._log_info("Game ended")
 
+    def _end_game_on_timer(self):
+        with self.lock:
+            round_ended = self.game_running
+            self.end_game()
+
+        # Players are sent their results without holding the game's lock
+        if round_ended and self.on_round_end:
+            self.on_round_end(self)
+
+    def _end_game_if_expired(self):
+        # Games shared between workers have no timer and are ended by whichever worker next sees the round is over
+        if self.game_running and (self.expire_time is not None) and (get_time_millis() >= self.expire_time):
+            self.end_game()
+
+    def _finalize_round(self):
+        # Total players is the number of players that have at least one valid guess
+        total_players = len(self.valid_guesses.keys())
+        # Every word is scored once, however many players guessed it
+        word_values = {
+            word: Scoring.get_word_value(self.scoring_type, word, num_players_who_guessed_word, total_players)
+            for word, num_players_who_guessed_word in self.word_counter.items()
+        }
+
+        self.round_results = {}
+        for player_id, valid_guesses in self.valid_guesses.items():
+            round_results = self._get_round_results(valid_guesses, word_values, self.scores.get(player_id, 0))
+            round_score = round_results["round_score"]
+            self.scores[player_id] = round_results["total_score"]
+            self.round_results[player_id] = round_results
+
+            player_name = self.player_ids_to_names.get(player_id, player_id)
+            self._record_score(player_id, player_name, round_score)
+            self.room_leaderboard.submit(player_id, player_name, self.scores[player_id])
+            if self.leaderboard:
+                self.leaderboard.submit(player_id, player_name, round_score)
+
+        self.round_results_board_id = self.get_board_id()
+
+    def _get_round_results(
+        self, valid_guesses: Set[str], word_values: Dict[str, float], previous_total_score: float
+    ) -> Dict[str, object]:
+        scored_words = []
+        scored_words_values = []
+        scored_words_guessers = []
+        unscored_words = []
+        round_score = 0
+
+        for valid_word in valid_guesses:
+            word_value = word_values[valid_word]
+            # Record the value of any words with a non-zero value
+            if word_value > 0:
+                scored_words.append(valid_word)
+                scored_words_values.append(word_value)
+                round_score += word_value
+                scored_words_guessers.append(self.word_counter[valid_word])
+            else:
+                unscored_words.append(valid_word)
+
+        return {
+            "scored_words": scored_words,
+            "scored_word_values": scored_words_values,
+            "scored_word_guessers": scored_words_guessers,
+            "unscored_words": unscored_words,
+            "round_score": round_score,
+            "total_score": previous_total_score + round_score,
+        }
+
+    @synchronized
     def get_game_state(self, player_id: str = None) -> Dict[str, object]:
         """
         Returns the state of the game when a player joins or reloads the game.
@@ -100,6 +280,7 @@ class GameState:
             game_state["player_guesses"] = []
         return game_state
 
+    @synchronized
     def guess_word(self, player_id: str, guessed_word: str) -> Optional[List[int]]:
         """
         Updates the game state to reflect the guessed word.
@@ -117,6 +298,7 @@ class GameState:
         guessed_word = guessed_word.lower()
 
         # Ensure players are not able to guess after the game has expired
+        self._end_game_if_expired()
         if not self.game_running:
             self._log_info(f"{player_id} guess word '{guessed_word}' was guessed after game ended")
             return None
@@ -128,7 +310,8 @@ class GameState:
 
         # Check if the word is recognized and on the board
         if self.word_manager.is_word(guessed_word):
-            word_is_on_board = self._word_is_on_board(guessed_word)
+            # The board was solved when it was created, so every word on it is already known
+            word_is_on_board = self.solved_words.get(guessed_word)
             if word_is_on_board:
                 self._log_info(f"{player_id} guess word '{guessed_word}' is a valid word")
 
@@ -149,188 +332,229 @@ class GameState:
             self._log_info(f"{player_id} guess word '{guessed_word}' is not a recognized word")
             return None
 
-    def get_score_state(self, player_id: str, player_name: str) -> Dict[str, object]:
+    @synchronized
+    def get_score_state(self, player_id: str) -> Optional[Dict[str, object]]:
         """
         Called when the player's game timer ends to get the round's score.
+        Scores are worked out once when the round ends, so this only looks up the player's results.
 
         Args:
             player_id: The ID of the player
-            player_name: The name of the player
 
         Returns:
-            A dictionary representing the scoring state for the given player for this round
+            A dictionary representing the scoring state for the given player for this round,
+            or None if the round has not ended
         """
-        scored_words = []
-        scored_words_values = []
-        scored_words_guessers = []
-        unscored_words = []
-        round_score = 0
-
-        # Total players is the number of players that have at least one valid guess
-        total_players = len(self.valid_guesses.keys())
-
-        valid_guesses = self.valid_guesses.get(player_id, set())
-        for valid_word in valid_guesses:
-            num_player_who_guessed_word = self.word_counter.get(valid_word)
-            word_value = Scoring.get_word_value(
-                self.scoring_type, valid_word, num_player_who_guessed_word, total_players
-            )
-
-            # Record the value of any words with a non-zero value
-            if word_value > 0:
-                scored_words.append(valid_word)
-                scored_words_values.append(word_value)
-                round_score += word_value
-                scored_words_guessers.append(num_player_who_guessed_word)
-            else:
-                unscored_words.append(valid_word)
+        # Only the server's clock ends a round, so a player whose clock runs ahead cannot cut the round short
+        self._end_game_if_expired()
+        if self.game_running:
+            self._log_info(f"{player_id} asked for scores before the round ended")
+            return None
 
-        # Update player's total score
-        if player_id in self.scores:
-            self.scores[player_id] = self.scores[player_id] + round_score
-        else:
-            self.scores[player_id] = round_score
+        round_results = self.round_results.get(player_id)
+        if round_results is None:
+            # The player made no valid guesses this round
+            return self._get_round_results(set(), {}, self.scores.get(player_id, 0))
+        return round_results
 
-        # Send the JSON data back to the player
-        return {
-            "scored_words": scored_words,
-            "scored_word_values": scored_words_values,
-            "scored_word_guessers": scored_words_guessers,
-            "unscored_words": unscored_words,
-            "total_score": self.scores[player_id],
-        }
+    @synchronized
+    def get_remaining_millis(self) -> Optional[int]:
+        """
+        Returns how long the server has left to run the round, or None if the round has no timer.
+        Players whose clocks run ahead use this to ask for their scores again once the round is over.
+        """
+        if self.expire_time is None:
+            return None
+        return max(self.expire_time - get_time_millis(), 0)
 
     def _word_is_on_board(self, guessed_word: str) -> Optional[List[int]]:
-        possible_paths: Optional[List[List[int]]] = None
-
-        # Iterate through each character of the guessed word
-        for character in guessed_word:
-            # Terminate early if we have no possible paths
-            if (possible_paths is not None) and (len(possible_paths) == 0):
-                break
-
-            # Find all locations where the current character is on the board.
-            character_locations = []
-            for i in range(0, len(self.game_tiles)):
-                if self.game_tiles[i] == character:
-                    character_locations.append(i)
-
-            if possible_paths is None:
-                # The first character will not have any previous character positions to check.
-                possible_paths = [[val] for val in character_locations]
-            else:
-                # Create a new list for possible paths so that previous paths that will not
-                # work with the new character positions are discarded.
-                new_possible_paths: List[List[int]] = []
-
-                # Check each character position to see if it can be appended to a possible path.
-                for character_location in character_locations:
-                    for possible_path in possible_paths:
-                        # We cannot use the same tile multiple times in one word.
-                        if character_location in possible_path:
-                            continue
-
-                        # If the character location is a neighbor of the last tile on a possible
-                        # path then we add this as a new possible bath for the next character.
-                        if GameState._tiles_are_neighbors(character_location, possible_path[-1]):
-                            new_possible_path = possible_path.copy()
-                            new_possible_path.append(character_location)
-                            new_possible_paths.append(new_possible_path)
-
-                # Swap in the new possible paths to discard paths that are no longer possible.
-                possible_paths = new_possible_paths
-        LOG.debug(f"Possible paths for '{guessed_word}': {possible_paths}")
-        return None if len(possible_paths) == 0 else possible_paths[0]
+        # A word needing more copies of a letter than the board holds can never be traced
+        for character, count in Counter(guessed_word).items():
+            if self.tile_counts[character] < count:
+                return None
+
+        tiles = self.game_tiles
+        last_character_index = len(guessed_word) - 1
+
+        # Bitmasks of the tiles that the rest of the word could be traced from if tiles could be used more than once,
+        # worked out from the end of the word. A path never steps onto a tile the rest of the word cannot follow, so a
+        # search for a word that is not on the board stops at once rather than trying every way of tracing its start.
+        traceable = [0] * len(guessed_word)
+        next_traceable = -1
+        for character_index in range(last_character_index, -1, -1):
+            character = guessed_word[character_index]
+            for tile_index, tile in enumerate(tiles):
+                if (tile == character) and (TILE_NEIGHBOR_MASKS[tile_index] & next_traceable):
+                    traceable[character_index] |= 1 << tile_index
+            if not traceable[character_index]:
+                LOG.debug(f"No path for '{guessed_word}'")
+                return None
+            next_traceable = traceable[character_index]
+
+        path: List[int] = []
+        # Paths that used the same tiles in a different order and ended on the same tile can only be extended the same
+        # way, so each (last tile, used tiles) pair that failed is only searched once.
+        failed_states: Set[int] = set()
+
+        def search(tile_index: int, character_index: int, visited: int) -> bool:
+            # Depth-first search where visited is a bitmask of the tiles already used by the path
+            path.append(tile_index)
+            if character_index == last_character_index:
+                return True
+
+            state = (visited << 5) | tile_index
+            if state not in failed_states:
+                # We cannot use the same tile multiple times in one word.
+                candidates = traceable[character_index + 1] & ~visited
+                for neighbor in TILE_NEIGHBORS[tile_index]:
+                    if (candidates >> neighbor) & 1:
+                        if search(neighbor, character_index + 1, visited | (1 << neighbor)):
+                            return True
+                failed_states.add(state)
+
+            path.pop()
+            return False
+
+        for start_index in range(len(tiles)):
+            if ((traceable[0] >> start_index) & 1) and search(start_index, 0, 1 << start_index):
+                LOG.debug(f"Path for '{guessed_word}': {path}")
+                return path
+
+        LOG.debug(f"No path for '{guessed_word}'")
+        return None
+
+    @synchronized
+    def get_hiscore_update(self) -> Dict[str, object]:
+        """
+        Returns the results table of the game: every player ranked by total score, along with their score for the
+        last round.
+        """
+        hiscore_update = self.room_leaderboard.get_page(0, self.room_leaderboard.max_entries)
+        hiscore_update["board_id"] = self.round_results_board_id
+        # Round scores are lined up with the ranked players on the server, so no player ID is sent to the room
+        hiscore_update["round_scores"] = [
+            self.round_results[player_id]["round_score"] if player_id in self.round_results else 0
+            for player_id in self.room_leaderboard.get_player_ids(0, self.room_leaderboard.max_entries)
+        ]
+        return hiscore_update
+
+    @synchronized
+    def take_hiscore_update(self) -> Optional[Dict[str, object]]:
+        """
+        Returns the results table the first time it is asked for after a round ends, and None otherwise.
+        Every player asks for their scores when a round ends, but the results table only needs to be sent once.
+        """
+        if self.game_running or (self.round_results_board_id is None) or self.round_results_sent:
+            return None
 
+        self.round_results_sent = True
+        return self.get_hiscore_update()
+
+    @synchronized
     def new_player(self, player_id: str, player_name: str):
         self.player_ids_to_names[player_id] = player_name
 
+    @synchronized
+    def get_player_ids(self) -> List[str]:
+        """
+        Returns the IDs of the players that joined the game or made a valid guess in the last round.
+        """
+        return sorted(set(self.player_ids_to_names) | set(self.round_results) | set(self.valid_guesses))
+
+    @synchronized
     def get_players_update(self):
         return {"players": ", ".join(sorted(self.player_ids_to_names.values()))}
 
+    def _record_round(self):
+        if self.results_writer is None:
+            return
+
+        board_id = self.get_board_id()
+        self.results_writer.record(
+            ROUNDS_COLLECTION,
+            f"{self.game_name}-{board_id}",
+            {
+                "game_name": self.game_name,
+                "board_id": board_id,
+                "scoring_type": self.scoring_type.name if self.scoring_type else None,
+                "player_ids": sorted(self.valid_guesses.keys()),
+                "word_counter": dict(self.word_counter),
+                "end_time": get_time_millis(),
+            },
+        )
+
+    def _record_score(self, player_id: str, player_name: str, round_score: int):
+        if self.results_writer is None:
+            return
+
+        board_id = self.get_board_id()
+        self.results_writer.record(
+            SCORES_COLLECTION,
+            f"{self.game_name}-{board_id}-{player_id}",
+            {
+                "game_name": self.game_name,
+                "board_id": board_id,
+                "player_id": player_id,
+                "player_name": player_name,
+                "round_score": round_score,
+                "total_score": self.scores[player_id],
+            },
+        )
+
+    @synchronized
+    def record_totals(self):
+        """
+        Records the total scores of the game's players, replacing those recorded by any earlier game with the same name.
+        """
+        if self.results_writer is None:
+            return
+
+        # Player IDs come from cookies, so they are kept as values rather than used as field names
+        self.results_writer.record(
+            TOTALS_COLLECTION,
+            self.game_name,
+            {
+                "game_name": self.game_name,
+                "players": [
+                    {
+                        "player_id": player_id,
+                        "player_name": self.player_ids_to_names.get(player_id, player_id),
+                        "total_score": total_score,
+                    }
+                    for player_id, total_score in self.scores.items()
+                ],
+            },
+        )
+
+    @synchronized
+    def load_scores(self) -> bool:
+        """
+        Carries on the total scores last recorded by a game with the same name, so that scores survive a restart.
+
+        Returns:
+            True if scores were found
+        """
+        if self.results_writer is None:
+            return False
+
+        totals = self.results_writer.find(TOTALS_COLLECTION, self.game_name)
+        if totals is None:
+            return False
+
+        for player in totals["players"]:
+            player_id = player["player_id"]
+            self.scores[player_id] = player["total_score"]
+            self.room_leaderboard.submit(player_id, player["player_name"], player["total_score"])
+        self._log_info(f"Loaded the total scores of {len(totals['players'])} players")
+        return True
+
     def _log_info(self, log_message: str):
         LOG.info("[%s] %s", self.game_name, log_message)
 
     @staticmethod
     def _tiles_are_neighbors(tile_index_1: int, tile_index_2: int) -> bool:
-        # Calculate the relationship between the two tiles for easier calculation
-        smaller_tile = min(tile_index_1, tile_index_2)
-        larger_tile = max(tile_index_1, tile_index_2)
-
         # Ensure we don't go out of bounds
-        if (smaller_tile < 0) or (larger_tile >= TOTAL_TILES):
+        if (min(tile_index_1, tile_index_2) < 0) or (max(tile_index_1, tile_index_2) >= TOTAL_TILES):
             raise ValueError("Tile indexes invalid")
 
-        difference = larger_tile - smaller_tile
-
-        if larger_tile % 5 == 0:
-            # Tiles on the left-most column
-            return difference in [4, 5]
-        elif (larger_tile + 1) % 5 == 0:
-            # Tiles on the right-most column
-            return difference in [1, 5, 6]
-        else:
-            # All other tiles
-            return difference in [1, 4, 5, 6]
-
-    @staticmethod
-    def _generate_tiles() -> List[str]:
-        tiles = []
-        for i in range(0, TOTAL_TILES):
-            tiles.append(
-                random.choice(
-                    [
-                        "a",
-                        "a",
-                        "a",
-                        "a",
-                        "b",
-                        "c",
-                        "d",
-                        "d",
-                        "e",
-                        "e",
-                        "e",
-                        "e",
-                        "e",
-                        "f",
-                        "g",
-                        "h",
-                        "h",
-                        "h",
-                        "i",
-                        "i",
-                        "i",
-                        "i",
-                        "j",
-                        "k",
-                        "l",
-                        "l",
-                        "m",
-                        "n",
-                        "o",
-                        "o",
-                        "o",
-                        "o",
-                        "q",
-                        "r",
-                        "r",
-                        "s",
-                        "s",
-                        "s",
-                        "s",
-                        "t",
-                        "t",
-                        "t",
-                        "u",
-                        "u",
-                        "u",
-                        "v",
-                        "w",
-                        "x",
-                        "y",
-                        "z",
-                    ]
-                )
-            )
-        return tiles
+        return tile_index_2 in TILE_NEIGHBORS[tile_index_1]
@@ -0,0 +1,122 @@
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Tuple
+
+from application.games.common.locking import synchronized
+
+MAX_ENTRIES = 100
+PAGE_SIZE = 10
+
+
+class Leaderboard:
+    """
+    Ranks players by their best score.
+
+    Only the top entries are kept, in a list sorted best first, so a score that cannot make the leaderboard is
+    rejected by a comparison with the lowest ranked score and any other score is placed by binary search. Updates
+    never depend on how many players have submitted scores, and reading a page is a slice of the ranked list.
+
+    Scores and names are only held for ranked players, so memory is bounded by the number of entries however many
+    players submit scores. Nothing needs to be remembered about a player dropped from the bottom of the leaderboard:
+    the lowest ranked score only ever goes up, so their best score can never be above it and any score that returns
+    them to the leaderboard is their new best.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        """
+        Args:
+            max_entries: The number of players ranked
+        """
+        self.lock = threading.RLock()
+        self.max_entries = max_entries
+
+        # Best score and name of every ranked player
+        self.best_scores: Dict[str, float] = {}
+        self.player_names: Dict[str, str] = {}
+        # (negative score, player ID) for the top players, so that sorting ascending puts the best first
+        self.ranking: List[Tuple[float, str]] = []
+
+    @synchronized
+    def submit(self, player_id: str, player_name: str, score: float) -> bool:
+        """
+        Records a score for a player if it is the player's best and makes the leaderboard.
+
+        Args:
+            player_id: The ID of the player
+            player_name: The name to show for the player
+            score: The score
+
+        Returns:
+            True if the score is on the leaderboard as the player's best
+        """
+        best_score = self.best_scores.get(player_id)
+        if best_score is not None:
+            self.player_names[player_id] = player_name
+            if score <= best_score:
+                return False
+
+        entry = (-score, player_id)
+        if (len(self.ranking) >= self.max_entries) and (entry > self.ranking[-1]):
+            return False
+
+        if best_score is not None:
+            del self.ranking[bisect_left(self.ranking, (-best_score, player_id))]
+        insort(self.ranking, entry)
+        self.best_scores[player_id] = score
+        self.player_names[player_id] = player_name
+
+        if len(self.ranking) > self.max_entries:
+            _, dropped_player_id = self.ranking.pop()
+            del self.best_scores[dropped_player_id]
+            del self.player_names[dropped_player_id]
+        return True
+
+    @synchronized
+    def get_page(self, page: int = 0, page_size: int = PAGE_SIZE) -> Dict[str, object]:
+        """
+        Returns a page of the leaderboard.
+
+        Args:
+            page: The page, starting from 0
+            page_size: The number of players on each page
+
+        Returns:
+            The ranks, names and scores of the players on the page, along with the number of ranked players
+        """
+        start = page * page_size
+        end = start + page_size
+        entries = self.ranking[start:end]
+        return {
+            "page": page,
+            "page_size": page_size,
+            "total": len(self.ranking),
+            "ranks": list(range(start + 1, start + len(entries) + 1)),
+            "names": [self.player_names[player_id] for _, player_id in entries],
+            "scores": [-negative_score for negative_score, _ in entries],
+        }
+
+    @synchronized
+    def get_player_ids(self, page: int = 0, page_size: int = PAGE_SIZE) -> List[str]:
+        """
+        Returns the IDs of the players on a page of the leaderboard, in rank order.
+
+        A player's ID is the cookie that identifies them, so IDs are only for use on the server and are never part of
+        the pages sent to players.
+
+        Args:
+            page: The page, starting from 0
+            page_size: The number of players on each page
+        """
+        start = page * page_size
+        end = start + page_size
+        return [player_id for _, player_id in self.ranking[start:end]]
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Locks cannot be pickled
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, object]):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
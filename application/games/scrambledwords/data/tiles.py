@@ -0,0 +1,46 @@
+import random
+from typing import List, Optional
+
+from application.games.common.letter_distribution import LetterDistribution
+from .board_solver import TOTAL_TILES
+
+# Relative number of each letter among the tiles, weighted on English letter frequency
+LETTER_DISTRIBUTION = LetterDistribution(
+    {
+        "a": 4,
+        "b": 1,
+        "c": 1,
+        "d": 2,
+        "e": 5,
+        "f": 1,
+        "g": 1,
+        "h": 3,
+        "i": 4,
+        "j": 1,
+        "k": 1,
+        "l": 2,
+        "m": 1,
+        "n": 1,
+        "o": 4,
+        "q": 1,
+        "r": 2,
+        "s": 4,
+        "t": 3,
+        "u": 3,
+        "v": 1,
+        "w": 1,
+        "x": 1,
+        "y": 1,
+        "z": 1,
+    }
+)
+
+
+def generate_tiles(rng: Optional[random.Random] = None) -> List[str]:
+    """
+    Draws the tiles of a new board.
+
+    Args:
+        rng: The random number generator to draw the tiles with, so that seeded games can replay their boards
+    """
+    return LETTER_DISTRIBUTION.sample(TOTAL_TILES, rng)
@@ -7,6 +7,7 @@ from flask_socketio import emit, join_room
 from application import ScrambledWordsGameManager, SCRAMBLED_WORDS_GAME_MANAGER_CONFIG_KEY
 from application import socketio
 from application.games.common.player import get_player_name, get_player_id
+from application.games.scrambledwords.data.game_state import GameState
 from application.games.scrambledwords.data.scoring_type import ScoringType
 
 LOG = logging.getLogger("scrambledwords.events")
@@ -19,20 +20,25 @@ def joined_event(message):
     """
 
     room = message["room"]
-    join_room(room)
-
     session_id = flask.request.sid
     player_id = get_player_id()
+    join_room(room)
+    # Results are sent to each of the player's sessions when the game timer ends a round
+    join_room(_get_player_room(room, player_id))
+
+    with _get_game_manager().update_game_state(room) as game_state:
+        if not game_state:
+            LOG.warning(f"User {player_id} has joined invalid room {room}")
+            return
 
-    game_state = _get_game_manager().get_game_state(room)
-    if game_state:
         LOG.info(f"User {player_id} has joined room {room}")
         game_state.new_player(player_id, get_player_name())
-        # Only send the game_state update to the SocketIO session ID as the other players do not need to know
-        emit("game_state", game_state.get_game_state(player_id=player_id), to=session_id)
-        emit("players_update", game_state.get_players_update(), room=room)
-    else:
-        LOG.warning(f"User {player_id} has joined invalid room {room}")
+        game_state_update = game_state.get_game_state(player_id=player_id)
+        players_update = game_state.get_players_update()
+
+    # Only send the game_state update to the SocketIO session ID as the other players do not need to know
+    emit("game_state", game_state_update, to=session_id)
+    emit("players_update", players_update, room=room)
 
 
 @socketio.on("guess")
@@ -48,8 +54,13 @@ def guess_word_event(message):
     room = message["room"]
     guessed_word = message["guess"]
 
-    game_state = _get_game_manager().get_game_state(room)
-    word_path = game_state.guess_word(player_id, guessed_word)
+    with _get_game_manager().update_game_state(room) as game_state:
+        if game_state:
+            word_path = game_state.guess_word(player_id, guessed_word)
+        else:
+            # The game may have expired while the player was away, so the guess is rejected
+            LOG.warning(f"Received guess from Player {player_id} for invalid game {room}")
+            word_path = None
 
     emit("guess_reply", {"valid": word_path is not None, "guess": guessed_word, "path": word_path}, to=session_id)
 
@@ -60,13 +71,20 @@ def new_game_event(message):
 
     room = message["room"]
 
-    game_state = _get_game_manager().get_game_state(room)
-    if game_state:
-        game_state.new_board()
-    else:
+    game_state_update = None
+    with _get_game_manager().update_game_state(room) as game_state:
+        if game_state:
+            game_state.new_board()
+            game_state_update = game_state.get_game_state()
+
+    if game_state_update is None:
         game_state = _get_game_manager().create_game_for_name(room, ScoringType.CLASSIC)
+        if game_state is None:
+            # Another worker created the game first, so players are sent the board it created
+            game_state = _get_game_manager().get_game_state(room)
+        game_state_update = game_state.get_game_state()
 
-    emit("game_state", game_state.get_game_state(), room=room)
+    emit("game_state", game_state_update, room=room)
 
 
 @socketio.on("timer_expired")
@@ -77,13 +95,50 @@ def timer_expired_event(message):
     player_id = get_player_id()
     room = message["room"]
 
-    game_state = _get_game_manager().get_game_state(room)
+    with _get_game_manager().update_game_state(room) as game_state:
+        if not game_state:
+            LOG.warning(f"Received timer_expired message from Player {player_id} for invalid game {room}")
+            return
+
+        score_state = game_state.get_score_state(player_id)
+        if score_state is None:
+            remaining_millis = game_state.get_remaining_millis()
+        else:
+            # Only the first player to report the end of the round broadcasts the results table
+            hiscore_update = game_state.take_hiscore_update()
+
+    if score_state is None:
+        # The player's clock is ahead of the server's, so the player asks again once the round is over
+        LOG.warning(
+            f"Received timer_expired message from Player {player_id} {remaining_millis}ms before game {room} ended"
+        )
+        emit("round_not_over", {"remaining_millis": remaining_millis}, to=session_id)
+        return
+
+    emit("game_over", score_state, to=session_id)
+    if hiscore_update:
+        emit("hiscore_update", hiscore_update, to=room)
+
+
+def send_round_results(game_state: GameState):
+    """
+    Sends every player of the game their results, and the game's results table, once the game timer ends a round.
+    Players whose clocks run behind the server's are sent their results before they ask for them.
+
+    Args:
+        game_state: The game
+    """
+    room = game_state.game_name
+    for player_id in game_state.get_player_ids():
+        socketio.emit("game_over", game_state.get_score_state(player_id), to=_get_player_room(room, player_id))
+
+    hiscore_update = game_state.take_hiscore_update()
+    if hiscore_update:
+        socketio.emit("hiscore_update", hiscore_update, to=room)
+
 
-    if game_state:
-        emit("game_over", game_state.get_score_state(player_id, get_player_name()), to=session_id)
-        emit("hiscore_update", game_state.get_hiscore_update(), to=room)
-    else:
-        LOG.warning(f"Received timer_expired message from Player {player_id} for invalid game {room}")
+def _get_player_room(room: str, player_id: str) -> str:
+    return f"{room}/{player_id}"
 
 
 def _get_game_manager() -> ScrambledWordsGameManager:
@@ -1,13 +1,16 @@
 import logging
 
-from flask import current_app, redirect, render_template, request, url_for
+from flask import current_app, jsonify, redirect, render_template, request, url_for
 
 from application import SCRAMBLED_WORDS_GAME_MANAGER_CONFIG_KEY
 from ..data.game_manager import ScrambledWordsGameManager
+from ..data.leaderboard import PAGE_SIZE
 from ..data.scoring_type import ScoringType
 from . import scrambled_words_blueprint
 
 
+MAX_PAGE_SIZE = 100
+
 LOG = logging.getLogger("scrambledwords.routes")
 
 
@@ -51,5 +54,19 @@ def create_game():
     return redirect(url_for(".game_page", game_name=game_state.game_name), code=302)
 
 
+@scrambled_words_blueprint.route("/leaderboard")
+def leaderboard():
+    page = request.args.get("page", 0, type=int)
+    page_size = min(request.args.get("page_size", PAGE_SIZE, type=int), MAX_PAGE_SIZE)
+    if (page < 0) or (page_size < 1):
+        return "Invalid page!", 400
+
+    game_leaderboard = _get_game_manager().leaderboard
+    if game_leaderboard is None:
+        return "There is no leaderboard when games are shared between workers!", 404
+
+    return jsonify(game_leaderboard.get_page(page, page_size))
+
+
 def _get_game_manager() -> ScrambledWordsGameManager:
     return current_app.config[SCRAMBLED_WORDS_GAME_MANAGER_CONFIG_KEY]
@@ -1,5 +1,10 @@
 let selectedHandTile = null;
 
+// Version of the board and hand we are showing. Patches only apply on top of the version before them.
+let boardVersion = null;
+let handTiles = [];
+let gameRunning = false;
+
 $(document).ready(function () {
     const socket = io.connect('https://' + document.domain + ':' + location.port);
 
@@ -44,6 +49,19 @@ $(document).ready(function () {
         handleGameUpdate(data);
     });
 
+    socket.on("cc-board_patch", function (data) {
+        console.log(data);
+
+        // If we have missed a version we cannot apply the patch so ask for the full state instead
+        if (boardVersion === null || data["version"] !== boardVersion + 1) {
+            console.log(`Missed board version ${boardVersion + 1}. Requesting full update.`);
+            socket.emit("cc-update_request", {"room": roomName});
+            return;
+        }
+
+        handleBoardPatch(data);
+    });
+
     socket.on("cc-game_over", function (data) {
         console.log(data);
 
@@ -73,10 +91,12 @@ function handleGameUpdate(data) {
     document.getElementById("num-players").innerText = data["num_players"];
     document.getElementById("tiles-left").innerText = data["tiles_left"];
     const player_data = data["players"][getPlayerId()];
+    boardVersion = data["version"];
+    gameRunning = data["game_running"];
 
     // Enable or disable the start game button appropriately
     const startGameButton = document.getElementById("start-game-button");
-    if (data["game_running"]) {
+    if (gameRunning) {
         startGameButton.setAttribute("disabled", "");
     } else {
         startGameButton.removeAttribute("disabled");
@@ -84,27 +104,66 @@ function handleGameUpdate(data) {
 
     ///////////////////////////////////////////////////////////////
     // Board update
-    for (let r = 0; r < player_data["board"].length; r++) {
-        let row = player_data["board"][r];
-        for (let c = 0; c < row.length; c++) {
-            let boardTile = row[c];
+    // Only occupied spaces are sent so clear every space first
+    $(".board-tile").each(function () {
+        $(this)[0].innerHTML = "&nbsp;";
+    });
+    player_data["tiles"].forEach(function (boardTile) {
+        document.getElementById(`space-${boardTile[0]}-${boardTile[1]}`).innerHTML = boardTile[2];
+    });
 
-            if (boardTile == null) {
-                boardTile = "&nbsp;"
-            }
+    ///////////////////////////////////////////////////////////////
+    // Hand tiles update
+    handTiles = player_data["hand_tiles"];
+    updateHandTiles();
+}
 
-            document.getElementById(`space-${r}-${c}`).innerHTML = boardTile;
-        }
+function handleBoardPatch(data) {
+    boardVersion = data["version"];
+    document.getElementById("tiles-left").innerText = data["tiles_left"];
+
+    ///////////////////////////////////////////////////////////////
+    // Board update
+    if (data["shift"] !== null) {
+        shiftBoardTiles(data["shift"][0], data["shift"][1]);
     }
+    data["tiles"].forEach(function (boardTile) {
+        const tile = boardTile[2] === null ? "&nbsp;" : boardTile[2];
+        document.getElementById(`space-${boardTile[0]}-${boardTile[1]}`).innerHTML = tile;
+    });
 
     ///////////////////////////////////////////////////////////////
     // Hand tiles update
+    if (data["hand_removed_index"] !== null) {
+        handTiles.splice(data["hand_removed_index"], 1);
+    }
+    handTiles = handTiles.concat(data["hand_added_tiles"]);
+    updateHandTiles();
+}
+
+function shiftBoardTiles(rowOffset, colOffset) {
+    // Read every occupied space before writing any so that tiles are not overwritten as they move
+    const occupiedSpaces = [];
+    $(".board-tile").each(function () {
+        const space = $(this)[0];
+        if (space.innerHTML !== "&nbsp;") {
+            occupiedSpaces.push([parseInt(space.id.split("-")[1]), parseInt(space.id.split("-")[2]), space.innerHTML]);
+            space.innerHTML = "&nbsp;";
+        }
+    });
+    occupiedSpaces.forEach(function (boardTile) {
+        const row = boardTile[0] + rowOffset;
+        const col = boardTile[1] + colOffset;
+        document.getElementById(`space-${row}-${col}`).innerHTML = boardTile[2];
+    });
+}
 
+function updateHandTiles() {
     // Clear out all tile buttons to ensure we have a clean state
     $("#tiles-div").empty();
 
     // Ensure the peel button is enabled or disabled appropriately
-    if (player_data["hand_tiles"].length === 0 && data["game_running"]) {
+    if (handTiles.length === 0 && gameRunning) {
         const peelButton = document.getElementById("peel-button");
         peelButton.classList.remove("btn-light");
         peelButton.classList.add("btn-primary");
@@ -117,8 +176,8 @@ function handleGameUpdate(data) {
     }
 
     // Create tile buttons for the player's hand
-    for (let i = 0; i < player_data["hand_tiles"].length; i++) {
-        const tile = player_data["hand_tiles"][i];
+    for (let i = 0; i < handTiles.length; i++) {
+        const tile = handTiles[i];
         const tileElement = document.createElement("BUTTON");
         tileElement.id = `tile-${i}`;
         tileElement.classList.add("btn", "btn-tile", "hand-tile", "btn-light", "rounded-0");
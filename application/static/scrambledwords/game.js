@@ -90,9 +90,28 @@ $(document).ready(function () {
         guessWordInputElement.focus();
     });
 
+    socket.on("round_not_over", function (data) {
+        console.log(data);
+
+        // This clock is ahead of the server's, so count down the time the server has left and ask again
+        expireTimeMillis = new Date().getTime() + data.remaining_millis;
+
+        const guessButtonElement = document.getElementById("guessWordSubmit");
+        if (guessButtonElement.hasAttribute("disabled")) {
+            guessButtonElement.removeAttribute("disabled");
+        }
+    });
+
     socket.on("game_over", function (data) {
         console.log(data);
 
+        // The server may end the round before this clock does
+        if (expireTimeMillis != null) {
+            expireTimeMillis = null;
+            end_game();
+            document.getElementById("time-remaining-div").innerHTML = "00:00";
+        }
+
         let roundScore = 0;
 
         data.scored_words.forEach(function (item, index) {
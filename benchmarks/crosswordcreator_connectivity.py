@@ -0,0 +1,50 @@
+"""
+Times the Crossword Creator connectivity check on boards much larger than the game's board.
+
+Run with: python -m benchmarks.crosswordcreator_connectivity
+"""
+
+import random
+import timeit
+
+from application.games.common.word_manager import WordManager
+from application.games.crosswordcreator.data.board import Board
+
+REPETITIONS = 5
+
+# The connectivity check never looks words up
+WORD_MANAGER = WordManager(set())
+
+
+def _snake_board(board_size: int) -> Board:
+    # One long path through every other row, the worst case for a recursive search
+    board = Board("benchmark", board_size, WORD_MANAGER)
+    for row in range(0, board_size, 2):
+        for col in range(board_size):
+            board.add_tile("a", row, col)
+        if row + 1 < board_size:
+            board.add_tile("a", row + 1, board_size - 1 if (row // 2) % 2 == 0 else 0)
+    return board
+
+
+def _random_board(board_size: int) -> Board:
+    # Roughly half the cells filled gives many islands of different sizes
+    rng = random.Random(board_size)
+    board = Board("benchmark", board_size, WORD_MANAGER)
+    for row in range(board_size):
+        for col in range(board_size):
+            if rng.random() < 0.5:
+                board.add_tile("a", row, col)
+    return board
+
+
+def main():
+    for board_size in (25, 100, 400, 1000):
+        for name, board in (("snake", _snake_board(board_size)), ("random", _random_board(board_size))):
+            seconds = timeit.timeit(board._check_connected, number=REPETITIONS) / REPETITIONS
+            components = len(board.get_component_sizes())
+            print(f"{board_size:>5}x{board_size:<5} {name:<7} {components:>7} components {seconds * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Compares keeping the Scrambled Words leaderboard up to date incrementally against sorting every player's best score
+each time a round ends and the leaderboard is broadcast.
+
+Run with: python -m benchmarks.leaderboard
+"""
+
+import random
+import timeit
+
+from application.games.scrambledwords.data.leaderboard import Leaderboard, PAGE_SIZE
+
+PLAYER_COUNTS = [1000, 10000, 100000]
+SUBMISSIONS = 20000
+
+
+def _sort_every_score(best_scores, submissions):
+    for player_id, score in submissions:
+        best_scores[player_id] = max(score, best_scores.get(player_id, score))
+        sorted(best_scores.items(), key=lambda item: (-item[1], item[0]))[:PAGE_SIZE]
+
+
+def _update_leaderboard(leaderboard, submissions):
+    for player_id, score in submissions:
+        leaderboard.submit(player_id, player_id, score)
+        leaderboard.get_page()
+
+
+def main():
+    rng = random.Random(0)
+    for num_players in PLAYER_COUNTS:
+        # Start from a leaderboard every player has already submitted a score to
+        initial_scores = {f"player{i}": rng.randrange(200) for i in range(num_players)}
+        leaderboard = Leaderboard()
+        for player_id, score in initial_scores.items():
+            leaderboard.submit(player_id, player_id, score)
+        submissions = [(f"player{rng.randrange(num_players)}", rng.randrange(250)) for _ in range(SUBMISSIONS)]
+
+        # Sorting is too slow to run every submission with many players
+        sorted_submissions = submissions[: max(SUBMISSIONS * 1000 // num_players, 100)]
+        sort_seconds = timeit.timeit(
+            lambda: _sort_every_score(dict(initial_scores), sorted_submissions), number=1
+        ) / len(sorted_submissions)
+        update_seconds = timeit.timeit(lambda: _update_leaderboard(leaderboard, submissions), number=1) / SUBMISSIONS
+        print(
+            f"{num_players:7d} players   sort every score {sort_seconds * 1e6:10.1f} us"
+            f"   incremental {update_seconds * 1e6:6.1f} us   ({sort_seconds / update_seconds:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
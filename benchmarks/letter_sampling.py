@@ -0,0 +1,43 @@
+"""
+Compares drawing tiles one letter at a time from an inline list, as the games used to, against drawing a whole board or
+hand at once from a precomputed letter distribution.
+
+Run with: python -m benchmarks.letter_sampling
+"""
+
+import random
+import timeit
+
+from application.games.crosswordcreator.data.tiles import TILE_DISTRIBUTION
+from application.games.scrambledwords.data.board_solver import TOTAL_TILES
+from application.games.scrambledwords.data.tiles import LETTER_DISTRIBUTION
+
+REPETITIONS = 20000
+
+CASES = [
+    ("Scrambled Words board", LETTER_DISTRIBUTION, TOTAL_TILES),
+    ("Crossword Creator hand", TILE_DISTRIBUTION, 20),
+]
+
+
+def _sample_one_at_a_time(letters, num_letters):
+    tiles = []
+    for _ in range(num_letters):
+        # Copy the letters on every call like the old inline list literal
+        tiles.append(random.choice(list(letters)))
+    return tiles
+
+
+def main():
+    for name, letter_distribution, num_letters in CASES:
+        letters = tuple(letter_distribution.table)
+        old_seconds = timeit.timeit(lambda: _sample_one_at_a_time(letters, num_letters), number=REPETITIONS)
+        new_seconds = timeit.timeit(lambda: letter_distribution.sample(num_letters), number=REPETITIONS)
+        print(
+            f"{name:<25} one at a time {REPETITIONS / old_seconds:10.0f}/s"
+            f"   whole draw {REPETITIONS / new_seconds:10.0f}/s   ({old_seconds / new_seconds:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
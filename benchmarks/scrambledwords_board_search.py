@@ -0,0 +1,45 @@
+"""
+Times GameState._word_is_on_board on worst-case Scrambled Words boards.
+
+Run with: python -m benchmarks.scrambledwords_board_search
+"""
+
+import timeit
+
+from application.games.common.word_manager import WordManager
+from application.games.scrambledwords.data.game_state import GameState
+
+REPETITIONS = 20
+
+CASES = [
+    ("all 'e', 3 letters", ["e"] * 25, "e" * 3),
+    ("all 'e', 8 letters", ["e"] * 25, "e" * 8),
+    ("all 'e', 16 letters", ["e"] * 25, "e" * 16),
+    ("all 'e', 25 letters", ["e"] * 25, "e" * 25),
+    ("all 'e', too many letters", ["e"] * 25, "e" * 26),
+    ("all 'e', missing letter", ["e"] * 25, "e" * 7 + "s"),
+    ("vowel heavy", list("aeioueaioueiaouoeiuaueoia"), "aeiouea"),
+    ("all 'e', 's' in the corner", ["e"] * 24 + ["s"], "e" * 6 + "s"),
+    # Every letter is on the board but the word cannot be traced, so every way of tracing its start fails
+    ("'x' and 'y' apart, 12 'e's", ["x"] + ["e"] * 23 + ["y"], "e" * 12 + "xy"),
+    ("'x' and 'y' apart, 22 'e's", ["x"] + ["e"] * 23 + ["y"], "e" * 22 + "xy"),
+    ("walled off, 14 'e's", ["x", "y"] + ["e"] * 13 + ["z"] * 5 + ["e"] * 5, "e" * 14 + "xy"),
+    ("walled off, 16 'e's", ["x", "y"] + ["e"] * 13 + ["z"] * 5 + ["e"] * 5, "e" * 16 + "xy"),
+    # The word is on the board, but only by a path through nearly every tile
+    ("'x' by 'y', 20 'e's", ["x", "y"] + ["e"] * 23, "e" * 20 + "xy"),
+    ("'x' by 'y', 23 'e's", ["x", "y"] + ["e"] * 23, "e" * 23 + "xy"),
+]
+
+
+def main():
+    # The board search only looks at the tiles, and an empty dictionary keeps solving each new board cheap
+    game_state = GameState("benchmark", WordManager(set()), None, game_timer=False)
+
+    for name, tiles, word in CASES:
+        game_state.new_board(tiles=tiles)
+        seconds = timeit.timeit(lambda: game_state._word_is_on_board(word), number=REPETITIONS) / REPETITIONS
+        print(f"{name:<30} {seconds * 1000:8.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Compares how many Socket.IO clients a single server process can hold open for each server mode.
+
+The application is started in a subprocess for each mode, then clients connect in waves and stay connected.
+A wave that cannot fully connect within the timeout ends the run for that mode.
+The connected client count, the server's resident memory and its thread count are printed after every wave.
+
+The async mode needs eventlet (or gevent and gevent-websocket) installed, and the clients need the Socket.IO client
+extras: pip install eventlet "python-socketio[client]"
+
+Run with: python -m benchmarks.socketio_connections [--max-clients 1000] [--wave-size 50]
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import socketio
+
+MODES = [("waitress", ["polling"]), ("async", ["websocket"])]
+HOST = "127.0.0.1"
+PORT = 10100
+CONNECT_TIMEOUT_SECONDS = 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-clients", type=int, default=1000)
+    parser.add_argument("--wave-size", type=int, default=50)
+    args = parser.parse_args()
+
+    results = {}
+    for mode, transports in MODES:
+        print(f"== {mode} ({', '.join(transports)})")
+        results[mode] = _run_mode(mode, transports, args.max_clients, args.wave_size)
+
+    print()
+    for mode, connected_clients in results.items():
+        print(f"{mode:<10} held {connected_clients} connections in one process")
+
+
+def _run_mode(mode: str, transports: List[str], max_clients: int, wave_size: int) -> int:
+    environment = {**os.environ, "GAMESBOX_SERVER": mode, "WAITRESS_HOST": HOST, "PORT": str(PORT)}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "application"], env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    clients: List[socketio.Client] = []
+    try:
+        _wait_for_port()
+        with ThreadPoolExecutor(max_workers=wave_size) as executor:
+            while len(clients) < max_clients:
+                wave = list(executor.map(lambda _: _connect(transports), range(wave_size)))
+                clients.extend(client for client in wave if client is not None)
+
+                stats = _get_process_stats(server.pid)
+                print(
+                    f"  {len(clients):6d} connected   {stats.get('VmRSS', '?'):>12} resident"
+                    f"   {stats.get('Threads', '?'):>5} threads"
+                )
+                if None in wave:
+                    break
+        return len(clients)
+    finally:
+        for client in clients:
+            client.disconnect()
+        server.terminate()
+        server.wait()
+
+
+def _connect(transports: List[str]) -> Optional[socketio.Client]:
+    client = socketio.Client(reconnection=False)
+    try:
+        client.connect(f"http://{HOST}:{PORT}", transports=transports, wait_timeout=CONNECT_TIMEOUT_SECONDS)
+        return client
+    except socketio.exceptions.ConnectionError:
+        return None
+
+
+def _wait_for_port():
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((HOST, PORT), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+def _get_process_stats(pid: int) -> Dict[str, str]:
+    # Only available on Linux
+    try:
+        with open(f"/proc/{pid}/status") as status_file:
+            lines = [line.split(":", 1) for line in status_file]
+    except OSError:
+        return {}
+    return {key: value.strip() for key, value in lines}
+
+
+if __name__ == "__main__":
+    main()
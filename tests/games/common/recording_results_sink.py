@@ -0,0 +1,24 @@
+import threading
+from typing import Dict, Optional
+
+from application.games.common.results_writer import ResultsSink
+
+
+class RecordingSink(ResultsSink):
+    def __init__(self):
+        self.writes = []
+        self.release = threading.Event()
+        self.release.set()
+        self.fail = False
+
+    def write(self, collection: str, documents: Dict[str, Dict[str, object]]):
+        self.release.wait()
+        if self.fail:
+            raise IOError("database is down")
+        self.writes.append((collection, documents))
+
+    def find_one(self, collection: str, key: str) -> Optional[Dict[str, object]]:
+        for written_collection, documents in reversed(self.writes):
+            if (written_collection == collection) and (key in documents):
+                return documents[key]
+        return None
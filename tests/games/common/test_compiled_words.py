@@ -0,0 +1,65 @@
+import random
+
+from application.games.common.compiled_words import (
+    CompiledWordList,
+    compile_word_file,
+    get_compiled_path,
+    get_source_hash,
+    load_compiled_words,
+)
+from application.games.common.word_manager import PrefixIndex
+
+TEST_WORDS = ["cat", "Dog", "test", "cart", "car", "dogs"]
+
+
+class TestCompiledWords:
+    def setup_method(self):
+        self.source_bytes = "\n".join(TEST_WORDS).encode()
+
+    def _compile(self, tmp_path) -> str:
+        word_file_path = str(tmp_path / "words.txt")
+        with open(word_file_path, mode="wb") as word_file:
+            word_file.write(self.source_bytes)
+        compile_word_file(word_file_path)
+        return word_file_path
+
+    def test_sorted_sequence(self, tmp_path):
+        compiled_words = CompiledWordList(get_compiled_path(self._compile(tmp_path)))
+
+        assert len(TEST_WORDS) == len(compiled_words)
+        assert sorted(word.upper() for word in TEST_WORDS) == list(compiled_words)
+        assert "CAR" == compiled_words[0]
+        assert "TEST" == compiled_words[-1]
+
+    def test_contains(self, tmp_path):
+        compiled_words = CompiledWordList(get_compiled_path(self._compile(tmp_path)))
+
+        for word in TEST_WORDS:
+            assert word.upper() in compiled_words
+        assert "CATS" not in compiled_words
+        assert "DO" not in compiled_words
+        assert "" not in compiled_words
+        assert "CAFÉ" not in compiled_words
+
+    def test_prefix_index(self, tmp_path):
+        prefix_index = PrefixIndex(CompiledWordList(get_compiled_path(self._compile(tmp_path))))
+
+        assert ["CAR", "CART"] == list(prefix_index.iter_words_with_prefix("CAR"))
+        assert prefix_index.is_prefix("DO")
+        assert not prefix_index.is_prefix("E")
+
+    def test_random_sample(self, tmp_path):
+        compiled_words = CompiledWordList(get_compiled_path(self._compile(tmp_path)))
+
+        random_words = random.sample(compiled_words, 3)
+        assert 3 == len(set(random_words))
+        for random_word in random_words:
+            assert random_word in compiled_words
+
+    def test_load_compiled_words(self, tmp_path):
+        word_file_path = self._compile(tmp_path)
+
+        assert load_compiled_words(word_file_path, get_source_hash(self.source_bytes)) is not None
+        # A compiled file made from different contents is stale
+        assert load_compiled_words(word_file_path, get_source_hash(b"other")) is None
+        assert load_compiled_words(str(tmp_path / "missing.txt"), get_source_hash(self.source_bytes)) is None
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+from application.games.common import database
+from application.games.common.database import (
+    check_database_health,
+    close_client,
+    get_client,
+    get_database,
+    set_client_factory,
+)
+
+
+class FakeAdmin:
+    def __init__(self, client: "FakeMongoClient"):
+        self.client = client
+
+    def command(self, command: str):
+        if self.client.down:
+            raise ConnectionError("server selection timed out")
+        return {"ok": 1}
+
+
+class FakeMongoClient:
+    def __init__(self, uri: str, **options):
+        self.uri = uri
+        self.options = options
+        self.admin = FakeAdmin(self)
+        self.down = False
+        self.closed = False
+
+    def __getitem__(self, name: str):
+        return (self, name)
+
+    def close(self):
+        self.closed = True
+
+
+class TestDatabase:
+    def setup_method(self):
+        self.clients = []
+
+        def create_client(uri: str, **options) -> FakeMongoClient:
+            client = FakeMongoClient(uri, **options)
+            self.clients.append(client)
+            return client
+
+        set_client_factory(create_client)
+
+    def teardown_method(self):
+        set_client_factory(database.MongoClient)
+
+    def test_client_is_created_once_on_first_use(self):
+        assert [] == self.clients
+
+        client = get_client()
+        assert client is get_client()
+        assert (client, "games") == get_database()
+        assert [client] == self.clients
+
+    def test_client_options_come_from_environment(self, monkeypatch):
+        monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "7")
+
+        options = get_client().options
+        assert 7 == options["maxPoolSize"]
+        assert 5000 == options["serverSelectionTimeoutMS"]
+
+    def test_close_client(self):
+        client = get_client()
+        close_client()
+
+        assert client.closed
+        assert client is not get_client()
+
+    def test_health_check(self):
+        assert check_database_health()["healthy"]
+
+        get_client().down = True
+        assert {"healthy": False, "error": "server selection timed out"} == check_database_health()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Forking is not supported")
+    def test_forked_process_creates_its_own_client(self):
+        parent_client = get_client()
+
+        pid = os.fork()
+        if pid == 0:
+            # Exit straight away from the child so that pytest does not carry on running in it
+            os._exit(0 if (get_client() is not parent_client) and (not parent_client.closed) else 1)
+
+        _, status = os.waitpid(pid, 0)
+        assert 0 == os.waitstatus_to_exitcode(status)
+        assert parent_client is get_client()
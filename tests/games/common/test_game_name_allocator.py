@@ -0,0 +1,54 @@
+import random
+
+from application.games.common.game_name_allocator import GameNameAllocator
+
+
+class TestGameNameAllocator:
+    def test_names_are_unique(self):
+        allocator = GameNameAllocator("SW", code_length=2, max_occupancy=1.0, rng=random.Random(0))
+
+        names = [allocator.allocate() for _ in range(26 * 26)]
+        assert len(set(names)) == len(names)
+        assert all(name.startswith("SW") and len(name) == 4 for name in names)
+
+        # Every two letter code is in use so codes get longer
+        assert 5 == len(allocator.allocate())
+
+    def test_codes_get_longer_past_max_occupancy(self):
+        allocator = GameNameAllocator("SW", code_length=1, max_occupancy=0.5, rng=random.Random(0))
+
+        names = [allocator.allocate() for _ in range(14)]
+        assert [3] * 13 + [4] == [len(name) for name in names]
+
+    def test_released_names_are_reused(self):
+        allocator = GameNameAllocator("SW", rng=random.Random(0))
+        name = allocator.allocate()
+        allocator.allocate()
+
+        allocator.release(name)
+        assert name == allocator.allocate()
+
+    def test_reserved_names_are_skipped(self):
+        allocator = GameNameAllocator("SW", code_length=1, max_occupancy=1.0, rng=random.Random(0))
+        for letter in "ABCDEFGHIJKLMNOPQRSTUVWXY":
+            allocator.reserve("SW" + letter)
+
+        assert "SWZ" == allocator.allocate()
+
+    def test_discarded_names_are_not_reused(self):
+        allocator = GameNameAllocator("SW", code_length=1, max_occupancy=1.0, rng=random.Random(0))
+        name = allocator.allocate()
+
+        allocator.discard(name)
+        assert name not in allocator.names_in_use
+        names = [allocator.allocate() for _ in range(25)]
+        assert name not in names
+
+    def test_released_reserved_name_is_not_handed_out_twice(self):
+        allocator = GameNameAllocator("SW", code_length=1, max_occupancy=1.0, rng=random.Random(0))
+        allocator.reserve("SWA")
+        allocator.release("SWA")
+        allocator.reserve("SWA")
+
+        names = [allocator.allocate() for _ in range(25)]
+        assert "SWA" not in names
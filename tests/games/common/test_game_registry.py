@@ -0,0 +1,80 @@
+from application.games.common.game_registry import GameRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+class TestGameRegistry:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.evicted = []
+        self.registry = GameRegistry(
+            max_games=3,
+            idle_timeout_seconds=10,
+            on_evict=lambda game_name, game: self.evicted.append(game_name),
+            clock=self.clock,
+        )
+
+    def test_add_and_get(self):
+        self.registry.add("A", "game a")
+
+        assert "A" in self.registry
+        assert "B" not in self.registry
+        assert "game a" == self.registry.get("A")
+        assert self.registry.get("B") is None
+        assert 1 == len(self.registry)
+
+    def test_idle_eviction(self):
+        self.registry.add("A", "game a")
+        self.clock.time = 5
+        self.registry.add("B", "game b")
+
+        self.clock.time = 11
+        assert self.registry.get("A") is None
+        assert "game b" == self.registry.get("B")
+        assert ["A"] == self.evicted
+
+    def test_activity_prevents_idle_eviction(self):
+        self.registry.add("A", "game a")
+        self.clock.time = 8
+        self.registry.get("A")
+
+        self.clock.time = 15
+        assert "game a" == self.registry.get("A")
+        assert [] == self.evicted
+
+    def test_capacity_eviction_is_least_recently_used(self):
+        self.registry.add("A", "game a")
+        self.registry.add("B", "game b")
+        self.registry.add("C", "game c")
+        self.registry.get("A")
+
+        self.registry.add("D", "game d")
+
+        assert ["B"] == self.evicted
+        assert "A" in self.registry
+        assert "B" not in self.registry
+
+    def test_replace_does_not_evict(self):
+        self.registry.add("A", "game a")
+        self.registry.add("B", "game b")
+        self.registry.add("C", "game c")
+        self.registry.add("A", "new game a")
+
+        assert [] == self.evicted
+        assert "new game a" == self.registry.get("A")
+
+    def test_metrics(self):
+        self.registry.add("A", "game a")
+        self.registry.add("B", "game b")
+        self.registry.add("C", "game c")
+        self.registry.add("D", "game d")
+        self.clock.time = 20
+        self.registry.evict_idle_games()
+
+        assert {"live_games": 0, "idle_evictions": 3, "capacity_evictions": 1} == self.registry.get_metrics()
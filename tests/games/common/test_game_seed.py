@@ -0,0 +1,17 @@
+import random
+
+from application.games.common.game_seed import get_game_seed
+
+
+class TestGameSeed:
+    def test_seed_asked_for_is_used(self):
+        assert 7 == get_game_seed(7, 1, random.Random(1))
+        assert 7 == get_game_seed(7, None, random.Random())
+
+    def test_seeded_managers_seed_every_game(self):
+        seeds = [get_game_seed(None, 1, random.Random(1)) for _ in range(2)]
+        assert seeds[0] is not None
+        assert seeds[0] == seeds[1]
+
+    def test_games_of_unseeded_managers_pick_their_own_seed(self):
+        assert get_game_seed(None, None, random.Random()) is None
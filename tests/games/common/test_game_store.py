@@ -0,0 +1,263 @@
+import multiprocessing
+import threading
+from collections import Counter
+
+import pytest
+
+from application.games.common.game_store import GameStore, InMemoryGameStore, SqliteGameStore
+from application.games.crosswordcreator.data.game_manager import CrosswordCreatorGameManager
+from application.games.scrambledwords.data.game_manager import ScrambledWordsGameManager
+from application.games.scrambledwords.data.scoring_type import ScoringType
+from .accepting_word_manager import AcceptingWordManager
+from ..scrambledwords.board_word_manager import create_board_word_manager
+from .test_game_registry import FakeClock
+
+TILES = list("saberjttsxzzzzzszzzzzzzzz")
+WORDS = ["set", "sat", "state", "states", "bet", "best", "tab", "stab", "zzz", "not on board"]
+PLAYERS_PER_WORKER = 3
+
+
+class Game:
+    def __init__(self, value: int):
+        self.lock = threading.RLock()
+        self.value = value
+
+    def __getstate__(self):
+        return {"value": self.value}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+
+
+class IncompleteGameStore(GameStore):
+    def get(self, game_name: str):
+        return None
+
+
+def test_incomplete_game_store_cannot_be_created():
+    with pytest.raises(TypeError):
+        IncompleteGameStore()
+
+
+class TestInMemoryGameStore:
+    def test_add_does_not_replace_games(self):
+        store = InMemoryGameStore()
+        assert store.add("A", Game(1))
+        assert not store.add("A", Game(2))
+        assert 1 == store.get("A").value
+
+        store.replace("A", Game(3))
+        assert 3 == store.get("A").value
+
+    def test_update_changes_the_stored_game(self):
+        store = InMemoryGameStore()
+        game = Game(1)
+        store.add("A", game)
+
+        with store.update("A") as updated_game:
+            assert updated_game is game
+            updated_game.value = 2
+
+        assert 2 == store.get("A").value
+
+    def test_update_of_missing_game(self):
+        with InMemoryGameStore().update("A") as game:
+            assert game is None
+
+
+class TestSqliteGameStore:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.evicted = []
+        self.loaded = []
+
+    def _create_store(self, database_path: str) -> SqliteGameStore:
+        return SqliteGameStore(
+            database_path,
+            "games",
+            idle_timeout_seconds=10,
+            on_evict=lambda game_name, game: self.evicted.append((game_name, game.value)),
+            on_load=self.loaded.append,
+            clock=self.clock,
+        )
+
+    def test_add_and_get(self, tmp_path):
+        store = self._create_store(str(tmp_path / "games.db"))
+        store.add("A", Game(1))
+
+        assert "A" in store
+        assert "B" not in store
+        assert 1 == store.get("A").value
+        assert store.get("B") is None
+        assert 1 == len(store)
+        assert 1 == len(self.loaded)
+
+    def test_add_does_not_replace_games(self, tmp_path):
+        database_path = str(tmp_path / "games.db")
+        store = self._create_store(database_path)
+        other_store = self._create_store(database_path)
+        assert store.add("A", Game(1))
+        assert not other_store.add("A", Game(2))
+        assert 1 == store.get("A").value
+
+        other_store.replace("A", Game(3))
+        assert 3 == store.get("A").value
+
+    def test_reads_are_not_activity(self, tmp_path):
+        store = self._create_store(str(tmp_path / "games.db"))
+        store.add("A", Game(1))
+        store.add("B", Game(2))
+
+        self.clock.time = 5
+        store.get("A")
+        with store.update("B"):
+            pass
+
+        self.clock.time = 11
+        store.evict_idle_games()
+        assert "A" not in store
+        assert "B" in store
+
+    def test_stores_share_games(self, tmp_path):
+        database_path = str(tmp_path / "games.db")
+        store = self._create_store(database_path)
+        other_store = self._create_store(database_path)
+        store.add("A", Game(1))
+
+        with other_store.update("A") as game:
+            game.value = 2
+
+        assert 2 == store.get("A").value
+
+    def test_update_rolls_back_on_error(self, tmp_path):
+        store = self._create_store(str(tmp_path / "games.db"))
+        store.add("A", Game(1))
+
+        with pytest.raises(ValueError):
+            with store.update("A") as game:
+                game.value = 2
+                raise ValueError()
+
+        assert 1 == store.get("A").value
+
+    def test_update_of_missing_game(self, tmp_path):
+        with self._create_store(str(tmp_path / "games.db")).update("A") as game:
+            assert game is None
+
+    def test_remove(self, tmp_path):
+        store = self._create_store(str(tmp_path / "games.db"))
+        store.add("A", Game(1))
+
+        assert 1 == store.remove("A").value
+        assert store.remove("A") is None
+        assert 0 == len(store)
+
+    def test_idle_eviction(self, tmp_path):
+        store = self._create_store(str(tmp_path / "games.db"))
+        store.add("A", Game(1))
+        self.clock.time = 5
+        store.add("B", Game(2))
+
+        self.clock.time = 11
+        store.add("C", Game(3))
+
+        assert "A" not in store
+        assert "B" in store
+        assert [("A", 1)] == self.evicted
+        assert {"live_games": 2, "idle_evictions": 1, "capacity_evictions": 0} == store.get_metrics()
+
+
+class TestSharedGameStore:
+    def test_game_survives_round_trip(self, tmp_path):
+        word_manager = AcceptingWordManager()
+        manager = CrosswordCreatorGameManager(word_manager, seed=1, game_store_path=str(tmp_path / "games.db"))
+        game_name = manager.create_game().game_name
+        with manager.update_game_state(game_name) as game_state:
+            game_state.new_player("player1", "Player 1")
+            game_state.start_game()
+            game_state.add_tile("player1", 0, (3, 4))
+
+        game_state = manager.get_game_state(game_name)
+        assert word_manager is game_state.word_manager
+        assert word_manager is game_state.player_ids_to_boards["player1"].word_manager
+        assert 1 == len(game_state.player_ids_to_boards["player1"].tiles)
+
+    def test_workers_allocate_different_names(self, tmp_path):
+        database_path = str(tmp_path / "games.db")
+        # Managers with the same seed would pick the same names if they did not check the shared store
+        manager = CrosswordCreatorGameManager(AcceptingWordManager(), seed=1, game_store_path=database_path)
+        other_manager = CrosswordCreatorGameManager(AcceptingWordManager(), seed=1, game_store_path=database_path)
+
+        game_names = {manager.create_game().game_name for _ in range(5)}
+        game_names |= {other_manager.create_game().game_name for _ in range(5)}
+
+        assert 10 == len(game_names)
+        # Names the other worker found taken are not kept as in use by it
+        assert 5 == len(other_manager.name_allocator.names_in_use)
+
+    def test_workers_do_not_replace_each_others_games(self, tmp_path):
+        database_path = str(tmp_path / "games.db")
+        manager = ScrambledWordsGameManager(create_board_word_manager(), seed=1, game_store_path=database_path)
+        other_manager = ScrambledWordsGameManager(create_board_word_manager(), seed=2, game_store_path=database_path)
+
+        game_state = manager.create_game_for_name("ROOM", ScoringType.CLASSIC)
+        assert other_manager.create_game_for_name("ROOM", ScoringType.CLASSIC) is None
+        assert "ROOM" not in other_manager.name_allocator.names_in_use
+        assert game_state.seed == other_manager.get_game_state("ROOM").seed
+
+    def test_workers_sharing_games_have_no_global_leaderboard(self, tmp_path):
+        database_path = str(tmp_path / "games.db")
+        manager = ScrambledWordsGameManager(create_board_word_manager(), seed=1, game_store_path=database_path)
+        assert manager.leaderboard is None
+        assert manager.create_game().leaderboard is None
+
+    def test_two_workers_guess_in_the_same_room(self, tmp_path):
+        database_path = str(tmp_path / "games.db")
+        manager = ScrambledWordsGameManager(create_board_word_manager(), seed=1, game_store_path=database_path)
+        game_name = manager.create_game().game_name
+        with manager.update_game_state(game_name) as game_state:
+            game_state.new_board(tiles=TILES)
+
+        # Spawned workers share nothing with this process but the database, like separate server processes
+        context = multiprocessing.get_context("spawn")
+        start = context.Barrier(2)
+        results = context.Queue()
+        workers = [
+            context.Process(target=_play, args=(database_path, game_name, worker_id, start, results))
+            for worker_id in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        accepted_guesses = {}
+        for _ in workers:
+            accepted_guesses.update(results.get(timeout=60))
+        for worker in workers:
+            worker.join(timeout=60)
+            assert 0 == worker.exitcode
+
+        game_state = manager.get_game_state(game_name)
+        expected_counter = Counter()
+        for player_id, words in accepted_guesses.items():
+            assert words == game_state.valid_guesses.get(player_id, set())
+            expected_counter.update(words)
+        assert expected_counter == game_state.word_counter
+        assert 2 * PLAYERS_PER_WORKER == len(game_state.player_ids_to_names)
+
+
+def _play(database_path: str, game_name: str, worker_id: int, start, results):
+    manager = ScrambledWordsGameManager(create_board_word_manager(), seed=1, game_store_path=database_path)
+    player_ids = [f"worker{worker_id}-player{i}" for i in range(PLAYERS_PER_WORKER)]
+    accepted_guesses = {player_id: set() for player_id in player_ids}
+
+    start.wait()
+    for player_id in player_ids:
+        with manager.update_game_state(game_name) as game_state:
+            game_state.new_player(player_id, player_id)
+    for word in WORDS:
+        for player_id in player_ids:
+            with manager.update_game_state(game_name) as game_state:
+                if game_state.guess_word(player_id, word) is not None:
+                    accepted_guesses[player_id].add(word)
+
+    results.put(accepted_guesses)
@@ -0,0 +1,29 @@
+import random
+from collections import Counter
+
+from application.games.common.letter_distribution import LetterDistribution
+
+
+class TestLetterDistribution:
+    def setup_method(self):
+        self.letter_distribution = LetterDistribution({"a": 3, "b": 1, "c": 2})
+
+    def test_sample(self):
+        letters = self.letter_distribution.sample(6000, random.Random(0))
+        counts = Counter(letters)
+
+        assert 6000 == len(letters)
+        assert {"a", "b", "c"} == set(counts)
+        assert counts["a"] > counts["c"] > counts["b"]
+
+    def test_seeded_samples_repeat(self):
+        assert self.letter_distribution.sample(25, random.Random(1)) == self.letter_distribution.sample(
+            25, random.Random(1)
+        )
+
+    def test_get_counts(self):
+        assert Counter({"a": 3, "b": 1, "c": 2}) == self.letter_distribution.get_counts(6)
+
+        counts = self.letter_distribution.get_counts(10)
+        assert 10 == sum(counts.values())
+        assert counts["a"] == 5
@@ -0,0 +1,112 @@
+import time
+
+from application.games.common.database import SqliteResultsSink
+from application.games.common.results_writer import ResultsWriter
+from .recording_results_sink import RecordingSink
+
+
+class TestResultsWriter:
+    def setup_method(self):
+        self.sink = RecordingSink()
+
+    def test_close_writes_queued_results_in_one_batch_per_collection(self):
+        writer = ResultsWriter(self.sink, batch_size=10, flush_interval_seconds=60)
+        writer.start()
+        writer.record("rounds", "a", {"value": 1})
+        writer.record("scores", "b", {"value": 2})
+        writer.record("rounds", "c", {"value": 3})
+        writer.close()
+
+        assert [
+            ("rounds", {"a": {"value": 1}, "c": {"value": 3}}),
+            ("scores", {"b": {"value": 2}}),
+        ] == self.sink.writes
+        assert 3 == writer.get_metrics()["written_results"]
+
+    def test_batch_is_written_once_full(self):
+        writer = ResultsWriter(self.sink, batch_size=2, flush_interval_seconds=60)
+        writer.start()
+        writer.record("rounds", "a", {})
+        writer.record("rounds", "b", {})
+        writer.record("rounds", "c", {})
+
+        # Only the full batch can be written before the flush interval passes
+        self._wait_for(lambda: len(self.sink.writes) == 1)
+        assert {"a", "b"} == set(self.sink.writes[0][1])
+        writer.close()
+        assert {"c"} == set(self.sink.writes[1][1])
+
+    def test_partial_batch_is_written_after_flush_interval(self):
+        writer = ResultsWriter(self.sink, batch_size=100, flush_interval_seconds=0.01)
+        writer.start()
+        writer.record("rounds", "a", {})
+
+        self._wait_for(lambda: len(self.sink.writes) == 1)
+        writer.close()
+
+    def test_results_are_dropped_when_queue_is_full(self):
+        # Hold up the worker so that results pile up in the queue
+        self.sink.release.clear()
+        writer = ResultsWriter(self.sink, max_queued_results=2, batch_size=1, block_seconds=0)
+        writer.start()
+        writer.record("rounds", "a", {})
+        self._wait_for(lambda: writer.results.empty())
+
+        assert writer.record("rounds", "b", {})
+        assert writer.record("rounds", "c", {})
+        assert not writer.record("rounds", "d", {})
+
+        self.sink.release.set()
+        writer.close()
+        assert ["a", "b", "c"] == [key for _, documents in self.sink.writes for key in documents]
+        assert {"queued_results": 0, "written_results": 3, "dropped_results": 1, "failed_results": 0} == (
+            writer.get_metrics()
+        )
+
+    def test_failed_writes_do_not_stop_the_writer(self):
+        self.sink.fail = True
+        writer = ResultsWriter(self.sink, batch_size=1)
+        writer.start()
+        writer.record("rounds", "a", {})
+        self._wait_for(lambda: writer.get_metrics()["failed_results"] == 1)
+
+        self.sink.fail = False
+        writer.record("rounds", "b", {})
+        writer.close()
+        assert [("rounds", {"b": {}})] == self.sink.writes
+
+    def test_close_without_worker_writes_queued_results(self):
+        writer = ResultsWriter(self.sink)
+        writer.record("rounds", "a", {})
+        writer.close()
+
+        assert [("rounds", {"a": {}})] == self.sink.writes
+
+    @staticmethod
+    def _wait_for(condition):
+        for _ in range(500):
+            if condition():
+                return
+            time.sleep(0.01)
+        assert condition()
+
+
+class TestSqliteResultsSink:
+    def test_write_replaces_results_with_the_same_key(self, tmp_path):
+        sink = SqliteResultsSink(str(tmp_path / "results.db"))
+        sink.write("rounds", {"a": {"value": 1}, "b": {"value": 2}})
+        sink.write("rounds", {"a": {"value": 3}})
+        sink.write("scores", {"a": {"value": 4}})
+
+        assert [{"value": 3}, {"value": 2}] == sink.find("rounds")
+        assert [{"value": 4}] == sink.find("scores")
+        assert {"value": 3} == sink.find_one("rounds", "a")
+        assert sink.find_one("rounds", "c") is None
+
+    def test_writer_reads_back_results(self, tmp_path):
+        writer = ResultsWriter(SqliteResultsSink(str(tmp_path / "results.db")))
+        writer.record("rounds", "a", {"value": 1})
+        writer.close()
+
+        assert {"value": 1} == writer.find("rounds", "a")
+        assert writer.find("rounds", "b") is None
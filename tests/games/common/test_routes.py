@@ -0,0 +1,28 @@
+from flask import Flask
+
+from application.games.common import common_blueprint
+from application.games.common.game_store import InMemoryGameStore
+from application.games.common.routes import GAME_STORES_CONFIG_KEY
+from .test_game_registry import FakeClock
+
+
+class TestRoutes:
+    def test_health_reports_game_metrics(self, monkeypatch):
+        monkeypatch.delenv("MONGO_HOST", raising=False)
+        clock = FakeClock()
+        game_store = InMemoryGameStore(idle_timeout_seconds=10, clock=clock)
+        game_store.add("A", 1)
+        clock.time = 11
+        game_store.add("B", 2)
+        game_store.evict_idle_games()
+
+        app = Flask(__name__)
+        app.register_blueprint(common_blueprint, url_prefix="/")
+        app.config[GAME_STORES_CONFIG_KEY] = {"scrambled_words": game_store}
+
+        response = app.test_client().get("/health")
+        assert 200 == response.status_code
+        assert {
+            "healthy": True,
+            "games": {"scrambled_words": {"live_games": 1, "idle_evictions": 1, "capacity_evictions": 0}},
+        } == response.get_json()
@@ -0,0 +1,68 @@
+import threading
+
+from application.games.common.scheduler import Scheduler
+from .test_game_registry import FakeClock
+
+
+class TestScheduler:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.scheduler = Scheduler(clock=self.clock)
+        self.calls = []
+
+    def test_run_pending_runs_due_tasks_in_order(self):
+        self.scheduler.schedule(10, lambda: self.calls.append("b"))
+        self.scheduler.schedule(5, lambda: self.calls.append("a"))
+        self.scheduler.schedule(10, lambda: self.calls.append("c"))
+
+        assert 0 == self.scheduler.run_pending()
+
+        self.clock.time = 5
+        assert 1 == self.scheduler.run_pending()
+        assert ["a"] == self.calls
+
+        self.clock.time = 20
+        assert 2 == self.scheduler.run_pending()
+        assert ["a", "b", "c"] == self.calls
+        assert 0 == self.scheduler.pending_tasks()
+
+    def test_cancel(self):
+        task = self.scheduler.schedule(5, lambda: self.calls.append("a"))
+        self.scheduler.schedule(5, lambda: self.calls.append("b"))
+        task.cancel()
+        assert 1 == self.scheduler.pending_tasks()
+
+        self.clock.time = 5
+        assert 1 == self.scheduler.run_pending()
+        assert ["b"] == self.calls
+
+    def test_cancel_after_run(self):
+        task = self.scheduler.schedule(0, lambda: self.calls.append("a"))
+        self.scheduler.run_pending()
+        task.cancel()
+
+        assert ["a"] == self.calls
+        assert 0 == self.scheduler.pending_tasks()
+
+    def test_cancelled_tasks_are_cleaned_up(self):
+        for _ in range(100):
+            self.scheduler.schedule(60, lambda: None).cancel()
+
+        assert len(self.scheduler.tasks) <= 1
+
+    def test_failing_callback_does_not_stop_others(self):
+        self.scheduler.schedule(0, lambda: 1 / 0)
+        self.scheduler.schedule(0, lambda: self.calls.append("a"))
+
+        assert 2 == self.scheduler.run_pending()
+        assert ["a"] == self.calls
+
+    def test_background_thread(self):
+        scheduler = Scheduler()
+        scheduler.start()
+        event = threading.Event()
+
+        scheduler.schedule(60, lambda: None)
+        scheduler.schedule(0.01, event.set)
+
+        assert event.wait(5)
@@ -1,4 +1,6 @@
-from application.games.common.word_manager import WordManager
+import random
+
+from application.games.common.word_manager import FilteredWordManager, WordManager
 
 TEST_WORD_SET = {"test", "DOG", "Cat"}
 
@@ -35,3 +37,84 @@ class TestWordManager:
         assert len(random_words) == num_words
         for random_word in random_words:
             assert self.word_manager.is_word(random_word)
+
+    def test_get_random_words_seeded(self):
+        random_words = self.word_manager.get_random_words(2, random.Random(5))
+        assert random_words == self.word_manager.get_random_words(2, random.Random(5))
+        # Seeded samples do not depend on the order the words were given in
+        assert random_words == WordManager(words={"Cat", "test", "DOG"}).get_random_words(2, random.Random(5))
+
+    def test_are_words(self):
+        assert self.word_manager.are_words(["test", "abc", "Cat", "cats"]) == [True, False, True, False]
+        assert self.word_manager.are_words([]) == []
+
+    def test_has_word(self):
+        assert self.word_manager.has_word("test") is True
+        assert self.word_manager.has_word("Dog") is True
+        assert self.word_manager.has_word("tes") is False
+        assert self.word_manager.has_word("zebra") is False
+
+    def test_is_prefix(self):
+        assert self.word_manager.is_prefix("") is True
+        assert self.word_manager.is_prefix("t") is True
+        assert self.word_manager.is_prefix("Ca") is True
+        assert self.word_manager.is_prefix("cat") is True
+        assert self.word_manager.is_prefix("cats") is False
+        assert self.word_manager.is_prefix("do") is True
+        assert self.word_manager.is_prefix("e") is False
+
+    def test_iter_words_with_prefix(self):
+        word_manager = WordManager(words={"car", "cart", "cat", "dog", "ca"})
+        assert list(word_manager.iter_words_with_prefix("ca")) == ["CA", "CAR", "CART", "CAT"]
+        assert list(word_manager.iter_words_with_prefix("car")) == ["CAR", "CART"]
+        assert list(word_manager.iter_words_with_prefix("x")) == []
+
+    def test_get_prefix_range(self):
+        word_manager = WordManager(words={"car", "cart", "cat", "dog", "ca"})
+        prefix_index = word_manager.get_prefix_index()
+
+        assert (0, 4) == prefix_index.get_prefix_range("CA")
+        assert (1, 3) == prefix_index.get_prefix_range("CAR", 0, 4)
+        start, end = prefix_index.get_prefix_range("CAX")
+        assert start == end
+        assert (1, 3) == word_manager.get_prefix_range("car")
+
+
+class TestFilteredWordManager:
+    def setup_method(self):
+        self.base_word_manager = WordManager(words={"car", "cart", "cat", "dog", "ca"})
+        self.word_manager = FilteredWordManager(self.base_word_manager, {"cart", "ca"})
+
+    def test_is_word(self):
+        assert self.word_manager.is_word("car")
+        assert self.word_manager.is_word("DOG")
+        assert not self.word_manager.is_word("cart")
+        assert not self.word_manager.is_word("ca")
+        assert self.base_word_manager.is_word("cart")
+
+    def test_num_words(self):
+        assert 3 == self.word_manager.num_words()
+
+    def test_words_skip_removed_words(self):
+        assert ["CAR", "CAT", "DOG"] == list(self.word_manager.words)
+        assert ["CAR", "CAT", "DOG"] == [self.word_manager.words[index] for index in range(3)]
+        assert "DOG" == self.word_manager.words[-1]
+        assert {"CAR", "CAT", "DOG"} == set(self.word_manager.word_set)
+        assert "CAT" in self.word_manager.word_set
+        assert "CART" not in self.word_manager.word_set
+        assert 3 == len(self.word_manager.word_set)
+
+    def test_get_random_words(self):
+        random_words = self.word_manager.get_random_words(3)
+        assert {"CAR", "CAT", "DOG"} == set(random_words)
+
+        assert self.word_manager.get_random_words(2, random.Random(5)) == self.word_manager.get_random_words(
+            2, random.Random(5)
+        )
+
+    def test_prefix_queries(self):
+        assert ["CAR", "CAT"] == list(self.word_manager.iter_words_with_prefix("ca"))
+        assert self.word_manager.is_prefix("ca")
+        assert not self.word_manager.is_prefix("cart")
+        assert self.word_manager.has_word("car")
+        assert not self.word_manager.has_word("ca")
@@ -0,0 +1,36 @@
+from application.games.common.word_manager import FilteredWordManager, get_word_file_location, iter_file_words
+from application.games.common.word_manager_registry import WordManagerRegistry
+
+SCRAMBLED_WORDS_WORD_FILE = "scrambledwords/words.txt"
+CROSSWORD_CREATOR_WORD_FILE = "crosswordcreator/words.txt"
+HIDDEN_NAMES_WORD_FILE = "hiddennames/words.txt"
+
+
+class TestWordManagerRegistry:
+    def test_subset_dictionary_is_shared(self):
+        registry = WordManagerRegistry()
+        registry.load_word_files([SCRAMBLED_WORDS_WORD_FILE, CROSSWORD_CREATOR_WORD_FILE, HIDDEN_NAMES_WORD_FILE])
+
+        crossword_creator_word_manager = registry.get_word_manager(CROSSWORD_CREATOR_WORD_FILE)
+        scrambled_words_word_manager = registry.get_word_manager(SCRAMBLED_WORDS_WORD_FILE)
+        hidden_names_word_manager = registry.get_word_manager(HIDDEN_NAMES_WORD_FILE)
+
+        assert isinstance(scrambled_words_word_manager, FilteredWordManager)
+        assert crossword_creator_word_manager is scrambled_words_word_manager.base_word_manager
+        assert not isinstance(hidden_names_word_manager, FilteredWordManager)
+
+        # The Crossword Creator dictionary has two letter words that Scrambled Words does not
+        assert crossword_creator_word_manager.is_word("ab")
+        assert not scrambled_words_word_manager.is_word("ab")
+        assert scrambled_words_word_manager.is_word("aardvark")
+        # The filtered view holds exactly the words of its own file
+        with open(get_word_file_location(SCRAMBLED_WORDS_WORD_FILE), mode="rb") as word_file:
+            assert list(iter_file_words(word_file.read())) == list(scrambled_words_word_manager.words)
+
+    def test_identical_dictionary_is_shared(self):
+        registry = WordManagerRegistry()
+
+        word_manager = registry.get_word_manager(HIDDEN_NAMES_WORD_FILE)
+        assert word_manager is registry.get_word_manager(HIDDEN_NAMES_WORD_FILE)
+        with open(get_word_file_location(HIDDEN_NAMES_WORD_FILE), mode="rb") as word_file:
+            assert word_manager is registry._share("copy/words.txt", word_file.read())
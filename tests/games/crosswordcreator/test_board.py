@@ -1,3 +1,6 @@
+import copy
+import random
+
 from application.games.common.word_manager import WordManager
 from application.games.crosswordcreator.data.board import Board
 
@@ -65,6 +68,40 @@ class TestBoard:
         # Invalid because not all tiles are connected
         assert {(4, 2), (4, 3), (4, 4)} == invalid_points
 
+    def test_empty_board(self):
+        board = Board("test", 5, WordManager({"dad"}))
+
+        assert set() == board.board_is_valid_crossword()
+        assert [] == board.get_component_sizes()
+
+    def test_connected_components(self):
+        tiles = [
+            ["d", None, "b", "a", "d"],
+            ["a", None, "a", "s", None],
+            ["d", "a", "d", None, None],
+            [None, None, None, None, "a"],
+            ["d", "a", "d", None, "s"],
+        ]
+
+        board = Board("test", 5, WordManager({"dad", "bad", "as"}))
+        board._set_board(tiles)
+
+        assert [10, 2, 3] == board.get_component_sizes()
+        assert {(3, 4), (4, 4), (4, 0), (4, 1), (4, 2)} == board._check_connected()
+
+    def test_long_snake_is_connected(self):
+        # A snake through every row of a large board is far longer than the recursion limit
+        board_size = 200
+        board = Board("test", board_size, WordManager({"a"}))
+        for row in range(0, board_size, 2):
+            for col in range(board_size):
+                board.add_tile("a", row, col)
+            if row + 1 < board_size:
+                board.add_tile("a", row + 1, board_size - 1 if (row // 2) % 2 == 0 else 0)
+
+        assert set() == board._check_connected()
+        assert [board_size * board_size // 2 + board_size // 2] == board.get_component_sizes()
+
     def test_shift_down_valid(self):
         tiles = [
             ["d", None, "b", "a", "d"],
@@ -223,3 +260,88 @@ class TestBoard:
 
         # Tiles should not have moved
         assert tiles == board.board
+
+    def test_incremental_validation_matches_full_validation(self):
+        word_manager = WordManager({"dads", "dad", "bad", "as", "ad", "add", "sad", "a"})
+        board = Board("test", 6, word_manager)
+        rng = random.Random(0)
+
+        for _ in range(500):
+            action = rng.randrange(6)
+            if action == 0:
+                board.remove_tile(rng.randrange(6), rng.randrange(6))
+            elif action == 1:
+                board.shift_board_up()
+            elif action == 2:
+                board.shift_board_down()
+            elif action == 3:
+                board.shift_board_left()
+            elif action == 4:
+                board.shift_board_right()
+            else:
+                board.add_tile(rng.choice("abds"), rng.randrange(6), rng.randrange(6))
+
+            full_board = Board("test", 6, word_manager)
+            full_board._set_board(copy.deepcopy(board.board))
+            assert full_board._check_valid_words() == board._check_valid_words()
+            assert _full_scan_invalid_points(board.board, word_manager) == board._check_valid_words()
+
+    def test_bounding_box(self):
+        board = Board("test", 5, WordManager({"dad"}))
+        assert board.get_bounding_box() is None
+
+        board.add_tile("d", 1, 2)
+        board.add_tile("a", 3, 1)
+        assert (1, 1, 3, 2) == board.get_bounding_box()
+
+        board.remove_tile(3, 1)
+        assert (1, 2, 1, 2) == board.get_bounding_box()
+
+        board.shift_board_right()
+        assert (1, 3, 1, 3) == board.get_bounding_box()
+
+    def test_get_json(self):
+        board = Board("test", 5, WordManager({"dad"}))
+        board.add_tile("d", 1, 2)
+
+        assert {"board_size": 5, "tiles": [[1, 2, "d"]]} == board.get_json()
+
+    def test_shift_keeps_tiles_in_place(self):
+        board = Board("test", 5, WordManager({"dad"}))
+        board.add_tile("d", 1, 1)
+        board.add_tile("a", 1, 2)
+        board.add_tile("d", 1, 3)
+        assert not board.board_is_valid_crossword()
+        stored_tiles = dict(board.tiles)
+
+        assert board.shift_board_down()
+        assert board.shift_board_left()
+        assert stored_tiles == board.tiles
+        assert {"board_size": 5, "tiles": [[2, 0, "d"], [2, 1, "a"], [2, 2, "d"]]} == board.get_json()
+
+        # Points given to the board after a shift are points on the board
+        assert "a" == board.remove_tile(2, 1)
+        board.add_tile("a", 2, 1)
+        assert not board.board_is_valid_crossword()
+
+
+def _full_scan_invalid_points(tiles, word_manager):
+    # Checks every row and column of the board in full for comparison with the cached checks
+    board_size = len(tiles)
+    invalid_points = set()
+    for line_index in range(board_size):
+        for points in (
+            [(line_index, i) for i in range(board_size)],
+            [(i, line_index) for i in range(board_size)],
+        ):
+            current_points = []
+            for point in points + [None]:
+                if (point is None) or (tiles[point[0]][point[1]] is None):
+                    word = "".join(tiles[row][col] for row, col in current_points)
+                    reaches_edge = point is None
+                    if (len(word) > 1 or reaches_edge) and not word_manager.is_word(word):
+                        invalid_points.update(current_points)
+                    current_points = []
+                else:
+                    current_points.append(point)
+    return invalid_points
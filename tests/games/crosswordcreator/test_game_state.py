@@ -0,0 +1,185 @@
+import json
+import random
+import threading
+
+from application.games.common.results_writer import ResultsWriter
+from application.games.crosswordcreator.data.game_state import TILES_PER_PLAYER, WINNERS_COLLECTION, GameState
+from ..common.accepting_word_manager import AcceptingWordManager
+from ..common.recording_results_sink import RecordingSink
+
+
+class TestGameState:
+    def setup_method(self):
+        self.game_state = GameState("test", AcceptingWordManager())
+        self.game_state.new_player("player", "Player")
+        self.game_state.new_player("other", "Other")
+        self.game_state.start_game()
+
+    def test_patches_match_full_state(self):
+        client = _Client(self.game_state.get_game_state("player"))
+        rng = random.Random(0)
+
+        for _ in range(300):
+            action = rng.randrange(4)
+            hand = self.game_state.player_ids_to_tiles["player"]
+            position = (rng.randrange(10, 15), rng.randrange(10, 15))
+            if action == 0 and hand:
+                patch = self.game_state.add_tile("player", rng.randrange(len(hand)), position)
+            elif action == 1:
+                patch = self.game_state.remove_tile("player", position)
+            elif action == 2:
+                patch = self.game_state.shift_board("player", rng.choice(["up", "down", "left", "right"]))
+            elif hand and self.game_state.tiles_left >= 3:
+                patch = self.game_state.exchange_tile("player", rng.randrange(len(hand)))
+            else:
+                continue
+
+            if patch:
+                assert client.apply_patch(patch)
+            assert client.get_state() == _Client(self.game_state.get_game_state("player")).get_state()
+
+    def test_patch_is_smaller_than_full_state(self):
+        patch = self.game_state.add_tile("player", 0, (12, 12))
+        full_state = self.game_state.get_game_state("player")
+
+        assert len(json.dumps(patch)) < len(json.dumps(full_state))
+
+    def test_version_gap_after_peel(self):
+        client = _Client(self.game_state.get_game_state("other"))
+
+        # Another player peeling changes our hand without sending us a patch
+        assert not self.game_state.peel("player")
+        patch = self.game_state.add_tile("other", 0, (12, 12))
+
+        assert not client.apply_patch(patch)
+        client = _Client(self.game_state.get_game_state("other"))
+        assert client.apply_patch(self.game_state.shift_board("other", "up"))
+
+    def test_exchange_returns_tile_to_bag(self):
+        tiles_left = self.game_state.tiles_left
+        hand_size = len(self.game_state.player_ids_to_tiles["player"])
+
+        self.game_state.exchange_tile("player", 0)
+
+        assert tiles_left - 2 == self.game_state.tiles_left
+        assert hand_size + 2 == len(self.game_state.player_ids_to_tiles["player"])
+
+    def test_peel_ends_game_when_bag_runs_out(self):
+        # Two players share a bag of 80 tiles and are dealt 20 each
+        assert 40 == self.game_state.tiles_left
+
+        for _ in range(20):
+            assert not self.game_state.peel("player")
+        assert 0 == self.game_state.tiles_left
+        assert self.game_state.game_running
+
+        assert not self.game_state.peel("other")
+        assert not self.game_state.game_running
+        assert "other" == self.game_state.winning_player_id
+
+    def test_winner_is_recorded(self):
+        sink = RecordingSink()
+        results_writer = ResultsWriter(sink)
+        game_state = GameState("test", AcceptingWordManager(), seed=5, results_writer=results_writer)
+        game_state.new_player("player", "Player")
+        game_state.start_game()
+        while game_state.game_running:
+            game_state.peel("player")
+        results_writer.close()
+
+        [(collection, documents)] = sink.writes
+        assert WINNERS_COLLECTION == collection
+        assert {
+            "test": {
+                "game_name": "test",
+                "seed": "5",
+                "winning_player_id": "player",
+                "winning_player_name": "Player",
+                "player_ids": ["player"],
+            }
+        } == documents
+
+    def test_seeded_games_deal_the_same_tiles(self):
+        game_states = [GameState("test", AcceptingWordManager(), seed=7) for _ in range(2)]
+        for game_state in game_states:
+            game_state.new_player("player", "Player")
+            game_state.start_game()
+            game_state.exchange_tile("player", 0)
+
+        assert game_states[0].player_ids_to_tiles == game_states[1].player_ids_to_tiles
+
+    def test_concurrent_moves_keep_every_tile(self):
+        game_state = GameState("test", AcceptingWordManager(), seed=3)
+        player_ids = [f"player{i}" for i in range(8)]
+        for player_id in player_ids:
+            game_state.new_player(player_id, player_id)
+        game_state.start_game()
+
+        def play(player_id: str):
+            rng = random.Random(player_id)
+            for _ in range(300):
+                hand = game_state.player_ids_to_tiles[player_id]
+                action = rng.randrange(4)
+                try:
+                    if action == 0:
+                        game_state.add_tile(player_id, rng.randrange(len(hand)), (12, rng.randrange(10, 15)))
+                    elif action == 1:
+                        game_state.remove_tile(player_id, (12, rng.randrange(10, 15)))
+                    elif action == 2:
+                        game_state.exchange_tile(player_id, rng.randrange(len(hand)))
+                    else:
+                        game_state.peel(player_id)
+                except (ValueError, IndexError):
+                    # Empty hands, an empty bag and peeling after the game is over are all expected
+                    pass
+
+        threads = [threading.Thread(target=play, args=(player_id,)) for player_id in player_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        tiles_in_hands = sum(len(hand) for hand in game_state.player_ids_to_tiles.values())
+        tiles_on_boards = sum(len(board.tiles) for board in game_state.player_ids_to_boards.values())
+        assert TILES_PER_PLAYER * len(player_ids) == tiles_in_hands + tiles_on_boards + game_state.tiles_left
+
+    def test_failed_shift_has_no_patch(self):
+        self.game_state.add_tile("player", 0, (0, 0))
+
+        assert self.game_state.shift_board("player", "up") is None
+        assert self.game_state.shift_board("player", "down") is not None
+
+
+class _Client:
+    """
+    Applies patches the same way the browser does.
+    """
+
+    def __init__(self, game_state):
+        self.version = game_state["version"]
+        player_data = next(iter(game_state["players"].values()))
+        self.tiles = {(row, col): tile for row, col, tile in player_data["tiles"]}
+        self.hand = list(player_data["hand_tiles"])
+        self.tiles_left = game_state["tiles_left"]
+
+    def apply_patch(self, patch) -> bool:
+        if patch["version"] != self.version + 1:
+            return False
+
+        self.version = patch["version"]
+        self.tiles_left = patch["tiles_left"]
+        if patch["shift"] is not None:
+            row_offset, col_offset = patch["shift"]
+            self.tiles = {(row + row_offset, col + col_offset): tile for (row, col), tile in self.tiles.items()}
+        for row, col, tile in patch["tiles"]:
+            if tile is None:
+                self.tiles.pop((row, col), None)
+            else:
+                self.tiles[(row, col)] = tile
+        if patch["hand_removed_index"] is not None:
+            self.hand.pop(patch["hand_removed_index"])
+        self.hand.extend(patch["hand_added_tiles"])
+        return True
+
+    def get_state(self):
+        return self.version, self.tiles, self.hand, self.tiles_left
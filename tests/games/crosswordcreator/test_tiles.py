@@ -1,4 +1,9 @@
-from application.games.crosswordcreator.data.tiles import Tiles
+import random
+from collections import Counter
+
+import pytest
+
+from application.games.crosswordcreator.data.tiles import TileBag, Tiles
 
 
 class TestTiles:
@@ -8,3 +13,31 @@ class TestTiles:
         print(f"Tiles: {tiles}")
 
         assert len(tiles) == num_tiles
+
+
+class TestTileBag:
+    def test_draw_and_return(self):
+        bag = TileBag(80, random.Random(0))
+        starting_tiles = Counter(bag.tiles)
+
+        hands = bag.deal(3, 20)
+        assert [20, 20, 20] == [len(hand) for hand in hands]
+        assert 20 == len(bag)
+
+        bag.return_tile(hands[0][0])
+        assert 21 == len(bag)
+
+        drawn_tiles = hands[0][1:] + hands[1] + hands[2] + bag.draw_tiles(21)
+        assert starting_tiles == Counter(drawn_tiles)
+        assert 0 == len(bag)
+        assert 0 == sum(bag.counts.values())
+
+    def test_draw_too_many(self):
+        bag = TileBag(5)
+
+        with pytest.raises(ValueError):
+            bag.draw_tiles(6)
+        assert 5 == len(bag)
+
+    def test_seeded_draws_repeat(self):
+        assert TileBag(40, random.Random(1)).draw_tiles(10) == TileBag(40, random.Random(1)).draw_tiles(10)
@@ -0,0 +1,12 @@
+from application.games.common.word_manager import WordManager
+
+# Words on the board "saberjttsxzzzzzszzzzzzzzz" that the tests guess, along with words that are not on it
+BOARD_WORDS = {"set", "sat", "state", "states", "bet", "best", "tab", "stab", "saber", "zzz", "test", "armory"}
+
+
+def create_board_word_manager() -> WordManager:
+    """
+    Creates a word manager holding the words the tests guess.
+    Boards are solved against the word manager, so only words it holds are accepted as guesses.
+    """
+    return WordManager(BOARD_WORDS)
@@ -0,0 +1,53 @@
+from application.games.common.word_manager import WordManager
+from application.games.scrambledwords.data.board_generator import BoardGenerator
+from application.games.scrambledwords.data.game_state import GameState
+
+
+class TestBoardGenerator:
+    def setup_method(self):
+        self.word_manager = WordManager({"sea", "eat", "tea", "seat", "east", "teas", "aaa"})
+
+    def test_generate_board_meets_minimum(self):
+        board_generator = BoardGenerator(self.word_manager, min_words=1, min_points=1, time_budget_seconds=5)
+
+        tiles, solved_words = board_generator.generate_board()
+        assert len(tiles) == 25
+        assert len(solved_words) >= 1
+
+    def test_generate_board_time_budget(self):
+        # No board can have this many words so the generator should give up and return its best board
+        board_generator = BoardGenerator(self.word_manager, min_words=100, min_points=100, time_budget_seconds=0)
+
+        tiles, solved_words = board_generator.generate_board()
+        assert len(tiles) == 25
+        assert len(solved_words) < 100
+
+    def test_get_board_from_pool(self):
+        board_generator = BoardGenerator(self.word_manager, min_words=0, min_points=0)
+        tiles = ["a"] * 25
+        board_generator.board_pool.put((tiles, {"aaa": [0, 1, 2]}))
+
+        game_state = GameState("test", self.word_manager, None, game_timer=False, board_generator=board_generator)
+        game_state.new_board()
+
+        assert tiles == game_state.game_tiles
+        assert [0, 1, 2] == game_state.guess_word("player", "aaa")
+
+    def test_get_board_pool_empty(self):
+        board_generator = BoardGenerator(self.word_manager, min_words=0, min_points=0)
+
+        tiles, solved_words = board_generator.get_board()
+        assert len(tiles) == 25
+
+    def test_boards_are_generated_through_the_blocking_runner(self):
+        runs = []
+
+        def run_blocking(function):
+            runs.append(function)
+            return function()
+
+        board_generator = BoardGenerator(self.word_manager, min_words=0, min_points=0, run_blocking=run_blocking)
+        tiles, solved_words = board_generator.get_board()
+
+        assert len(tiles) == 25
+        assert [board_generator.generate_board] == runs
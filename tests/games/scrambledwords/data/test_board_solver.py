@@ -0,0 +1,51 @@
+from application.games.common.word_manager import FilteredWordManager, WordManager
+from application.games.scrambledwords.data.board_solver import BoardSolver, TILE_NEIGHBORS
+from application.games.scrambledwords.data.game_state import GameState
+
+
+class TestBoardSolver:
+    def setup_method(self):
+        # fmt: off
+        self.tiles = [
+            "s", "a", "b", "e", "r",
+            "j", "t", "t", "s", "x",
+            "z", "z", "z", "z", "z",
+            "s", "z", "z", "z", "z",
+            "z", "z", "z", "z", "z",
+        ]
+        # fmt: on
+        self.word_manager = WordManager({"set", "states", "saber", "best", "test", "jaba", "armory"})
+
+    def test_solve(self):
+        solved_words = BoardSolver.solve(self.tiles, self.word_manager)
+
+        assert {"set", "states", "saber", "best"} == set(solved_words.keys())
+        assert [0, 1, 2, 3, 4] == solved_words["saber"]
+
+    def test_solve_paths_are_valid(self):
+        solved_words = BoardSolver.solve(self.tiles, self.word_manager)
+
+        for word, path in solved_words.items():
+            assert word == "".join(self.tiles[tile_index] for tile_index in path)
+            assert len(set(path)) == len(path)
+            for i in range(1, len(path)):
+                assert path[i] in TILE_NEIGHBORS[path[i - 1]]
+
+    def test_guess_word_uses_solved_words(self):
+        game_state = GameState("test", self.word_manager, None, game_timer=False)
+        game_state.new_board(tiles=self.tiles)
+
+        assert game_state.solved_words["saber"] == game_state.guess_word("player", "saber")
+        assert game_state.guess_word("player", "test") is None
+        assert game_state.guess_word("player", "armory") is None
+
+        # The solved words are the answer, so a word missing from them is never searched for on the board
+        del game_state.solved_words["best"]
+        assert game_state._word_is_on_board("best") is not None
+        assert game_state.guess_word("player", "best") is None
+
+    def test_solve_filtered_word_manager(self):
+        word_manager = FilteredWordManager(self.word_manager, {"set", "states"})
+        solved_words = BoardSolver.solve(self.tiles, word_manager)
+
+        assert {"saber", "best"} == set(solved_words.keys())
@@ -1,14 +1,25 @@
 from typing import List
 
+from application.games.common.database import SqliteResultsSink
+from application.games.common.results_writer import ResultsWriter
 from application.games.common.word_manager import WordManager
-from application.games.scrambledwords.data.game_state import GameState
-from ...common.accepting_word_manager import AcceptingWordManager
+from application.games.scrambledwords.data.game_state import (
+    GameState,
+    ROUNDS_COLLECTION,
+    SCORES_COLLECTION,
+    TOTALS_COLLECTION,
+)
+from application.games.scrambledwords.data.game_manager import ScrambledWordsGameManager
+from application.games.scrambledwords.data.leaderboard import Leaderboard
+from application.games.scrambledwords.data.scoring_type import ScoringType
+from application.games.scrambledwords.util.time_util import get_time_millis
+from ..board_word_manager import create_board_word_manager
+from ...common.recording_results_sink import RecordingSink
 
 
 class TestGameState:
     def setup_method(self):
-        # Create a word manager that accepts any word
-        word_manager = AcceptingWordManager()
+        word_manager = create_board_word_manager()
 
         tiles = [
             "s", "a", "b", "e", "r",
@@ -53,6 +64,29 @@ class TestGameState:
         assert self.game_state._word_is_on_board("test") is None
         assert self.game_state._word_is_on_board("jaba") is None
 
+    def test_word_is_on_board_repeated_letters(self):
+        self.game_state.new_board(tiles=["e"] * 25)
+
+        path = self.game_state._word_is_on_board("e" * 25)
+        assert path is not None
+        assert sorted(path) == list(range(0, 25))
+        for i in range(1, len(path)):
+            assert GameState._tiles_are_neighbors(path[i - 1], path[i])
+
+        assert self.game_state._word_is_on_board("e" * 26) is None
+        assert self.game_state._word_is_on_board("e" * 5 + "s") is None
+
+    def test_word_is_on_board_failing_searches(self):
+        # Every letter is on the board, but the last two letters do not touch
+        self.game_state.new_board(tiles=["x"] + ["e"] * 23 + ["y"])
+        assert self.game_state._word_is_on_board("e" * 12 + "xy") is None
+        assert self.game_state._word_is_on_board("e" * 22 + "xy") is None
+
+        # A row of 'z' walls off 13 'e' tiles, which is one too few to trace the word
+        self.game_state.new_board(tiles=["x", "y"] + ["e"] * 13 + ["z"] * 5 + ["e"] * 5)
+        assert self.game_state._word_is_on_board("e" * 13 + "xy") is not None
+        assert self.game_state._word_is_on_board("e" * 14 + "xy") is None
+
     def test_tiles_are_neighbors_0(self):
         TestGameState._assert_neighbors(0, [1, 5, 6])
 
@@ -74,6 +108,185 @@ class TestGameState:
     def test_tiles_are_neighbors_24(self):
         TestGameState._assert_neighbors(24, [18, 19, 23])
 
+    def test_seeded_games_play_the_same_boards(self):
+        game_states = [GameState("test", create_board_word_manager(), None, game_timer=False, seed=7) for _ in range(2)]
+        boards = []
+        for game_state in game_states:
+            game_state.new_board()
+            first_board = game_state.game_tiles
+            game_state.new_board()
+            boards.append((first_board, game_state.game_tiles))
+
+        assert boards[0] == boards[1]
+        assert boards[0][0] != boards[0][1]
+
+    def test_guess_after_expire_time_ends_game(self):
+        # Games loaded from a shared game store have no timer, so guesses check the expire time themselves
+        self.game_state.expire_time = 0
+
+        assert self.game_state.guess_word("player", "set") is None
+        assert self.game_state.game_running is False
+
+    def test_round_and_scores_are_recorded(self):
+        sink = RecordingSink()
+        results_writer = ResultsWriter(sink)
+        game_state = GameState("test", create_board_word_manager(), ScoringType.CLASSIC, game_timer=False)
+        game_state.results_writer = results_writer
+        game_state.new_player("player", "Player")
+        game_state.new_board(tiles=self.game_state.game_tiles)
+        game_state.guess_word("player", "states")
+        game_state.guess_word("other", "set")
+
+        # Ending a round twice only records it once
+        game_state.end_game()
+        game_state.end_game()
+        results_writer.close()
+
+        writes = dict(sink.writes)
+        assert 3 == len(sink.writes)
+        board_id = game_state.get_board_id()
+        rounds = writes[ROUNDS_COLLECTION]
+        assert [f"test-{board_id}"] == list(rounds)
+        assert ["other", "player"] == rounds[f"test-{board_id}"]["player_ids"]
+        assert {"states": 1, "set": 1} == rounds[f"test-{board_id}"]["word_counter"]
+        scores = writes[SCORES_COLLECTION]
+        assert "Player" == scores[f"test-{board_id}-player"]["player_name"]
+        assert 3 == scores[f"test-{board_id}-player"]["round_score"]
+        assert 1 == scores[f"test-{board_id}-other"]["total_score"]
+        totals = writes[TOTALS_COLLECTION]["test"]["players"]
+        assert {"player_id": "player", "player_name": "Player", "total_score": 3} in totals
+
+    def test_recreated_game_carries_on_total_scores(self, tmp_path):
+        database_path = str(tmp_path / "results.db")
+        results_writer = ResultsWriter(SqliteResultsSink(database_path))
+        game_manager = ScrambledWordsGameManager(create_board_word_manager(), results_writer=results_writer)
+        game_state = game_manager.create_game_for_name("TEST", ScoringType.CLASSIC)
+        game_state.new_player("player", "Player")
+        game_state.new_board(tiles=self.game_state.game_tiles)
+        game_state.guess_word("player", "states")
+        game_state.end_game()
+        results_writer.close()
+
+        # A restarted server recreates the game when its players start a new round
+        results_writer = ResultsWriter(SqliteResultsSink(database_path))
+        game_manager = ScrambledWordsGameManager(create_board_word_manager(), results_writer=results_writer)
+        game_state = game_manager.create_game_for_name("TEST", ScoringType.CLASSIC)
+        assert {"player": 3} == game_state.scores
+        assert 3 == game_state.get_game_state("player")["player_total_score"]
+        assert ["Player"] == game_state.get_hiscore_update()["names"]
+        # Games given new names never carry on the scores of earlier games
+        assert {} == game_manager.create_game(ScoringType.CLASSIC).scores
+
+    def test_recycled_name_does_not_carry_on_total_scores(self, tmp_path):
+        database_path = str(tmp_path / "results.db")
+        results_writer = ResultsWriter(SqliteResultsSink(database_path))
+        game_manager = ScrambledWordsGameManager(create_board_word_manager(), seed=1, results_writer=results_writer)
+        game_state = game_manager.create_game(ScoringType.CLASSIC)
+        game_state.new_board(tiles=self.game_state.game_tiles)
+        game_state.guess_word("player", "states")
+        game_state.end_game()
+
+        # The game expires and its name is handed to an unrelated game that is lost before finishing a round
+        game_manager.games.remove(game_state.game_name)
+        game_manager.name_allocator.release(game_state.game_name)
+        assert game_state.game_name == game_manager.create_game(ScoringType.CLASSIC).game_name
+        results_writer.close()
+
+        results_writer = ResultsWriter(SqliteResultsSink(database_path))
+        game_manager = ScrambledWordsGameManager(create_board_word_manager(), results_writer=results_writer)
+        assert {} == game_manager.create_game_for_name(game_state.game_name, ScoringType.CLASSIC).scores
+
+    def test_hiscore_update_ranks_players_of_the_game(self):
+        leaderboard = Leaderboard()
+        game_state = GameState("test", create_board_word_manager(), ScoringType.CLASSIC, game_timer=False)
+        game_state.leaderboard = leaderboard
+        game_state.new_player("player", "Player")
+        game_state.new_player("other", "Other")
+        game_state.new_board(tiles=self.game_state.game_tiles)
+        game_state.guess_word("player", "states")
+        game_state.guess_word("other", "set")
+        game_state.end_game()
+
+        game_state.new_board(tiles=self.game_state.game_tiles)
+        game_state.guess_word("other", "state")
+        game_state.end_game()
+
+        # Players of the game are ranked by total score, with ties broken by player ID
+        hiscore_update = game_state.get_hiscore_update()
+        assert ["Other", "Player"] == hiscore_update["names"]
+        assert [3, 3] == hiscore_update["scores"]
+        assert [2, 0] == hiscore_update["round_scores"]
+        # The leaderboard across games ranks best round scores
+        assert ["player", "other"] == leaderboard.get_player_ids()
+        assert [3, 2] == leaderboard.get_page()["scores"]
+
+    def test_round_is_scored_once(self):
+        game_state = GameState("test", create_board_word_manager(), ScoringType.CLASSIC, game_timer=False)
+        game_state.new_board(tiles=self.game_state.game_tiles)
+        game_state.guess_word("player", "states")
+        game_state.guess_word("player", "set")
+        game_state.guess_word("other", "set")
+        assert game_state.get_score_state("player") is None
+
+        game_state.end_game()
+        score_state = game_state.get_score_state("player")
+        # Asking again, as a client firing its timer twice would, does not count the round again
+        assert score_state == game_state.get_score_state("player")
+        assert {"player": 3, "other": 0} == game_state.scores
+        assert ["states"] == score_state["scored_words"]
+        assert [3] == score_state["scored_word_values"]
+        assert [1] == score_state["scored_word_guessers"]
+        assert ["set"] == score_state["unscored_words"]
+        assert 3 == score_state["total_score"]
+        # Players without valid guesses get results of the same shape
+        assert score_state.keys() == game_state.get_score_state("nobody").keys()
+        assert 0 == game_state.get_score_state("nobody")["total_score"]
+
+    def test_hiscore_update_is_taken_once_per_round(self):
+        self.game_state.guess_word("player", "states")
+        assert self.game_state.take_hiscore_update() is None
+
+        self.game_state.end_game()
+        hiscore_update = self.game_state.take_hiscore_update()
+        assert ["player"] == hiscore_update["names"]
+        # Player IDs identify players, so they are never sent to the room
+        assert "player_ids" not in hiscore_update
+        assert self.game_state.take_hiscore_update() is None
+
+        self.game_state.new_board(tiles=self.game_state.game_tiles)
+        self.game_state.end_game()
+        assert self.game_state.take_hiscore_update() is not None
+
+    def test_early_score_state_does_not_end_round(self):
+        game_state = GameState("test", create_board_word_manager(), ScoringType.CLASSIC, game_timer=False)
+        game_state.new_board(tiles=self.game_state.game_tiles)
+        game_state.guess_word("player", "states")
+        game_state.expire_time = get_time_millis() + 1000
+
+        # A player whose clock runs ahead of the server's does not end the round for everyone else
+        assert game_state.get_score_state("player") is None
+        assert game_state.game_running
+        assert game_state.guess_word("other", "set")
+
+        game_state.expire_time = get_time_millis()
+        assert 3 == game_state.get_score_state("player")["total_score"]
+        assert game_state.game_running is False
+
+    def test_game_timer_sends_round_results(self):
+        ended_games = []
+        word_manager = create_board_word_manager()
+        game_state = GameState("test", word_manager, ScoringType.CLASSIC, on_round_end=ended_games.append)
+        game_state.new_board(tiles=self.game_state.game_tiles)
+        game_state.guess_word("player", "states")
+        assert game_state.get_remaining_millis() > 0
+
+        game_state._end_game_on_timer()
+        assert [game_state] == ended_games
+        assert not game_state.game_running
+        # The callback is only called for the round the timer ended
+        game_state._end_game_on_timer()
+        assert [game_state] == ended_games
+
     @staticmethod
     def _assert_neighbors(starting_tile: int, neighbors: List[int]):
         for i in range(0, 25):
@@ -0,0 +1,87 @@
+import random
+import threading
+from collections import Counter
+
+from application.games.scrambledwords.data.game_manager import ScrambledWordsGameManager
+from application.games.scrambledwords.data.game_state import GameState
+from application.games.scrambledwords.data.scoring_type import ScoringType
+from ..board_word_manager import create_board_word_manager
+
+NUM_PLAYERS = 16
+GUESSES_PER_PLAYER = 300
+
+
+class TestGameStateStress:
+    def test_concurrent_guesses_in_one_room(self):
+        game_state = GameState("stress", create_board_word_manager(), ScoringType.CLASSIC, game_timer=False, seed=3)
+        game_state.new_board(tiles=list("saberjttsxzzzzzszzzzzzzzz"))
+        words = ["set", "sat", "state", "states", "bet", "best", "tab", "stab", "zzz", "not on board"]
+
+        start = threading.Barrier(NUM_PLAYERS + 1)
+        halfway = threading.Event()
+        accepted_guesses = {}
+
+        def play(player_id: str):
+            rng = random.Random(player_id)
+            accepted = Counter()
+            start.wait()
+            for guess_number in range(GUESSES_PER_PLAYER):
+                if guess_number == GUESSES_PER_PLAYER // 2:
+                    halfway.set()
+                word = rng.choice(words)
+                if game_state.guess_word(player_id, word) is not None:
+                    accepted[word] += 1
+            accepted_guesses[player_id] = accepted
+
+        threads = [threading.Thread(target=play, args=(f"player{i}",)) for i in range(NUM_PLAYERS)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        # End the game part way through, like the game timer would
+        halfway.wait()
+        game_state.end_game()
+        for thread in threads:
+            thread.join()
+
+        # Every valid word is accepted at most once per player, and the word counter agrees with the guesses
+        expected_word_counter = Counter()
+        for player_id, accepted in accepted_guesses.items():
+            assert all(count == 1 for count in accepted.values())
+            assert set(accepted) == game_state.valid_guesses.get(player_id, set())
+            expected_word_counter.update(accepted.keys())
+        assert expected_word_counter == game_state.word_counter
+
+        # No guess is accepted once the game is over
+        assert game_state.guess_word("player0", "set") is None
+        assert game_state.guess_word("late player", "set") is None
+
+        # Scores from concurrent requests match the guesses
+        scores = {}
+
+        def score(player_id: str):
+            scores[player_id] = game_state.get_score_state(player_id)["total_score"]
+
+        threads = [threading.Thread(target=score, args=(player_id,)) for player_id in accepted_guesses]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Players without any accepted guesses have no score
+        assert scores == {player_id: game_state.scores.get(player_id, 0) for player_id in accepted_guesses}
+
+    def test_concurrent_game_creation(self):
+        game_manager = ScrambledWordsGameManager(create_board_word_manager(), seed=3)
+        game_names = []
+
+        def create_games():
+            for _ in range(50):
+                game_names.append(game_manager.create_game().game_name)
+
+        threads = [threading.Thread(target=create_games) for _ in range(NUM_PLAYERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(game_names)) == len(game_names) == NUM_PLAYERS * 50
+        assert all(game_manager.get_game_state(game_name) is not None for game_name in game_names)
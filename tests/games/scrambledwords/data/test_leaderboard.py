@@ -0,0 +1,74 @@
+import random
+
+from application.games.scrambledwords.data.leaderboard import Leaderboard
+
+
+class TestLeaderboard:
+    def test_players_are_ranked_by_best_score(self):
+        leaderboard = Leaderboard()
+        assert leaderboard.submit("a", "Alice", 10)
+        assert leaderboard.submit("b", "Bob", 30)
+        assert leaderboard.submit("c", "Carol", 20)
+        assert not leaderboard.submit("b", "Bob", 5)
+        assert leaderboard.submit("a", "Alice", 40)
+
+        page = leaderboard.get_page()
+        assert ["a", "b", "c"] == leaderboard.get_player_ids()
+        assert ["Alice", "Bob", "Carol"] == page["names"]
+        assert [40, 30, 20] == page["scores"]
+        assert [1, 2, 3] == page["ranks"]
+
+    def test_ties_are_ranked_by_player_id(self):
+        leaderboard = Leaderboard()
+        leaderboard.submit("b", "Bob", 10)
+        leaderboard.submit("a", "Alice", 10)
+
+        assert ["a", "b"] == leaderboard.get_player_ids()
+
+    def test_player_dropped_from_the_bottom_can_return(self):
+        leaderboard = Leaderboard(max_entries=2)
+        leaderboard.submit("a", "Alice", 10)
+        leaderboard.submit("b", "Bob", 20)
+        leaderboard.submit("c", "Carol", 30)
+        assert ["c", "b"] == leaderboard.get_player_ids()
+
+        # Beating Alice's old score is not enough to make the leaderboard
+        leaderboard.submit("a", "Alice", 15)
+        assert ["c", "b"] == leaderboard.get_player_ids()
+        leaderboard.submit("a", "Alice", 25)
+        assert ["c", "a"] == leaderboard.get_player_ids()
+
+    def test_only_ranked_players_are_remembered(self):
+        leaderboard = Leaderboard(max_entries=10)
+        for i in range(1000):
+            leaderboard.submit(f"player{i}", f"Player {i}", i)
+
+        ranked_player_ids = {f"player{i}" for i in range(990, 1000)}
+        assert ranked_player_ids == set(leaderboard.best_scores)
+        assert ranked_player_ids == set(leaderboard.player_names)
+
+    def test_pages(self):
+        leaderboard = Leaderboard()
+        for i in range(25):
+            leaderboard.submit(f"player{i:02d}", f"Player {i}", i)
+
+        page = leaderboard.get_page(page=2, page_size=10)
+        assert 25 == page["total"]
+        assert [21, 22, 23, 24, 25] == page["ranks"]
+        assert [4, 3, 2, 1, 0] == page["scores"]
+        assert [] == leaderboard.get_page(page=3, page_size=10)["scores"]
+
+    def test_matches_sorting_every_score(self):
+        rng = random.Random(4)
+        leaderboard = Leaderboard(max_entries=20)
+        best_scores = {}
+        for _ in range(2000):
+            player_id = f"player{rng.randrange(200)}"
+            score = rng.randrange(1000)
+            leaderboard.submit(player_id, player_id, score)
+            best_scores[player_id] = max(score, best_scores.get(player_id, score))
+
+        expected = sorted(best_scores.items(), key=lambda item: (-item[1], item[0]))[:20]
+        page = leaderboard.get_page(page_size=20)
+        assert expected == list(zip(leaderboard.get_player_ids(page_size=20), page["scores"]))
+        assert len(leaderboard.best_scores) <= 20
@@ -0,0 +1,15 @@
+import random
+
+from application.games.scrambledwords.data.board_solver import TOTAL_TILES
+from application.games.scrambledwords.data.tiles import LETTER_DISTRIBUTION, generate_tiles
+
+
+class TestTiles:
+    def test_generate_tiles(self):
+        tiles = generate_tiles()
+
+        assert len(tiles) == TOTAL_TILES
+        assert all(tile in LETTER_DISTRIBUTION.weights for tile in tiles)
+
+    def test_seeded_tiles_are_repeatable(self):
+        assert generate_tiles(random.Random(5)) == generate_tiles(random.Random(5))
@@ -0,0 +1,87 @@
+from flask import Flask
+
+from application import socketio, SCRAMBLED_WORDS_GAME_MANAGER_CONFIG_KEY
+from application.games.scrambledwords.data.game_manager import ScrambledWordsGameManager
+from application.games.scrambledwords.data.scoring_type import ScoringType
+from application.games.scrambledwords.networking.events import send_round_results
+from application.games.scrambledwords.util.time_util import get_time_millis
+from ..board_word_manager import create_board_word_manager
+
+# fmt: off
+TILES = [
+    "s", "a", "b", "e", "r",
+    "j", "t", "t", "s", "x",
+    "z", "z", "z", "z", "z",
+    "s", "z", "z", "z", "z",
+    "z", "z", "z", "z", "z"
+]
+# fmt: on
+
+
+class TestEvents:
+    def setup_method(self):
+        self.game_manager = ScrambledWordsGameManager(create_board_word_manager(), on_round_end=send_round_results)
+        self.game_state = self.game_manager.create_game_for_name("TEST", ScoringType.CLASSIC)
+        self.game_state.new_board(tiles=TILES)
+
+        app = Flask(__name__)
+        app.config[SCRAMBLED_WORDS_GAME_MANAGER_CONFIG_KEY] = self.game_manager
+        socketio.init_app(app, async_mode="threading")
+
+        self.clients = [self._connect(app, "player"), self._connect(app, "other")]
+        for client in self.clients:
+            client.emit("join", {"room": "TEST"})
+            client.get_received()
+
+    def teardown_method(self):
+        self.game_state.end_game()
+        for client in self.clients:
+            client.disconnect()
+
+    def test_early_timer_expired_is_told_when_the_round_ends(self):
+        player_client = self.clients[0]
+        player_client.emit("guess", {"room": "TEST", "guess": "states"})
+        player_client.get_received()
+
+        # The player's clock is well ahead of the server's
+        player_client.emit("timer_expired", {"room": "TEST"})
+        received = player_client.get_received()
+        assert ["round_not_over"] == [message["name"] for message in received]
+        assert received[0]["args"][0]["remaining_millis"] > 0
+        assert self.game_state.game_running
+
+        # Asking again once the round is over gets the results
+        self.game_state.expire_time = get_time_millis()
+        player_client.emit("timer_expired", {"room": "TEST"})
+        received = {message["name"]: message["args"][0] for message in player_client.get_received()}
+        assert 3 == received["game_over"]["round_score"]
+        assert ["Player"] == received["hiscore_update"]["names"]
+
+    def test_game_timer_sends_every_player_their_results(self):
+        self.clients[0].emit("guess", {"room": "TEST", "guess": "states"})
+        self.clients[0].get_received()
+
+        self.game_state._end_game_on_timer()
+
+        for client, round_score in zip(self.clients, [3, 0]):
+            received = {message["name"]: message["args"][0] for message in client.get_received()}
+            assert round_score == received["game_over"]["round_score"]
+            assert ["Player"] == received["hiscore_update"]["names"]
+            assert "player_ids" not in received["hiscore_update"]
+
+    def test_guess_in_expired_game_is_rejected(self):
+        self.game_manager.games.remove("TEST")
+
+        player_client = self.clients[0]
+        player_client.get_received()
+        player_client.emit("guess", {"room": "TEST", "guess": "states"})
+        received = player_client.get_received()
+        assert ["guess_reply"] == [message["name"] for message in received]
+        assert not received[0]["args"][0]["valid"]
+
+    @staticmethod
+    def _connect(app: Flask, player_id: str):
+        flask_client = app.test_client()
+        flask_client.set_cookie("player_id", player_id)
+        flask_client.set_cookie("player_name", player_id.title())
+        return socketio.test_client(app, flask_test_client=flask_client)